@@ -0,0 +1,190 @@
+"""Resumable multi-ticker batch runs with retries and progress reporting.
+
+``BatchRunner`` drives the per-ticker stages of a batch (technical, value,
+news, then the combined "final" report) and checkpoints each finished
+(ticker, stage) unit to a ``RunJournal``. A unit is only journaled once its
+report is on disk (the writer's flush hook), so a crash never records work
+that was still buffered. Restarting with the same journal skips finished
+units; the sections of finished stages are read back from their reports so
+the combined report of a partly finished ticker stays complete.
+
+Units that raise are retried in later rounds, after the rest of the batch,
+with exponential backoff between rounds so a throttled or unavailable
+backend gets time to recover.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Tuple
+import random
+import threading
+import time
+
+from core.journal import RunJournal
+from reporting.report_writer import SECTION_TITLES, ReportSection, ReportWriter
+
+FINAL_STAGE = "final"
+BATCH_TICKER = "*"  # journal key for batch-wide stages (e.g. the portfolio report)
+
+
+class BatchRunner:
+    """Runs named per-ticker stages over a universe with checkpointing."""
+
+    def __init__(
+        self,
+        stages: Dict[str, Callable[[str], str]],
+        writer: ReportWriter,
+        journal: RunJournal | None = None,
+        retries: int = 2,
+        backoff: float = 5.0,
+        backoff_max: float = 300.0,
+        progress_every: float = 10.0,
+    ):
+        """
+        Args:
+            stages: Stage name -> ``fn(ticker)`` returning the report path, in run order.
+                Names matching report section kinds are reloaded on resume.
+            writer: The batch's report writer (must keep sections for the final report).
+            journal: Checkpoint journal; without one the batch runs without resume support.
+            retries: Extra rounds for units that raised.
+            backoff: Delay before the first retry round (doubles per round, with jitter).
+            backoff_max: Upper bound for the retry delay.
+            progress_every: Minimum seconds between progress lines (0 disables them).
+        """
+        self.stages = dict(stages)
+        self.writer = writer
+        self.journal = journal
+        self.retries = max(0, int(retries))
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.progress_every = progress_every
+
+        self._lock = threading.Lock()
+        self._unflushed: Dict[str, List[Tuple[str, str, int, float]]] = {}
+        self._attempts: Dict[Tuple[str, str], int] = {}
+        self._completed: Dict[Tuple[str, str], str | None] = {}  # this session, journaled or not
+        self._total = 0
+        self.failed: List[str] = []  # tickers the last ``run`` gave up on
+        self._last_progress = 0.0
+        if journal is not None:
+            writer.add_flush_hook(self._on_flush)
+
+    def run(self, tickers: List[str]) -> List[str]:
+        """Runs every unfinished unit; returns the report paths of the batch (in ticker order)."""
+        self._total += len(tickers) * (len(self.stages) + 1)
+        outputs: Dict[Tuple[str, str], str] = {}
+        pending = list(tickers)
+        for round_no in range(self.retries + 1):
+            if round_no:
+                delay = min(self.backoff_max, self.backoff * (2 ** (round_no - 1))) * random.uniform(0.5, 1.0)
+                print(f"Retrying {len(pending)} ticker(s) in {delay:.1f}s (round {round_no}/{self.retries})")
+                time.sleep(delay)
+            failed = []
+            for ticker in pending:
+                if not self._run_ticker(ticker, outputs):
+                    failed.append(ticker)
+            pending = failed
+            if not pending:
+                break
+        for ticker in pending:
+            print(f"Giving up on {ticker} after {self.retries + 1} attempt(s)")
+        self.failed = pending
+        self.writer.flush()
+        self._report_progress(force=True)
+        order = list(self.stages) + [FINAL_STAGE]
+        return [outputs[(t, s)] for t in tickers for s in order if (t, s) in outputs]
+
+    def run_once(self, stage: str, fn: Callable[[], str]) -> str | None:
+        """Runs a batch-wide stage (journaled under ticker ``*``) unless already done."""
+        self._total += 1
+        outputs: Dict[Tuple[str, str], str] = {}
+        for round_no in range(self.retries + 1):
+            if round_no:
+                time.sleep(min(self.backoff_max, self.backoff * (2 ** (round_no - 1))) * random.uniform(0.5, 1.0))
+            if self._run_unit(BATCH_TICKER, stage, fn, outputs):
+                break
+        self.writer.flush()
+        return outputs.get((BATCH_TICKER, stage))
+
+    def _run_ticker(self, ticker: str, outputs: Dict[Tuple[str, str], str]) -> bool:
+        ok = True
+        for stage, fn in self.stages.items():
+            if not self._run_unit(ticker, stage, lambda fn=fn: fn(ticker), outputs):
+                ok = False
+        if not ok:
+            return False
+        return self._run_unit(ticker, FINAL_STAGE, lambda: self._combine(ticker), outputs)
+
+    def _run_unit(self, ticker: str, stage: str, fn: Callable[[], str | None], outputs: Dict[Tuple[str, str], str]) -> bool:
+        if (ticker, stage) in self._completed:
+            path = self._completed[(ticker, stage)]
+        elif self.journal is not None and self.journal.is_done(ticker, stage):
+            path = self.journal.output(ticker, stage)
+        else:
+            return self._attempt(ticker, stage, fn, outputs)
+        if path:
+            outputs[(ticker, stage)] = path
+        return True
+
+    def _attempt(self, ticker: str, stage: str, fn: Callable[[], str | None], outputs: Dict[Tuple[str, str], str]) -> bool:
+        attempt = self._attempts[(ticker, stage)] = self._attempts.get((ticker, stage), 0) + 1
+        start = time.monotonic()
+        try:
+            path = fn()
+        except Exception as exc:
+            print(f"{ticker} {stage} failed (attempt {attempt}): {exc}")
+            if self.journal is not None:
+                self.journal.record(ticker, stage, "failed", error=f"{type(exc).__name__}: {exc}",
+                                    attempt=attempt, elapsed=time.monotonic() - start)
+            self._report_progress()
+            return False
+        elapsed = time.monotonic() - start
+        self._completed[(ticker, stage)] = path
+        if path:
+            outputs[(ticker, stage)] = path
+        if self.journal is not None:
+            if path and self.writer.is_pending(path):
+                # Journal the unit once its report has actually been written
+                with self._lock:
+                    self._unflushed.setdefault(path, []).append((ticker, stage, attempt, elapsed))
+            else:
+                self.journal.record(ticker, stage, "done", output=path, attempt=attempt, elapsed=elapsed)
+        self._report_progress()
+        return True
+
+    def _combine(self, ticker: str) -> str | None:
+        if self.journal is not None:
+            self._reload_sections(ticker)
+        return self.writer.combine(ticker)
+
+    def _reload_sections(self, ticker: str) -> None:
+        # Stages finished by an earlier run are not in the writer's memory; read them back
+        present = {s.kind for s in self.writer.sections(ticker)}
+        for stage in self.stages:
+            if stage not in SECTION_TITLES or stage in present:
+                continue
+            path = self.journal.output(ticker, stage)
+            if not path:
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    markdown = f.read()
+            except OSError:
+                continue
+            self.writer.add_section(ReportSection(ticker, stage, markdown, path), persist=False)
+
+    def _on_flush(self, paths: List[str]) -> None:
+        with self._lock:
+            units = [(p, u) for p in paths for u in self._unflushed.pop(p, [])]
+        for path, (ticker, stage, attempt, elapsed) in units:
+            self.journal.record(ticker, stage, "done", output=path, attempt=attempt, elapsed=elapsed)
+        self._report_progress()
+
+    def _report_progress(self, force: bool = False) -> None:
+        if self.journal is None or (self.progress_every <= 0 and not force):
+            return
+        now = time.monotonic()
+        if not force and now - self._last_progress < self.progress_every:
+            return
+        self._last_progress = now
+        print(f"Progress: {self.journal.progress(self._total)}")
@@ -0,0 +1,193 @@
+"""Cross-run delta detection: what changed since a ticker's previous analysis.
+
+``DeltaStore`` keeps the latest signals and values of every (report kind,
+ticker) in SQLite (``DELTA_DB_PATH``, default ``data_hist/deltas.db``), one
+row per key. ``update`` fetches the row by its primary key, compares it with
+the new results and stores them, in one call:
+
+- signal flips (and indicators added or removed);
+- threshold crossings of the levels each indicator declares in ``levels``
+  (e.g. RSI crossing 30/50/70, the MACD histogram crossing zero);
+- value score changes (``meta["score"]`` of Value Analysis).
+
+Reruns on the same day are compared against the previous day's run, not
+against themselves. A ticker with none of the above is ``unchanged``, and
+the orchestrators then skip the LLM summary and write a compact "no change"
+report (``--deltas``).
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+
+import config
+from core.models import IndicatorDelta, IndicatorResult, ReportDelta
+from reporting.export import indicator_values
+from .indicator_worker import IndicatorWorker
+
+# Indicators whose meta score is compared as a whole (integer heuristics)
+SCORE_INDICATORS = {"value analysis": "score"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS run_state (
+    kind TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    run_date TEXT NOT NULL,
+    state TEXT NOT NULL,
+    prev_date TEXT,
+    prev_state TEXT,
+    updated REAL NOT NULL,
+    PRIMARY KEY (kind, ticker)
+);
+"""
+
+
+class DeltaStore:
+    """SQLite-backed per-ticker state of the previous run, with change detection."""
+
+    def __init__(self, path: str | None = None):
+        self.path = path or config.DELTA_DB_PATH
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def update(self, ticker: str, kind: str, results: List[IndicatorResult], date: str | None = None) -> ReportDelta:
+        """Compares ``results`` with the previous run of (kind, ticker) and stores them.
+
+        Args:
+            ticker: The ticker.
+            kind: Report kind the state belongs to (e.g. "technical:1d", "value").
+            results: This run's indicator results.
+            date: Run date (YYYY-MM-DD, default today); a rerun on the same date keeps
+                comparing against the previous date's run.
+        """
+        date = date or datetime.now().strftime("%Y-%m-%d")
+        state = snapshot(results)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT run_date, state, prev_date, prev_state FROM run_state WHERE kind = ? AND ticker = ?",
+                (kind, ticker),
+            ).fetchone()
+            if row is None:
+                baseline = prev = (None, None)
+            elif row[0] == date:
+                baseline = prev = (row[2], row[3])
+            else:
+                baseline = prev = (row[0], row[1])
+            self._conn.execute(
+                "INSERT OR REPLACE INTO run_state (kind, ticker, run_date, state, prev_date, prev_state, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, ticker, date, json.dumps(state), prev[0], prev[1], time.time()),
+            )
+            self._conn.commit()
+        if baseline[1] is None:
+            return ReportDelta(status="new")
+        return diff(json.loads(baseline[1]), state, since=baseline[0])
+
+    def previous(self, ticker: str, kind: str) -> Tuple[str, Dict[str, Any]] | None:
+        """(run date, state) of the latest stored run of (kind, ticker), if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT run_date, state FROM run_state WHERE kind = ? AND ticker = ?", (kind, ticker)
+            ).fetchone()
+        return (row[0], json.loads(row[1])) if row else None
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def snapshot(results: List[IndicatorResult]) -> Dict[str, Dict[str, Any]]:
+    """Compact, JSON-ready state of a run: signal, numeric values and levels per indicator."""
+    state: Dict[str, Dict[str, Any]] = {}
+    for result in results:
+        if result.signal in ("Error", "Timeout", "Skipped"):
+            continue  # not a reading; keep the comparison to real signals
+        params = (result.meta or {}).get("params") or {}
+        state[result.indicator] = {
+            "signal": result.signal,
+            "values": indicator_values(result.meta),
+            "levels": {k: list(v) for k, v in _levels(result.indicator, params).items()},
+        }
+    return state
+
+
+def diff(previous: Dict[str, Dict[str, Any]], current: Dict[str, Dict[str, Any]], since: str | None = None) -> ReportDelta:
+    """Signal flips, threshold crossings and score changes between two snapshots."""
+    changed: List[IndicatorDelta] = []
+    score_change = None
+    for name in list(current) + [n for n in previous if n not in current]:
+        prev, cur = previous.get(name), current.get(name)
+        if prev is None or cur is None:
+            changed.append(IndicatorDelta(
+                indicator=name,
+                previous_signal=prev and prev["signal"],
+                signal=cur and cur["signal"],
+            ))
+            continue
+        crossings = _crossings(prev["values"], cur["values"], cur.get("levels") or {})
+        if prev["signal"] != cur["signal"] or crossings:
+            changed.append(IndicatorDelta(
+                indicator=name, previous_signal=prev["signal"], signal=cur["signal"], crossings=crossings,
+            ))
+        key = SCORE_INDICATORS.get(name.lower())
+        if key is not None:
+            before, after = prev["values"].get(key), cur["values"].get(key)
+            if before is not None and after is not None and before != after:
+                score_change = after - before
+    status = "changed" if changed or score_change is not None else "unchanged"
+    return ReportDelta(status=status, since=since, indicators=changed, score_change=score_change)
+
+
+_levels_cache: Dict[Tuple[str, str], Dict[str, tuple]] = {}
+
+
+def _levels(indicator: str, params: dict) -> Dict[str, tuple]:
+    key = (indicator.lower(), json.dumps(params, sort_keys=True, default=str))
+    levels = _levels_cache.get(key)
+    if levels is None:
+        try:
+            levels = IndicatorWorker(indicator).resolve_class().levels(params)
+        except (ImportError, AttributeError, ValueError, TypeError):
+            levels = {}
+        _levels_cache[key] = levels
+    return levels
+
+
+def _crossings(before: Dict[str, float], after: Dict[str, float], levels: Dict[str, List[float]]) -> List[str]:
+    out = []
+    for key, marks in levels.items():
+        a, b = before.get(key), after.get(key)
+        if a is None or b is None or math.isnan(a) or math.isnan(b):
+            continue
+        for level in marks:
+            if (a < level) != (b < level):
+                direction = "above" if b >= level else "below"
+                out.append(f"{key} crossed {direction} {level:g} ({a:.4g} → {b:.4g})")
+    return out
+
+
+_store: DeltaStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_delta_store() -> DeltaStore:
+    """Returns the process-wide delta store, opening it on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = DeltaStore()
+    return _store
@@ -9,50 +9,92 @@ class IndicatorWorker(Worker):
 
     def __init__(self, indicator_name: str):
         self.indicator_name = indicator_name.lower()
+        self._class: type | None = None
 
-    def run(self, stock_data_or_json, params: dict | None = None) -> IndicatorResult:
+    def resolve_class(self) -> type:
+        """Imports the indicator module and returns its indicator class (cached per worker).
+
+        Raises:
+            ImportError: If no module matches the indicator name.
+            AttributeError: If the module has no matching ``<Name>Indicator`` class.
+        """
+        if self._class is not None:
+            return self._class
+        # Dynamically import the indicator module
+        module_name = self.indicator_name.replace(' ', '_')
+        indicator_module = importlib.import_module(f"indicators.{module_name}")
+
+        # Resolve indicator class name robustly (handles acronyms and normal words)
+        candidate_class_names = []
+        if ' ' in self.indicator_name:
+            candidate_class_names.append(self.indicator_name.title().replace(' ', '') + 'Indicator')
+        else:
+            base = self.indicator_name
+            candidate_class_names.extend([
+                base.upper() + 'Indicator',     # e.g., RSIIndicator, MACDIndicator
+                base.title() + 'Indicator',     # e.g., NewsIndicator, ValueAnalysisIndicator
+                base.capitalize() + 'Indicator' # fallback
+            ])
+        for name in candidate_class_names:
+            if hasattr(indicator_module, name):
+                self._class = getattr(indicator_module, name)
+                return self._class
+        raise AttributeError(f"No matching indicator class in module for {self.indicator_name}: tried {candidate_class_names}")
+
+    @property
+    def io_bound(self) -> bool:
+        """Whether the indicator mostly waits on the network (routes it to the I/O pool)."""
+        try:
+            return bool(getattr(self.resolve_class(), "io_bound", False))
+        except (ImportError, AttributeError):
+            return False
+
+    @property
+    def timeout(self) -> float | None:
+        """The indicator's own deadline in seconds, if it declares one."""
+        try:
+            return getattr(self.resolve_class(), "timeout", None)
+        except (ImportError, AttributeError):
+            return None
+
+    @property
+    def requires(self) -> tuple:
+        """Upstream indicator names this indicator consumes (empty for plain indicators)."""
+        try:
+            return tuple(getattr(self.resolve_class(), "requires", ()) or ())
+        except (ImportError, AttributeError):
+            return ()
+
+    def run(self, stock_data_or_json, params: dict | None = None, inputs: dict | None = None) -> IndicatorResult:
         """Runs the indicator calculation.
 
         Args:
-            stock_data_or_json: A pandas DataFrame (preferred) or a JSON string of the stock data.
+            stock_data_or_json: A pandas DataFrame (preferred), a lazy price window with
+                ``tail(n)`` (e.g. ``data.price_store.LazyPrices``), or a JSON string of the stock data.
             params: Optional per-indicator parameters (e.g., window sizes).
+            inputs: Upstream results keyed by plan item id, for indicators that declare ``requires``.
 
         Returns:
             IndicatorResult with the results of the indicator calculation.
         """
-        # Accept a DataFrame directly (preferred), or a JSON string for backward compatibility
-        if isinstance(stock_data_or_json, pd.DataFrame):
-            stock_data = stock_data_or_json
-        else:
-            stock_data = pd.read_json(stock_data_or_json)
-
         try:
-            # Dynamically import the indicator module
-            module_name = self.indicator_name.replace(' ', '_')
-            indicator_module = importlib.import_module(f"indicators.{module_name}")
-            
-            # Resolve indicator class name robustly (handles acronyms and normal words)
-            candidate_class_names = []
-            if ' ' in self.indicator_name:
-                candidate_class_names.append(self.indicator_name.title().replace(' ', '') + 'Indicator')
-            else:
-                base = self.indicator_name
-                candidate_class_names.extend([
-                    base.upper() + 'Indicator',     # e.g., RSIIndicator, MACDIndicator
-                    base.title() + 'Indicator',     # e.g., NewsIndicator, ValueAnalysisIndicator
-                    base.capitalize() + 'Indicator' # fallback
-                ])
-            indicator_class = None
-            for name in candidate_class_names:
-                if hasattr(indicator_module, name):
-                    indicator_class = getattr(indicator_module, name)
-                    break
-            if indicator_class is None:
-                raise AttributeError(f"No matching indicator class in module for {self.indicator_name}: tried {candidate_class_names}")
+            indicator_class = self.resolve_class()
             indicator_instance = indicator_class()
 
+            # Accept a DataFrame directly (preferred); a lazy window is read only as far back
+            # as the indicator's declared lookback; JSON strings for backward compatibility
+            if isinstance(stock_data_or_json, pd.DataFrame):
+                stock_data = stock_data_or_json
+            elif hasattr(stock_data_or_json, "tail"):
+                stock_data = stock_data_or_json.tail(indicator_class.lookback(params or {}))
+            else:
+                stock_data = pd.read_json(stock_data_or_json)
+
             # Calculate the indicator with optional parameters
-            result = indicator_instance.calculate(stock_data, params or {})
+            if inputs is not None:
+                result = indicator_instance.calculate(stock_data, params or {}, inputs=inputs)
+            else:
+                result = indicator_instance.calculate(stock_data, params or {})
             # Normalize into a structured IndicatorResult
             if isinstance(result, dict):
                 ir = IndicatorResult(**result)
@@ -3,37 +3,31 @@ from __future__ import annotations
 from core.orchestrator import Orchestrator
 from datetime import datetime, timezone
 import os
-import yfinance as yf
+
+from data.news_store import NewsStore, pub_ts, get_news_store
+from reporting.report_writer import ReportSection, ReportWriter, report_path
 
 
 class NewsOrchestrator(Orchestrator):
-    """Fetches recent headlines for a ticker and writes them to Markdown."""
+    """Polls recent headlines for a ticker into the news store and writes them to Markdown."""
+
+    def __init__(self, store: NewsStore | None = None, writer: ReportWriter | None = None):
+        self.store = store or get_news_store()
+        # Shared writer lets a batch buffer reports and combine them in memory
+        self.writer = writer or ReportWriter()
 
     def run(self, ticker: str, days: int = 7, limit: int = 50) -> str:
-        news_items = self._fetch_news(ticker)
+        # Incremental poll: only items newer than the ticker's high-water mark are processed
+        new_items = self.store.poll(ticker)
 
-        # Filter by days and cap by limit
-        cutoff = datetime.now(timezone.utc).timestamp() - days * 86400
-        filtered = [n for n in news_items if _pub_ts(n) and _pub_ts(n) >= cutoff]
-        if limit:
-            filtered = filtered[:limit]
+        # Filter by days and cap by limit (done by the store's index)
+        filtered = self.store.recent(ticker, days=days, limit=limit)
 
-        path = self._save_news_markdown(ticker, filtered)
+        path = self._save_news_markdown(ticker, filtered, changed=bool(new_items))
         return path
 
-    def _fetch_news(self, ticker: str):
-        try:
-            return yf.Ticker(ticker).news or []
-        except Exception:
-            return []
-
-    def _save_news_markdown(self, ticker: str, items: list[dict]) -> str:
-        reports_dir = "reports"
-        if not os.path.exists(reports_dir):
-            os.makedirs(reports_dir)
-
-        date_compact = datetime.now().strftime("%Y%m%d")
-        md_path = os.path.join(reports_dir, f"{ticker}_news_{date_compact}.md")
+    def _save_news_markdown(self, ticker: str, items: list[dict], changed: bool = True) -> str:
+        md_path = report_path(ticker, "news", reports_dir=self.writer.reports_dir)
 
         # Header
         lines: list[str] = []
@@ -45,28 +39,12 @@ class NewsOrchestrator(Orchestrator):
                 title = n.get("title") or "Untitled"
                 link = n.get("link") or ""
                 publisher = n.get("publisher") or n.get("source") or ""
-                ts = _pub_ts(n)
+                ts = pub_ts(n)
                 when = datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d %H:%M UTC") if ts else ""
                 lines.append(f"- {when} – {publisher}: [{title}]({link})")
 
-        with open(md_path, "w") as f:
-            f.write("\n".join(lines) + "\n")
-
-        return md_path
-
-
-def _pub_ts(n: dict | None):
-    if not n:
-        return None
-    # yfinance typically provides providerPublishTime (seconds epoch)
-    ts = n.get("providerPublishTime") or n.get("published_at") or n.get("time_published")
-    try:
-        if isinstance(ts, (int, float)):
-            return float(ts)
-        # some feeds use string epoch
-        if isinstance(ts, str) and ts.isdigit():
-            return float(ts)
-    except Exception:
-        return None
-    return None
-
+        # Nothing new since today's report was written: keep it in memory for the
+        # combined report but skip rewriting the file
+        persist = changed or not os.path.exists(md_path)
+        section = ReportSection(ticker, "news", "\n".join(lines) + "\n", md_path)
+        return self.writer.add_section(section, persist=persist)
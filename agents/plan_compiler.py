@@ -0,0 +1,470 @@
+"""Ahead-of-time compilation of technical-analysis plans.
+
+A plan (requested indicators -> items with params and dependencies) is
+compiled once into an immutable ``CompiledPlan``:
+
+- items get their node ids and declared ``requires`` inputs wired;
+- params are normalized (defaults filled in, numbers canonicalized, frozen);
+- indicator classes are resolved and a worker bound to each step;
+- the graph is validated once (no per-run cycle or input checks);
+- each step's ``lookback`` and estimated cost (rows read) are recorded.
+
+Compiled plans are hashable and cached by (requested indicators, period,
+interval) in a ``PlanCache``, so every ticker of a batch reuses the same
+plan without re-planning, re-parsing or re-validating it. LLM plans are also
+saved as JSON under ``PLAN_CACHE_DIR`` and reused by later runs; fallback
+plans are only kept in memory so a later run with the LLM available still
+gets a real plan.
+
+    python -m agents.plan_compiler                 # list the cached plans
+    python -m agents.plan_compiler RSI MACD ADX     # compile and describe a plan
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Tuple
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+import config
+from core.dag import DagNode, validate_dag
+from core.models import OrchestratorPlan
+from .indicator_worker import IndicatorWorker
+
+# Bump when the serialized layout changes; older files are ignored
+PLAN_FORMAT = 1
+
+DEFAULT_INDICATORS = ["RSI", "MACD", "Bollinger Bands", "Moving Average"]
+
+
+def default_params_for(name: str) -> dict:
+    """Default parameters for a plan item of indicator ``name``."""
+    name_low = name.lower()
+    if name_low == "rsi":
+        return {"period": 14}
+    if name_low == "macd":
+        return {"fast": 12, "slow": 26, "signal": 9}
+    if name_low in ("bollinger bands", "bollinger_bands", "bollinger-bands"):
+        return {"window": 20, "stddev": 2}
+    if name_low in ("moving average", "moving_average", "moving-average"):
+        return {"short_window": 50, "long_window": 200}
+    if name_low == "atr":
+        return {"period": 14, "baseline": 50}
+    if name_low == "stochastic":
+        return {"k_period": 14, "d_period": 3, "smooth": 3}
+    if name_low == "obv":
+        return {"window": 20}
+    if name_low == "vwap":
+        return {"window": 20, "anchor": "auto"}
+    if name_low == "adx":
+        return {"period": 14}
+    if name_low in ("donchian channels", "donchian_channels", "donchian-channels", "donchian"):
+        return {"window": 20}
+    return {}
+
+
+@dataclass(frozen=True)
+class CompiledStep:
+    """One resolved plan item. Params are a sorted tuple of (key, value) pairs."""
+
+    id: str
+    name: str
+    params: Tuple[Tuple[str, Any], ...]
+    inputs: Tuple[str, ...] = ()
+    pool: str = "cpu"
+    lookback: int | None = None  # trailing rows needed (None = full history)
+    worker: IndicatorWorker | None = field(default=None, compare=False, repr=False)
+
+    @property
+    def params_dict(self) -> dict:
+        return _thaw(self.params)
+
+    @property
+    def cost(self) -> int | None:
+        """Estimated rows read per run (None = the full history)."""
+        return self.lookback
+
+    @property
+    def timeout(self) -> float | None:
+        """Deadline from submission: the indicator's own, else its pool's default (None = none)."""
+        timeout = (self.worker or IndicatorWorker(self.name)).timeout
+        if timeout is None:
+            timeout = config.IO_TASK_TIMEOUT if self.pool == "io" else config.CPU_TASK_TIMEOUT
+        return timeout if timeout and timeout > 0 else None
+
+    def run(self, stock_data, inputs: dict | None = None):
+        """Runs the step's indicator; ``inputs`` are only passed to steps with inputs."""
+        worker = self.worker or IndicatorWorker(self.name)
+        return worker.run(stock_data, self.params_dict, inputs=inputs if self.inputs else None)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "params": self.params_dict,
+            "inputs": list(self.inputs),
+            "pool": self.pool,
+            "lookback": self.lookback,
+        }
+
+
+@dataclass(frozen=True)
+class CompiledPlan:
+    """An immutable, validated execution plan shared by every ticker it applies to."""
+
+    key: str
+    requested: Tuple[str, ...]
+    period: str
+    interval: str
+    steps: Tuple[CompiledStep, ...]  # plan order (validated acyclic)
+    max_workers: int | None = None
+    rationale: str | None = field(default=None, compare=False)
+    strategy: str | None = field(default=None, compare=False)
+    source: str = field(default="fallback", compare=False)  # "llm", "fallback" or "manual"
+
+    @property
+    def lookback(self) -> int | None:
+        """Trailing rows every step needs (None if any step needs the full history)."""
+        lookbacks = [s.lookback for s in self.steps]
+        if not lookbacks or any(lb is None for lb in lookbacks):
+            return None
+        return max(lookbacks)
+
+    @property
+    def cost(self) -> dict:
+        """Estimated work: rows read by CPU steps, number of I/O steps and graph depth."""
+        cpu = [s.cost for s in self.steps if s.pool == "cpu"]
+        by_id = {s.id: s for s in self.steps}
+        depth: Dict[str, int] = {}
+
+        def _depth(step_id: str) -> int:
+            if step_id not in depth:
+                depth[step_id] = 1 + max((_depth(i) for i in by_id[step_id].inputs), default=0)
+            return depth[step_id]
+
+        for step in self.steps:
+            _depth(step.id)
+        return {
+            "rows": None if any(c is None for c in cpu) else sum(cpu),
+            "io_steps": sum(1 for s in self.steps if s.pool == "io"),
+            "depth": max(depth.values(), default=0),
+        }
+
+    @property
+    def cap(self) -> int | None:
+        """Concurrency cap for ``run_dag`` (None = the pools' own limits)."""
+        return self.max_workers if self.max_workers and self.max_workers > 0 else None
+
+    def items(self) -> List[OrchestratorPlan.IndicatorPlanItem]:
+        return [
+            OrchestratorPlan.IndicatorPlanItem(name=s.name, params=s.params_dict, id=s.id, inputs=list(s.inputs))
+            for s in self.steps
+        ]
+
+    def to_plan(self, ticker: str) -> OrchestratorPlan:
+        """The report-facing ``OrchestratorPlan`` for one ticker."""
+        return OrchestratorPlan(
+            ticker=ticker,
+            period=self.period,
+            interval=self.interval,
+            requested_indicators=list(self.requested),
+            plan_indicators=[s.name for s in self.steps],
+            plan_items=self.items(),
+            rationale=self.rationale,
+            strategy=self.strategy,
+            max_workers=self.max_workers,
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "format": PLAN_FORMAT,
+            "key": self.key,
+            "requested": list(self.requested),
+            "period": self.period,
+            "interval": self.interval,
+            "steps": [s.to_dict() for s in self.steps],
+            "max_workers": self.max_workers,
+            "rationale": self.rationale,
+            "strategy": self.strategy,
+            "source": self.source,
+            "lookback": self.lookback,
+            "cost": self.cost,
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CompiledPlan":
+        """Recompiles a serialized plan (classes and lookbacks are resolved again).
+
+        Raises:
+            ValueError: On an unknown format or an invalid graph.
+        """
+        if data.get("format") != PLAN_FORMAT:
+            raise ValueError(f"Unsupported plan format: {data.get('format')}")
+        return compile_plan(
+            data.get("steps") or [],
+            requested=data.get("requested"),
+            period=data.get("period", "1y"),
+            interval=data.get("interval", "1d"),
+            max_workers=data.get("max_workers"),
+            rationale=data.get("rationale"),
+            strategy=data.get("strategy"),
+            source=data.get("source", "manual"),
+        )
+
+    def describe(self) -> str:
+        """Human-readable summary: one line per step, then lookback and cost."""
+        lines = [
+            f"Plan {self.key} ({self.source}): {', '.join(self.requested)} @ {self.period}/{self.interval}",
+        ]
+        for step in self.steps:
+            params = ", ".join(f"{k}={v}" for k, v in step.params) or "-"
+            inputs = f" <- {', '.join(step.inputs)}" if step.inputs else ""
+            lookback = "full" if step.lookback is None else step.lookback
+            lines.append(f"  {step.id:<20} {step.pool:<3} lookback={lookback:<6} {params}{inputs}")
+        cost = self.cost
+        lines.append(
+            f"  lookback={'full' if self.lookback is None else self.lookback} "
+            f"rows={'full' if cost['rows'] is None else cost['rows']} io_steps={cost['io_steps']} "
+            f"depth={cost['depth']} max_workers={self.max_workers or '-'}"
+        )
+        return "\n".join(lines)
+
+
+def plan_key(requested: Iterable[str] | None, period: str, interval: str) -> str:
+    """Cache key of the plan for ``requested`` indicators (order matters) at period/interval."""
+    names = [n.strip().lower() for n in (requested or DEFAULT_INDICATORS)]
+    raw = json.dumps([names, period, interval])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def compile_plan(
+    items: Iterable[Any],
+    requested: Iterable[str] | None = None,
+    period: str = "1y",
+    interval: str = "1d",
+    max_workers: int | None = None,
+    rationale: str | None = None,
+    strategy: str | None = None,
+    source: str = "manual",
+) -> CompiledPlan:
+    """Compiles plan items (dicts or ``IndicatorPlanItem``) into a ``CompiledPlan``.
+
+    Items default to their name as id (repeats get ``#2``, ``#3``...). An item
+    whose indicator declares ``requires`` but lists no inputs is wired to the
+    first item of each required name; missing upstream items are added with
+    default params just before their first consumer. Unknown indicators still
+    compile; they report an Error result when run.
+
+    Raises:
+        ValueError: On items without a name, duplicate ids, unknown inputs or cycles.
+    """
+    specs = []
+    seen: Dict[str, int] = {}
+    for item in items:
+        raw = item.model_dump() if hasattr(item, "model_dump") else dict(item or {})
+        name = raw.get("name")
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError(f"Plan item without an indicator name: {raw}")
+        item_id = raw.get("id") or name
+        seen[item_id] = seen.get(item_id, 0) + 1
+        if seen[item_id] > 1 and not raw.get("id"):
+            item_id = f"{name}#{seen[item_id]}"
+        specs.append({"id": item_id, "name": name, "params": raw.get("params") or {}, "inputs": list(raw.get("inputs") or [])})
+
+    workers = {}
+
+    def _worker(name: str) -> IndicatorWorker:
+        if name.lower() not in workers:
+            workers[name.lower()] = IndicatorWorker(name)
+        return workers[name.lower()]
+
+    wired: List[dict] = []
+    for spec in specs:
+        if not spec["inputs"]:
+            for name in _worker(spec["name"]).requires:
+                upstream = next((s for s in specs + wired if s["name"].lower() == name.lower()), None)
+                if upstream is None:
+                    upstream = {"id": name, "name": name, "params": {}, "inputs": []}
+                    wired.append(upstream)
+                spec["inputs"].append(upstream["id"])
+        wired.append(spec)
+
+    validate_dag([DagNode(s["id"], None, s["inputs"]) for s in wired])
+    steps = []
+    for spec in wired:
+        worker = _worker(spec["name"])
+        params = _freeze({**default_params_for(spec["name"]), **spec["params"]})
+        try:
+            lookback = worker.resolve_class().lookback(_thaw(params))
+        except (ImportError, AttributeError):
+            lookback = None
+        steps.append(CompiledStep(
+            id=spec["id"],
+            name=spec["name"],
+            params=params,
+            inputs=tuple(spec["inputs"]),
+            pool="io" if worker.io_bound else "cpu",
+            lookback=lookback,
+            worker=worker,
+        ))
+
+    requested = tuple(requested or [s["name"] for s in specs])
+    return CompiledPlan(
+        key=plan_key(requested, period, interval),
+        requested=requested,
+        period=period,
+        interval=interval,
+        steps=tuple(steps),
+        max_workers=int(max_workers) if isinstance(max_workers, (int, float)) and max_workers > 0 else None,
+        rationale=rationale,
+        strategy=strategy,
+        source=source,
+    )
+
+
+class PlanCache:
+    """Compiled plans by key, in memory and (for persisted plans) as JSON files."""
+
+    def __init__(self, directory: str | None = None):
+        self.directory = directory
+        self._plans: Dict[str, CompiledPlan] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: str) -> CompiledPlan | None:
+        plan = self._plans.get(key)
+        if plan is None and self.directory:
+            plan = self._load(key)
+            if plan is not None:
+                with self._lock:
+                    plan = self._plans.setdefault(key, plan)
+        with self._lock:
+            if plan is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return plan
+
+    def put(self, plan: CompiledPlan, persist: bool = True) -> CompiledPlan:
+        with self._lock:
+            self._plans[plan.key] = plan
+        if persist and self.directory:
+            self._save(plan)
+        return plan
+
+    def plans(self) -> List[CompiledPlan]:
+        """Every plan in memory plus the ones saved on disk."""
+        if self.directory and os.path.isdir(self.directory):
+            for fname in sorted(os.listdir(self.directory)):
+                if fname.endswith(".json"):
+                    self.get(fname[:-5])
+        with self._lock:
+            return list(self._plans.values())
+
+    def clear(self, remove_files: bool = False) -> None:
+        with self._lock:
+            self._plans.clear()
+        if remove_files and self.directory and os.path.isdir(self.directory):
+            for fname in os.listdir(self.directory):
+                if fname.endswith(".json"):
+                    os.remove(os.path.join(self.directory, fname))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"plans": len(self._plans), "hits": self._hits, "misses": self._misses}
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _load(self, key: str) -> CompiledPlan | None:
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return CompiledPlan.from_dict(json.load(f))
+        except (OSError, ValueError, TypeError) as exc:
+            print(f"Ignoring cached plan {path}: {exc}")
+            return None
+
+    def _save(self, plan: CompiledPlan) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".plan.", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(plan.to_json())
+            os.replace(tmp, self._path(plan.key))
+        except OSError as exc:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            print(f"Could not save plan {plan.key}: {exc}")
+
+
+_plan_cache: PlanCache | None = None
+_plan_cache_lock = threading.Lock()
+
+
+def get_plan_cache() -> PlanCache:
+    """The shared plan cache (persisting under ``PLAN_CACHE_DIR``), created lazily."""
+    global _plan_cache
+    if _plan_cache is None:
+        with _plan_cache_lock:
+            if _plan_cache is None:
+                _plan_cache = PlanCache(config.PLAN_CACHE_DIR or None)
+    return _plan_cache
+
+
+def _freeze(value: Any) -> Any:
+    # Hashable, canonical form: sorted dict items, tuples for lists, integral floats as ints
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _thaw(params: Tuple[Tuple[str, Any], ...]) -> dict:
+    return {k: _thaw(v) if _is_items(v) else (list(v) if isinstance(v, tuple) else v) for k, v in params}
+
+
+def _is_items(value: Any) -> bool:
+    return isinstance(value, tuple) and bool(value) and all(
+        isinstance(p, tuple) and len(p) == 2 and isinstance(p[0], str) for p in value
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inspect compiled technical-analysis plans.")
+    parser.add_argument("indicators", nargs="*", help="Compile a fallback plan for these indicators instead of listing the cache.")
+    parser.add_argument("--period", default="1y")
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--json", action="store_true", help="Print plans as JSON.")
+    args = parser.parse_args()
+
+    if args.indicators:
+        plans = [compile_plan(
+            [{"name": n} for n in args.indicators],
+            requested=args.indicators, period=args.period, interval=args.interval,
+        )]
+    else:
+        plans = get_plan_cache().plans()
+        if not plans:
+            print(f"No cached plans under {config.PLAN_CACHE_DIR}")
+            return
+    for plan in plans:
+        print(plan.to_json() if args.json else plan.describe())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""Portfolio-level risk and signal analysis across all holdings at once.
+
+Loads every holding's history as one aligned close matrix (through the price
+cache), then computes covariance/correlation over the trailing window,
+realized volatility, beta to a benchmark, drawdowns, portfolio volatility
+with per-holding risk contributions, and the weight behind each indicator
+signal, all vectorized across holdings (``agents/portfolio_risk.py``,
+``indicators/matrix.py``).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+import config
+from core.orchestrator import Orchestrator
+from data.data_fetcher import load_close_matrix
+from indicators.matrix import MATRIX_INDICATORS, signal_matrix
+from reporting.report_writer import ReportWriter, report_path
+from .portfolio_risk import (
+    aggregate_signals,
+    betas,
+    covariance_matrix,
+    drawdowns,
+    portfolio_volatility,
+    realized_volatility,
+    returns_matrix,
+    top_correlated_pairs,
+)
+
+
+@dataclass
+class PortfolioAnalysis:
+    weights: pd.Series
+    holdings: pd.DataFrame  # per-ticker weight, vol, beta, drawdowns, risk share, signals
+    covariance: pd.DataFrame
+    correlation: pd.DataFrame
+    volatility: float
+    beta: float
+    drawdown: float
+    max_drawdown: float
+    signals: Dict[str, pd.DataFrame] = field(default_factory=dict)
+    sectors: pd.Series | None = None
+    missing: List[str] = field(default_factory=list)
+    window: int = 63
+    benchmark: str | None = None
+
+
+class PortfolioOrchestrator(Orchestrator):
+    """Bulk risk/exposure analysis for a portfolio of (possibly thousands of) holdings."""
+
+    def __init__(self, writer: ReportWriter | None = None):
+        self.writer = writer or ReportWriter()
+
+    def run(self, holdings: Mapping[str, float] | Sequence[str], name: str = "portfolio", **kwargs) -> str:
+        """Analyzes the portfolio and writes ``<name>_<date>_portfolio.md``; returns its path.
+
+        Keyword arguments are passed to ``analyze``.
+        """
+        analysis = self.analyze(holdings, **kwargs)
+        path = report_path(name, "portfolio", reports_dir=self.writer.reports_dir)
+        return self.writer.write(path, self._render(name, analysis))
+
+    def analyze(
+        self,
+        holdings: Mapping[str, float] | Sequence[str],
+        period: str = "1y",
+        window: int = 63,
+        benchmark: str | None = None,
+        indicators: List[str] | None = None,
+        sectors: bool = False,
+    ) -> PortfolioAnalysis:
+        """Computes portfolio risk and aggregated signals.
+
+        Args:
+            holdings: Ticker -> weight (normalized to sum to 1), or a list of tickers (equal weight).
+            period: History length loaded for every holding.
+            window: Trailing bars used for the covariance/correlation matrix.
+            benchmark: Beta benchmark ticker (defaults to ``PORTFOLIO_BENCHMARK``).
+            indicators: Indicators aggregated across holdings (default: all matrix indicators).
+            sectors: Also aggregate weight by sector from the daily fundamentals snapshot.
+        """
+        weights = _weights(holdings)
+        benchmark = benchmark or config.PORTFOLIO_BENCHMARK
+        tickers = list(weights.index)
+        close = load_close_matrix(tickers + ([benchmark] if benchmark and benchmark not in weights else []), period)
+        bench_close = close[benchmark] if benchmark in close else None
+        close = close.reindex(columns=[t for t in tickers if t in close.columns])
+        missing = [t for t in tickers if t not in close.columns]
+        if close.empty:
+            raise ValueError("No price history for any holding")
+        weights = weights.reindex(close.columns)
+        weights = weights / weights.sum()
+
+        returns = returns_matrix(close)
+        cov, corr = covariance_matrix(returns.iloc[-window:], min_periods=min(20, window))
+        vol = realized_volatility(returns)
+        dd = drawdowns(close)
+        port_vol, risk_share = portfolio_volatility(cov, weights)
+
+        # Portfolio series: weights are held constant, missing returns contribute nothing
+        port_returns = pd.Series(returns.fillna(0.0).to_numpy() @ weights.to_numpy(), index=returns.index)
+        port_dd = drawdowns((1 + port_returns).cumprod().to_frame("portfolio")).iloc[0]
+        if bench_close is not None:
+            bench_returns = bench_close.pct_change(fill_method=None).iloc[1:]
+            beta = betas(returns, bench_returns)
+            port_beta = float(betas(port_returns.to_frame("portfolio"), bench_returns).iloc[0])
+        else:
+            beta = pd.Series(np.nan, index=close.columns, name="beta")
+            port_beta = float("nan")
+
+        sig = signal_matrix(close, indicators or MATRIX_INDICATORS)
+        table = pd.concat([weights.rename("weight"), vol, beta, dd, risk_share, sig], axis=1)
+
+        sector_weights = None
+        if sectors:
+            from data.fundamentals import get_snapshot
+
+            snap = get_snapshot(list(close.columns))
+            sector = snap["sector"].reindex(close.columns).replace("", np.nan).fillna("Unknown")
+            table["sector"] = sector
+            sector_weights = weights.groupby(sector).sum().sort_values(ascending=False)
+
+        return PortfolioAnalysis(
+            weights=weights,
+            holdings=table,
+            covariance=cov,
+            correlation=corr,
+            volatility=port_vol,
+            beta=port_beta,
+            drawdown=float(port_dd["drawdown"]),
+            max_drawdown=float(port_dd["max_drawdown"]),
+            signals=aggregate_signals(sig, weights),
+            sectors=sector_weights,
+            missing=missing,
+            window=window,
+            benchmark=benchmark if bench_close is not None else None,
+        )
+
+    def _render(self, name: str, a: PortfolioAnalysis, top: int = 10) -> str:
+        h = a.holdings
+        lines = [f"### Portfolio Report: {name}", ""]
+        lines.append(f"- Holdings: {len(h)}" + (f" ({len(a.missing)} without history: {', '.join(a.missing[:20])})" if a.missing else ""))
+        lines.append(f"- Annualized volatility ({a.window}-bar covariance): {a.volatility:.2%}")
+        if a.benchmark:
+            lines.append(f"- Beta to {a.benchmark}: {a.beta:.2f}")
+        lines.append(f"- Drawdown: {a.drawdown:.2%} (max {a.max_drawdown:.2%})")
+        lines.append("")
+
+        lines += ["## Largest Risk Contributors", "", "| Ticker | Weight | Risk share | Vol (21d) | Beta | Drawdown |",
+                  "|---|---:|---:|---:|---:|---:|"]
+        for t, row in h.nlargest(top, "risk_share").iterrows():
+            lines.append(f"| {t} | {row['weight']:.2%} | {row['risk_share']:.2%} | {row['vol_21d']:.2%} | "
+                         f"{row['beta']:.2f} | {row['drawdown']:.2%} |")
+        lines.append("")
+
+        pairs = top_correlated_pairs(a.correlation, top)
+        if len(pairs):
+            lines += ["## Most Correlated Pairs", "", "| Pair | Correlation |", "|---|---:|"]
+            lines += [f"| {r.a} / {r.b} | {r.correlation:.2f} |" for r in pairs.itertuples()]
+            lines.append("")
+
+        if a.sectors is not None:
+            lines += ["## Sector Exposure", "", "| Sector | Weight |", "|---|---:|"]
+            lines += [f"| {s} | {w:.2%} |" for s, w in a.sectors.items()]
+            lines.append("")
+
+        lines += ["## Signals Across Holdings", ""]
+        for indicator, agg in a.signals.items():
+            parts = [f"{label}: {int(r['holdings'])} ({r['weight']:.0%})" for label, r in agg.iterrows()]
+            lines.append(f"- {indicator}: " + "; ".join(parts))
+        lines.append("")
+        lines.append(f"_Generated {datetime.now().strftime('%Y-%m-%d %H:%M')}_")
+        return "\n".join(lines) + "\n"
+
+
+def _weights(holdings: Mapping[str, float] | Sequence[str]) -> pd.Series:
+    if isinstance(holdings, Mapping):
+        w = pd.Series({str(k): float(v) for k, v in holdings.items()}, dtype=float)
+    else:
+        tickers = list(dict.fromkeys(holdings))
+        w = pd.Series(1.0, index=tickers, dtype=float)
+    if w.empty or w.sum() == 0:
+        raise ValueError("Portfolio has no holdings with non-zero weight")
+    return w / w.sum()
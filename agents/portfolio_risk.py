@@ -0,0 +1,132 @@
+"""Vectorized portfolio risk math over aligned return matrices.
+
+Every function works on whole dates x tickers matrices with numpy: pairwise
+statistics are computed with masked matrix products (``X.T @ M``), so missing
+observations are handled exactly like pandas' pairwise-complete ``cov()`` /
+``corr()`` without a Python loop over ticker pairs. Annualization assumes
+``TRADING_DAYS`` bars per year.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+
+def returns_matrix(close: pd.DataFrame) -> pd.DataFrame:
+    """Simple returns per ticker; gaps stay NaN instead of being forward-filled."""
+    return close.pct_change(fill_method=None).iloc[1:]
+
+
+def covariance_matrix(returns: pd.DataFrame, min_periods: int = 20) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Pairwise-complete covariance and correlation matrices.
+
+    Uses only the dates on which both tickers of a pair have a return, exactly
+    like ``DataFrame.cov()``/``corr()``, but with four matrix products instead
+    of a per-pair loop. Pairs with fewer than ``min_periods`` common
+    observations are NaN.
+    """
+    x = returns.to_numpy(dtype=float)
+    mask = ~np.isnan(x)
+    m = mask.astype(float)
+    xz = np.where(mask, x, 0.0)
+
+    n = m.T @ m                 # common observations per pair
+    s = xz.T @ m                # s[a, b] = sum of a's returns on dates b is present
+    q = (xz * xz).T @ m         # same for squared returns
+    p = xz.T @ xz               # cross products on common dates
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = (p - s * s.T / n) / (n - 1)
+        var_a = (q - s * s / n) / (n - 1)
+        corr = cov / np.sqrt(var_a * var_a.T)
+    cov[n < max(2, min_periods)] = np.nan
+    corr[n < max(2, min_periods)] = np.nan
+    np.clip(corr, -1.0, 1.0, out=corr)
+    cols = returns.columns
+    return pd.DataFrame(cov, index=cols, columns=cols), pd.DataFrame(corr, index=cols, columns=cols)
+
+
+def realized_volatility(returns: pd.DataFrame, window: int = 21) -> pd.DataFrame:
+    """Annualized volatility per ticker over the latest ``window`` bars and the full sample."""
+    scale = np.sqrt(TRADING_DAYS)
+    recent = returns.rolling(window, min_periods=max(2, window // 2)).std().ffill()
+    return pd.DataFrame(
+        {
+            f"vol_{window}d": (recent.iloc[-1] if len(recent) else np.nan) * scale,
+            "vol_full": returns.std() * scale,
+        },
+        index=returns.columns,
+    )
+
+
+def betas(returns: pd.DataFrame, benchmark: pd.Series, min_periods: int = 20) -> pd.Series:
+    """Beta of every ticker to ``benchmark`` returns, over each ticker's common dates."""
+    b = benchmark.reindex(returns.index).to_numpy(dtype=float)
+    x = returns.to_numpy(dtype=float)
+    mask = ~np.isnan(x) & ~np.isnan(b)[:, None]
+    n = mask.sum(axis=0)
+    bz = np.where(mask, b[:, None], 0.0)
+    xz = np.where(mask, x, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_b = bz.sum(axis=0) / n
+        mean_x = xz.sum(axis=0) / n
+        cov = ((xz * bz).sum(axis=0) - n * mean_x * mean_b) / (n - 1)
+        var = ((bz * bz).sum(axis=0) - n * mean_b * mean_b) / (n - 1)
+        beta = cov / var
+    beta[n < min_periods] = np.nan
+    return pd.Series(beta, index=returns.columns, name="beta")
+
+
+def drawdowns(close: pd.DataFrame) -> pd.DataFrame:
+    """Current and maximum drawdown from the running peak, per ticker."""
+    prices = close.ffill().to_numpy(dtype=float)
+    peak = np.fmax.accumulate(np.where(np.isnan(prices), -np.inf, prices), axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dd = np.where(np.isfinite(peak) & ~np.isnan(prices), prices / peak - 1.0, np.nan)
+    current = dd[-1] if len(dd) else np.full(close.shape[1], np.nan)
+    worst = np.nanmin(np.where(np.isnan(dd), np.inf, dd), axis=0) if len(dd) else current
+    worst = np.where(np.isinf(worst), np.nan, worst)
+    return pd.DataFrame({"drawdown": current, "max_drawdown": worst}, index=close.columns)
+
+
+def portfolio_volatility(cov: pd.DataFrame, weights: pd.Series) -> Tuple[float, pd.Series]:
+    """Annualized portfolio volatility and each holding's share of portfolio variance.
+
+    Missing covariances (too few common observations) are treated as zero.
+    """
+    w = weights.reindex(cov.index).fillna(0.0).to_numpy(dtype=float)
+    sigma = np.nan_to_num(cov.to_numpy(dtype=float))
+    marginal = sigma @ w
+    variance = float(w @ marginal)
+    share = w * marginal / variance if variance > 0 else np.zeros_like(w)
+    return float(np.sqrt(max(variance, 0.0) * TRADING_DAYS)), pd.Series(share, index=cov.index, name="risk_share")
+
+
+def top_correlated_pairs(corr: pd.DataFrame, n: int = 10) -> pd.DataFrame:
+    """The ``n`` most correlated distinct pairs, from the upper triangle via ``argpartition``."""
+    values = corr.to_numpy(dtype=float)
+    iu, ju = np.triu_indices(len(values), k=1)
+    flat = values[iu, ju]
+    valid = ~np.isnan(flat)
+    iu, ju, flat = iu[valid], ju[valid], flat[valid]
+    if not len(flat):
+        return pd.DataFrame(columns=["a", "b", "correlation"])
+    k = min(n, len(flat))
+    top = np.argpartition(-flat, k - 1)[:k]
+    top = top[np.argsort(-flat[top], kind="stable")]
+    cols = corr.columns
+    return pd.DataFrame({"a": cols[iu[top]], "b": cols[ju[top]], "correlation": flat[top]})
+
+
+def aggregate_signals(signals: pd.DataFrame, weights: pd.Series) -> Dict[str, pd.DataFrame]:
+    """Per indicator: holdings count and portfolio weight behind each signal label."""
+    w = weights.reindex(signals.index).fillna(0.0)
+    out: Dict[str, pd.DataFrame] = {}
+    for name in signals.columns:
+        grouped = w.groupby(signals[name]).agg(["count", "sum"]).rename(columns={"count": "holdings", "sum": "weight"})
+        out[name] = grouped.sort_values("weight", ascending=False)
+    return out
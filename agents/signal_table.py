@@ -0,0 +1,323 @@
+"""Precomputed latest indicator values and signals for every cached ticker.
+
+``materialize_signals`` runs after a price refresh: it computes the default
+indicators for each ticker once (on the shared CPU pool) and stores the
+result as a compact (ticker x indicator) table under ``SIGNAL_TABLE_DIR``:
+
+- ``values``: float64 matrix, one column per indicator output (``"RSI:rsi"``);
+- ``codes``: int8 matrix of signal codes (``labels[indicator][code]``; -1 = unavailable);
+- ``last_bar`` / ``last_close``: the bar each row was computed from.
+
+``SignalTable.lookup`` answers a default-param request with a dict lookup and
+a row read, rebuilding the exact ``IndicatorResult`` through the indicator's
+``from_values`` (only indicators with ``has_stored_values`` are stored). Rows are only served while they match the ticker's current
+last bar, so a refreshed price series is never answered from a stale row.
+
+    python -m agents.signal_table            # every cached daily ticker
+    python -m agents.signal_table AAPL MSFT --period 1y
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List
+import argparse
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import config
+from core.execution import get_pool
+from core.models import IndicatorResult
+from data.data_fetcher import get_stock_data
+from data.sources import DataSource
+from .indicator_worker import IndicatorWorker
+from .plan_compiler import DEFAULT_INDICATORS, default_params_for
+
+# The orchestrator's default indicator set
+SIGNAL_INDICATORS = list(DEFAULT_INDICATORS)
+
+
+def _has_stored_values(name: str) -> bool:
+    try:
+        return IndicatorWorker(name).resolve_class().has_stored_values
+    except (ImportError, AttributeError):
+        return False
+
+
+class SignalTable:
+    """In-memory (ticker x indicator) table of latest values and signal codes."""
+
+    def __init__(
+        self,
+        period: str,
+        tickers: List[str],
+        indicators: List[str],
+        params: Dict[str, dict],
+        value_keys: List[str],
+        values: np.ndarray,
+        codes: np.ndarray,
+        labels: Dict[str, List[str]],
+        last_bar: List[str],
+        last_close: np.ndarray,
+        built_at: float,
+    ):
+        self.period = period
+        self.tickers = list(tickers)
+        self.indicators = list(indicators)
+        self.params = params
+        self.value_keys = list(value_keys)
+        self.values = values
+        self.codes = codes
+        self.labels = labels
+        self.last_bar = list(last_bar)
+        self.last_close = last_close
+        self.built_at = built_at
+
+        self._row = {t: i for i, t in enumerate(self.tickers)}
+        self._col = {name.lower(): j for j, name in enumerate(self.indicators)}
+        self._value_cols: Dict[str, Dict[str, int]] = {}
+        for k, key in enumerate(self.value_keys):
+            name, field = key.split(":", 1)
+            self._value_cols.setdefault(name.lower(), {})[field] = k
+        self._classes: Dict[str, type] = {}
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def is_fresh(self, ticker: str, stock_data: pd.DataFrame) -> bool:
+        """True if the ticker's row was computed from the same last bar as ``stock_data``."""
+        i = self._row.get(ticker)
+        if i is None or stock_data is None or stock_data.empty:
+            return False
+        bar, close = _last_bar(stock_data)
+        stored = float(self.last_close[i])
+        same_close = close == stored or (math.isnan(close) and math.isnan(stored))
+        return bar == self.last_bar[i] and same_close
+
+    def lookup(self, ticker: str, indicator: str, params: dict | None = None) -> IndicatorResult | None:
+        """The stored result, or None when the ticker/indicator is missing or ``params`` differ."""
+        i, j = self._row.get(ticker), self._col.get(indicator.lower())
+        if i is None or j is None or self.codes[i, j] < 0:
+            return None
+        name = self.indicators[j]
+        stored = self.params.get(name, {})
+        if any(k not in stored or stored[k] != v for k, v in (params or {}).items()):
+            return None  # custom params are computed live
+        cls = self._classes.get(name)
+        if cls is None:
+            cls = self._classes[name] = IndicatorWorker(name).resolve_class()
+        if not cls.has_stored_values:
+            return None
+        values = {field: float(self.values[i, k]) for field, k in self._value_cols.get(name.lower(), {}).items()}
+        result = IndicatorResult(**cls.from_values(values, stored))
+        # Record the requested params, like IndicatorWorker.run
+        return result.model_copy(update={"meta": {**(result.meta or {}), "params": params or {}}})
+
+    def signals(self) -> pd.DataFrame:
+        """Signal labels as a DataFrame (tickers x indicators)."""
+        out = {}
+        for j, name in enumerate(self.indicators):
+            labels = np.array(self.labels[name] + [None], dtype=object)
+            out[name] = labels[self.codes[:, j]]  # code -1 picks the trailing None
+        return pd.DataFrame(out, index=self.tickers)
+
+    def save(self, path: str) -> str:
+        """Writes the table atomically as one ``.npz`` file."""
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        meta = {
+            "period": self.period,
+            "indicators": self.indicators,
+            "params": self.params,
+            "value_keys": self.value_keys,
+            "labels": self.labels,
+            "built_at": self.built_at,
+        }
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".signals.", suffix=".npz")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    meta=np.array(json.dumps(meta)),
+                    tickers=np.array(self.tickers, dtype=str),
+                    values=self.values,
+                    codes=self.codes,
+                    last_bar=np.array(self.last_bar, dtype=str),
+                    last_close=self.last_close,
+                )
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "SignalTable":
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            return cls(
+                period=meta["period"],
+                tickers=data["tickers"].tolist(),
+                indicators=meta["indicators"],
+                params=meta["params"],
+                value_keys=meta["value_keys"],
+                values=data["values"],
+                codes=data["codes"],
+                labels=meta["labels"],
+                last_bar=data["last_bar"].tolist(),
+                last_close=data["last_close"],
+                built_at=meta["built_at"],
+            )
+
+
+def table_path(period: str = "1y") -> str:
+    return os.path.join(config.SIGNAL_TABLE_DIR, f"signals_{period}.npz")
+
+
+def cached_tickers(period: str = "1y", cache_dir: str = "data_hist") -> List[str]:
+    """Tickers with a cached daily history for ``period``."""
+    if not os.path.isdir(cache_dir):
+        return []
+    pattern = re.compile(rf"^(.+)_{re.escape(period)}\.csv$")
+    return sorted(m.group(1) for f in os.listdir(cache_dir) if (m := pattern.match(f)))
+
+
+def materialize_signals(
+    tickers: Iterable[str] | None = None,
+    period: str = "1y",
+    indicators: List[str] | None = None,
+    source: DataSource | None = None,
+    path: str | None = None,
+) -> SignalTable:
+    """Computes the default indicators for every ticker and saves the table.
+
+    Args:
+        tickers: Tickers to include (default: every cached daily ticker).
+        period: History period the rows are computed from (and served for).
+        indicators: Indicators to store; those without ``has_stored_values`` are skipped.
+        source: Optional data source for tickers that are not cached yet.
+        path: Output file (default: ``SIGNAL_TABLE_DIR/signals_<period>.npz``).
+    """
+    tickers = list(dict.fromkeys(tickers if tickers is not None else cached_tickers(period)))
+    indicators = indicators or SIGNAL_INDICATORS
+    unsupported = [name for name in indicators if not _has_stored_values(name)]
+    if unsupported:
+        print(f"Skipping indicators that cannot be rebuilt from stored values: {', '.join(unsupported)}")
+        indicators = [name for name in indicators if name not in unsupported]
+    params = {name: default_params_for(name) for name in indicators}
+
+    def _row(ticker: str):
+        data = get_stock_data(ticker, period, source)
+        return _last_bar(data), [IndicatorWorker(name).run(data, params[name]) for name in indicators]
+
+    pool = get_pool("cpu")
+    futures = [(t, pool.submit(_row, t)) for t in tickers]
+
+    rows = []
+    for ticker, future in futures:
+        try:
+            (bar, close), results = future.result()
+        except Exception as exc:
+            print(f"Could not materialize signals for {ticker}: {exc}")
+            continue
+        rows.append((ticker, bar, close, results))
+
+    value_keys: List[str] = []
+    labels: Dict[str, List[str]] = {name: [] for name in indicators}
+    for _, _, _, results in rows:
+        for name, result in zip(indicators, results):
+            for key, value in (result.meta or {}).items():
+                if isinstance(value, (int, float)) and f"{name}:{key}" not in value_keys:
+                    value_keys.append(f"{name}:{key}")
+            if result.signal != "Error" and result.signal not in labels[name]:
+                labels[name].append(result.signal)
+
+    key_index = {key: k for k, key in enumerate(value_keys)}
+    values = np.full((len(rows), len(value_keys)), np.nan)
+    codes = np.full((len(rows), len(indicators)), -1, dtype=np.int8)
+    for i, (_, _, _, results) in enumerate(rows):
+        for j, (name, result) in enumerate(zip(indicators, results)):
+            if result.signal == "Error":
+                continue
+            codes[i, j] = labels[name].index(result.signal)
+            for key, value in (result.meta or {}).items():
+                if f"{name}:{key}" in key_index:
+                    values[i, key_index[f"{name}:{key}"]] = float(value)
+
+    table = SignalTable(
+        period=period,
+        tickers=[r[0] for r in rows],
+        indicators=indicators,
+        params=params,
+        value_keys=value_keys,
+        values=values,
+        codes=codes,
+        labels=labels,
+        last_bar=[r[1] for r in rows],
+        last_close=np.array([r[2] for r in rows], dtype=float),
+        built_at=time.time(),
+    )
+    table.save(path or table_path(period))
+    _invalidate(period)
+    return table
+
+
+_tables: Dict[str, tuple] = {}
+_tables_lock = threading.Lock()
+
+
+def get_signal_table(period: str = "1y") -> SignalTable | None:
+    """The materialized table for ``period`` (reloaded when the file changes), or None."""
+    path = table_path(period)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    cached = _tables.get(period)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with _tables_lock:
+        cached = _tables.get(period)
+        if cached is None or cached[0] != mtime:
+            try:
+                cached = (mtime, SignalTable.load(path))
+            except (OSError, ValueError, KeyError) as exc:
+                print(f"Could not load signal table {path}: {exc}")
+                return None
+            _tables[period] = cached
+    return cached[1]
+
+
+def _invalidate(period: str) -> None:
+    with _tables_lock:
+        _tables.pop(period, None)
+
+
+def _last_bar(stock_data: pd.DataFrame) -> tuple[str, float]:
+    # Session date of the last bar (string and tz-aware indexes alike) and its close
+    return str(stock_data.index[-1])[:10], float(stock_data["Close"].iloc[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Materialize the daily signal table after a price refresh.")
+    parser.add_argument("tickers", nargs="*", help="Tickers to include (default: every cached daily ticker).")
+    parser.add_argument("--period", default="1y")
+    parser.add_argument("--indicators", nargs="+", default=None, help=f"Indicators to store (default: {', '.join(SIGNAL_INDICATORS)}).")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    table = materialize_signals(args.tickers or None, args.period, args.indicators)
+    print(f"Materialized {len(table)} tickers x {len(table.indicators)} indicators "
+          f"in {time.perf_counter() - start:.2f}s -> {table_path(args.period)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,67 +1,72 @@
 from core.orchestrator import Orchestrator
-from core.models import IndicatorResult, AnalysisReport, SummaryResult, OrchestratorPlan
-from openai import OpenAI
+from core.models import IndicatorResult, AnalysisReport, SummaryResult, OrchestratorPlan, ReportDelta
 import json
 from data.data_fetcher import get_stock_data
-from .indicator_worker import IndicatorWorker
-import config
-import concurrent.futures
-import os
+from data.sources import get_data_source
+from .deltas import get_delta_store
+from .plan_compiler import DEFAULT_INDICATORS, CompiledPlan, compile_plan, get_plan_cache, plan_key
+from .signal_table import get_signal_table
+from core.dag import DagNode, run_dag
+from core.llm import PRIORITY_PLAN, PRIORITY_SUMMARY, get_llm_dispatcher
+from core.prompts import TABLE_HEADER, PromptBuilder
+from core.tasks import record_task
+from reporting.render import delta_lines, get_renderer
+from reporting.report_writer import ReportSection, ReportWriter, report_path
 from datetime import datetime
-import yfinance as yf
-
-client = None  # Lazily initialized when needed
+import config
 
 class TechnicalAnalysisOrchestrator(Orchestrator):
     """Orchestrator for performing technical analysis on a stock."""
 
-    def run(self, ticker: str, indicators: list) -> str:
+    def __init__(self, writer: ReportWriter | None = None, deltas: bool = False):
+        # Shared writer lets a batch buffer reports and combine them in memory
+        self.writer = writer or ReportWriter()
+        # Compare each run with the ticker's previous one; unchanged tickers get a compact report
+        self.deltas = deltas
+
+    def run(self, ticker: str, indicators: list, interval: str = "1d") -> str:
         """Runs the technical analysis orchestrator for a given stock ticker.
 
         Args:
             ticker: The stock ticker to analyze.
             indicators: A list of indicator names to calculate.
+            interval: Bar interval; intraday intervals are resampled from the base series.
 
         Returns:
             The path to the saved analysis report.
         """
         # 1. Fetch stock data
-        period = "1y"
-        stock_data = get_stock_data(ticker)
-
-        # 1b. LLM-based planning: decide which indicators to run and why
-        plan = self._plan(ticker=ticker, requested_indicators=indicators, period=period)
-        # Prefer rich plan items; fall back to simple list of names
-        if plan.plan_items:
-            planned_items = plan.plan_items
+        period = "1y" if interval == "1d" else config.INTRADAY_PERIOD
+        stock_data = get_stock_data(ticker, period, interval=interval)
+
+        # 1b. Compiled plan: planned (LLM or fallback) and validated once per requested
+        #     indicator set, then shared by every ticker and later runs
+        compiled = self._compiled_plan(indicators, period, interval)
+        plan = compiled.to_plan(ticker)
+
+        # 2. Run the plan as a dependency graph on the shared pools: independent steps
+        #    run in parallel (network-bound ones on the I/O pool, the rest on the CPU
+        #    pool), composites receive their inputs' results, failures skip descendants
+        precomputed = self._precomputed(ticker, compiled, stock_data, period) if interval == "1d" else {}
+        worker_results = self._execute(compiled, stock_data, precomputed)
+
+        # 3. Summarize the results (nothing to summarize when no signal or level changed)
+        delta = get_delta_store().update(ticker, f"technical:{interval}", worker_results) if self.deltas else None
+        if delta is not None and delta.status == "unchanged":
+            summary = SummaryResult(summary_text=f"No change since {delta.since}.", method="local_fallback")
         else:
-            names = plan.plan_indicators or indicators or ["RSI", "MACD", "Bollinger Bands", "Moving Average"]
-            planned_items = [OrchestratorPlan.IndicatorPlanItem(name=n, params={}) for n in names]
-
-        # 2. Create and run worker agents for each indicator concurrently
-        worker_results: list[IndicatorResult] = []
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            futures = {executor.submit(IndicatorWorker(item.name).run, stock_data, item.params): item for item in planned_items}
-            
-            for future in concurrent.futures.as_completed(futures):
-                try:
-                    result = future.result()
-                    worker_results.append(result)
-                except Exception as exc:
-                    item = futures[future]
-                    print(f'{item.name} generated an exception: {exc}')
-
-        # 3. Summarize the results
-        summary = self._summarize(worker_results, plan)
+            summary = self._summarize(worker_results, plan, delta)
 
         # 4. Build structured analysis report
         analysis = AnalysisReport(
             ticker=ticker,
             period=period,
+            interval=interval,
             generated_at=datetime.now(),
             indicators=worker_results,
             summary=summary,
             plan=plan,
+            delta=delta,
         )
 
         # 5. Save the report (Markdown only)
@@ -69,47 +74,122 @@ class TechnicalAnalysisOrchestrator(Orchestrator):
 
         return report_path
 
-    def _summarize(self, results: list[IndicatorResult], plan: OrchestratorPlan | None = None) -> SummaryResult:
+    def _compiled_plan(self, requested: list | None, period: str, interval: str) -> CompiledPlan:
+        """The cached compiled plan for ``requested`` at period/interval, planning it on a miss."""
+        cache = get_plan_cache()
+        key = plan_key(requested, period, interval)
+        compiled = cache.get(key)
+        if compiled is None:
+            compiled = self._plan(requested, period, interval)
+            # Fallback plans stay in memory so a later run retries the LLM
+            cache.put(compiled, persist=compiled.source == "llm")
+        return compiled
+
+    def _precomputed(self, ticker: str, compiled: CompiledPlan, stock_data, period: str) -> dict[str, IndicatorResult]:
+        """Results served from the materialized signal table (default params, same last bar)."""
+        table = get_signal_table(period)
+        if table is None or not table.is_fresh(ticker, stock_data):
+            return {}
+        served = {}
+        for step in compiled.steps:
+            if not step.inputs:
+                result = table.lookup(ticker, step.name, step.params_dict)
+                if result is not None:
+                    served[step.id] = result
+        return served
+
+    def _execute(self, compiled: CompiledPlan, stock_data, precomputed: dict | None = None) -> list[IndicatorResult]:
+        """Runs the compiled steps with ``run_dag``; returns one result per step, in plan order.
+
+        Steps found in ``precomputed`` (keyed by id) are not recomputed. A step that
+        overruns its deadline (``CompiledStep.timeout``) becomes a "Timeout" result and
+        does not hold up the others; outcomes and latencies are counted in ``task_stats``.
+        """
+        precomputed = precomputed or {}
+
+        def _node(step):
+            def fn(inputs):
+                if step.id in precomputed:
+                    return precomputed[step.id]
+                return step.run(stock_data, inputs)
+            timeout = None if step.id in precomputed else step.timeout
+            return DagNode(step.id, fn, list(step.inputs), step.pool, timeout=timeout)
+
+        # The graph was validated when the plan was compiled
+        outcomes = run_dag([_node(s) for s in compiled.steps], cap=compiled.cap,
+                           failed=lambda r: r.signal == "Error", validate=False)
+
+        results: list[IndicatorResult] = []
+        for step in compiled.steps:
+            outcome = outcomes[step.id]
+            if step.id not in precomputed:
+                record_task(step.name, outcome.status, outcome.latency)
+            if outcome.status == "timeout":
+                print(f'{step.name} timed out: {outcome.error}')
+                results.append(IndicatorResult(
+                    indicator=step.name, signal="Timeout", details=f"Timed out: {outcome.error}",
+                    meta={"params": step.params_dict},
+                ))
+            elif outcome.result is not None:
+                results.append(outcome.result)
+            elif outcome.status == "failed":
+                print(f'{step.name} generated an exception: {outcome.error}')
+                results.append(IndicatorResult(
+                    indicator=step.name, signal="Error", details=f"Could not calculate indicator: {outcome.error}",
+                    meta={"params": step.params_dict},
+                ))
+            else:
+                results.append(IndicatorResult(
+                    indicator=step.name, signal="Skipped", details=f"Skipped: upstream {outcome.failed_input} failed",
+                    meta={"params": step.params_dict, "inputs": list(step.inputs)},
+                ))
+        return results
+
+    def _summarize(
+        self, results: list[IndicatorResult], plan: OrchestratorPlan | None = None, delta: ReportDelta | None = None
+    ) -> SummaryResult:
         """Summarizes the results from the worker agents.
 
         Args:
             results: A list of JSON strings from the worker agents.
+            plan: Planning context for the prompt.
+            delta: Changes since the previous run, highlighted in the summary.
 
         Returns:
             A summary of the technical analysis.
         """
-        payload = [r.model_dump() for r in results]
+        # Compact table of the results within the prompt token budget
+        payload = PromptBuilder().build(results)
         plan_block = ""
         if plan:
             plan_block = (
-                f"Ticker: {plan.ticker}\nPeriod: {plan.period}\n"
+                f"Ticker: {plan.ticker}\nPeriod: {plan.period}\nInterval: {plan.interval}\n"
                 f"Requested: {plan.requested_indicators}\nPlanned: {plan.plan_indicators}\n"
                 f"Rationale: {plan.rationale or ''}\nStrategy: {plan.strategy or ''}\n\n"
             )
+        changes = delta_lines(delta) if delta is not None else []
+        if changes:
+            plan_block += f"Changes since the previous run ({delta.since}):\n" + "\n".join(f"- {c}" for c in changes) + "\n\n"
         prompt = (
             "You are summarizing a technical analysis using the following planning context and indicator results.\n\n"
             + plan_block
-            + "Indicator results (JSON):\n"
-            + json.dumps(payload)
+            + f"Indicator results ({TABLE_HEADER} table, one row per indicator):\n"
+            + payload.text
             + "\n\nProvide a clear, concise Markdown summary of the stock's technical outlook."
         )
 
         try:
-            if not config.OPENAI_API_KEY:
-                raise RuntimeError("OPENAI_API_KEY not configured")
-            global client
-            if client is None:
-                client = OpenAI(api_key=config.OPENAI_API_KEY)
             model_name = "gpt-4-turbo"
-            response = client.chat.completions.create(
+            summary_text = get_llm_dispatcher().complete(
                 model=model_name,
                 messages=[
                     {"role": "system", "content": "You are a financial analyst specializing in technical analysis."},
                     {"role": "user", "content": prompt},
                 ],
+                priority=PRIORITY_SUMMARY,
             )
-            summary_text = response.choices[0].message.content
-            return SummaryResult(summary_text=summary_text, method="openai", model=model_name)
+            return SummaryResult(summary_text=summary_text, method="openai", model=model_name,
+                                 prompt_tokens=payload.tokens, tokens_saved=payload.saved)
         except Exception as e:
             # Fallback: simple, local summary if OpenAI is unavailable
             lines = ["Technical Analysis Summary:"]
@@ -119,99 +199,68 @@ class TechnicalAnalysisOrchestrator(Orchestrator):
                     lines.append(f"Rationale: {plan.rationale}")
             for item in results:
                 lines.append(f"- {item.indicator}: {item.signal}. {item.details or ''}")
+            if changes:
+                lines.append(f"Changes since {delta.since}: {'; '.join(changes)}")
             lines.append(f"\n(Note: Used local fallback summary due to: {e})")
             return SummaryResult(summary_text="\n".join(lines), method="local_fallback")
 
-    def _plan(self, ticker: str, requested_indicators: list | None, period: str) -> OrchestratorPlan:
-        """LLM-based orchestration plan for which indicators to compute and why.
+    def _plan(self, requested_indicators: list | None, period: str, interval: str = "1d") -> CompiledPlan:
+        """LLM-based orchestration plan for which indicators to compute and why, compiled.
 
-        Falls back to a deterministic plan using the requested indicators (or defaults) if LLM is unavailable.
+        The plan does not depend on the ticker, so one is made per requested indicator set.
+        Falls back to a deterministic plan using the requested indicators (or defaults) if
+        the LLM is unavailable or its plan does not compile.
         """
-        default_indicators = ["RSI", "MACD", "Bollinger Bands", "Moving Average"]
-        base = OrchestratorPlan(
-            ticker=ticker,
-            period=period,
-            requested_indicators=requested_indicators or default_indicators,
-        )
+        requested = requested_indicators or DEFAULT_INDICATORS
         try:
-            if not config.OPENAI_API_KEY:
-                raise RuntimeError("OPENAI_API_KEY not configured")
-            global client
-            if client is None:
-                client = OpenAI(api_key=config.OPENAI_API_KEY)
             model_name = "gpt-4-turbo"
             system = (
-                "You are an expert trading assistant and orchestrator. Given a stock ticker and possible indicators, "
+                "You are an expert trading assistant and orchestrator. Given possible indicators, "
                 "propose an ordered list of indicators to compute and explain why. For each indicator, include parameters (e.g., window sizes). "
+                "Items may set an \"id\" and list the ids of items whose results they consume in \"inputs\". "
                 "Respond ONLY with JSON matching the schema: "
-                "{\"plan_items\":[{\"name\":string,\"params\":object}], \"plan_indicators\": string[], \"rationale\": string, \"strategy\": string, \"max_workers\": number}."
+                "{\"plan_items\":[{\"name\":string,\"params\":object,\"id\":string?,\"inputs\":string[]?}], \"plan_indicators\": string[], \"rationale\": string, \"strategy\": string, \"max_workers\": number}."
             )
             user = (
-                f"Ticker: {ticker}\nPeriod: {period}\nRequested indicators: {requested_indicators or default_indicators}. "
+                f"Period: {period}\nBar interval: {interval}\nRequested indicators: {requested}. "
                 "Consider typical retail/quant workflows and choose a sensible order."
             )
-            response = client.chat.completions.create(
+            # Planning is latency-critical for the run, so it jumps ahead of queued summaries
+            content = get_llm_dispatcher().complete(
                 model=model_name,
                 messages=[
                     {"role": "system", "content": system},
                     {"role": "user", "content": user},
                 ],
                 temperature=0.2,
-            )
-            content = response.choices[0].message.content or "{}"
+                priority=PRIORITY_PLAN,
+            ) or "{}"
             data = json.loads(content)
-            # Build plan items with sensible defaults if not provided
-            def default_params_for(name: str) -> dict:
-                name_low = name.lower()
-                if name_low == "rsi":
-                    return {"period": 14}
-                if name_low == "macd":
-                    return {"fast": 12, "slow": 26, "signal": 9}
-                if name_low in ("bollinger bands", "bollinger_bands", "bollinger-bands"):
-                    return {"window": 20, "stddev": 2}
-                if name_low in ("moving average", "moving_average", "moving-average"):
-                    return {"short_window": 50, "long_window": 200}
-                return {}
-            raw_items = data.get("plan_items") or []
-            if raw_items:
-                plan_items = [
-                    OrchestratorPlan.IndicatorPlanItem(name=it.get("name"), params=it.get("params") or default_params_for(it.get("name", "")))
-                    for it in raw_items if it and it.get("name")
-                ]
-            else:
-                names = data.get("plan_indicators") or (requested_indicators or default_indicators)
-                plan_items = [OrchestratorPlan.IndicatorPlanItem(name=n, params=default_params_for(n)) for n in names]
-
-            plan = OrchestratorPlan(
-                ticker=ticker,
+            # Missing params are filled with defaults when the plan is compiled
+            items = [it for it in (data.get("plan_items") or []) if it and it.get("name")]
+            if not items:
+                items = [{"name": n} for n in (data.get("plan_indicators") or requested)]
+            return compile_plan(
+                items,
+                requested=requested,
                 period=period,
-                requested_indicators=requested_indicators or default_indicators,
-                plan_indicators=[it.name for it in plan_items],
-                plan_items=plan_items,
+                interval=interval,
+                max_workers=data.get("max_workers"),
                 rationale=data.get("rationale"),
                 strategy=data.get("strategy"),
-                max_workers=data.get("max_workers"),
+                source="llm",
             )
-            return plan
         except Exception:
             # Fallback: use requested list or defaults
-            base.plan_indicators = requested_indicators or default_indicators
-            # populate basic plan_items with default params
-            def default_params_for(name: str) -> dict:
-                name_low = name.lower()
-                if name_low == "rsi":
-                    return {"period": 14}
-                if name_low == "macd":
-                    return {"fast": 12, "slow": 26, "signal": 9}
-                if name_low in ("bollinger bands", "bollinger_bands", "bollinger-bands"):
-                    return {"window": 20, "stddev": 2}
-                if name_low in ("moving average", "moving_average", "moving-average"):
-                    return {"short_window": 50, "long_window": 200}
-                return {}
-            base.plan_items = [OrchestratorPlan.IndicatorPlanItem(name=n, params=default_params_for(n)) for n in base.plan_indicators]
-            base.rationale = "Fallback plan: using requested indicators (or defaults) due to unavailable LLM or parsing error."
-            base.strategy = "Compute indicators in given order and summarize."
-            return base
+            return compile_plan(
+                [{"name": n} for n in requested],
+                requested=requested,
+                period=period,
+                interval=interval,
+                rationale="Fallback plan: using requested indicators (or defaults) due to unavailable LLM or parsing error.",
+                strategy="Compute indicators in given order and summarize.",
+                source="fallback",
+            )
 
     def _save_report(self, ticker: str, analysis: AnalysisReport) -> str:
         """Saves the analysis report to a markdown file.
@@ -223,30 +272,22 @@ class TechnicalAnalysisOrchestrator(Orchestrator):
         Returns:
             The path to the saved report.
         """
-        reports_dir = "reports"
-        if not os.path.exists(reports_dir):
-            os.makedirs(reports_dir)
-
-        date_str = datetime.now().strftime("%Y%m%d")
         # Markdown report with explicit technical suffix
-        md_path = os.path.join(reports_dir, f"{ticker}_{date_str}_technical.md")
+        md_path = report_path(ticker, "technical", reports_dir=self.writer.reports_dir)
 
         # Resolve display name locally here to keep changes scoped to report generation
         stock_name = self._resolve_stock_name(ticker)
-        header = f"### Technical Analysis Report: {stock_name}\n\n"
-        with open(md_path, "w") as f:
-            f.write(header + analysis.summary.summary_text)
-
-        return md_path
+        markdown = get_renderer("md").report(analysis, "technical", name=stock_name)
+        section = ReportSection(ticker, "technical", markdown, md_path, analysis)
+        return self.writer.add_section(section)
 
     def _resolve_stock_name(self, ticker: str) -> str:
         """Best-effort resolution of a human-readable stock name.
 
-        Uses yfinance metadata; falls back to the ticker when unavailable.
+        Uses data-source metadata; falls back to the ticker when unavailable.
         """
         try:
-            stock = yf.Ticker(ticker)
-            info = getattr(stock, "info", {}) or {}
+            info = get_data_source().info(ticker) or {}
             name = info.get("shortName") or info.get("longName")
             return name or ticker
         except Exception:
@@ -0,0 +1,93 @@
+"""Memory-bounded indicator runs over large universes from the price store.
+
+``scan_universe`` streams tickers through the shared CPU pool with a bounded
+number in flight. Each ticker is handed to ``IndicatorWorker`` as a
+``LazyPrices`` window, so only the largest declared ``lookback`` of the
+requested indicators is read from disk, once per ticker, and released as
+soon as its results are yielded. Peak memory therefore depends on the
+lookback and the in-flight bound, not on history length or universe size.
+
+``scan_history`` applies a series kernel over a ticker's whole history in
+``lookback + rows`` chunks, for backfills that need every bar.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+import pandas as pd
+
+from core.execution import get_pool
+from core.models import IndicatorResult
+from data.price_store import PriceStore, get_price_store
+from .indicator_worker import IndicatorWorker
+
+
+def required_lookback(indicators: List[str], params: Dict[str, dict] | None = None) -> int | None:
+    """Largest lookback declared by ``indicators`` (None if any needs the full history)."""
+    params = params or {}
+    needed = 1
+    for name in indicators:
+        try:
+            lb = IndicatorWorker(name).resolve_class().lookback(params.get(name) or {})
+        except (ImportError, AttributeError):
+            continue  # the worker reports unknown indicators as errors
+        if lb is None:
+            return None
+        needed = max(needed, int(lb))
+    return needed
+
+
+def scan_universe(
+    tickers: Iterable[str],
+    indicators: List[str],
+    params: Dict[str, dict] | None = None,
+    store: PriceStore | None = None,
+    max_in_flight: int = 32,
+) -> Iterator[Tuple[str, List[IndicatorResult]]]:
+    """Yields ``(ticker, results)`` for every stored ticker, in submission order.
+
+    Args:
+        tickers: Universe to scan (any iterable; consumed lazily).
+        indicators: Indicator names, as for ``IndicatorWorker``.
+        params: Optional per-indicator params keyed by indicator name.
+        store: Price store to read from; defaults to the process-wide store.
+        max_in_flight: Tickers submitted to the CPU pool at once (bounds memory).
+    """
+    store = store or get_price_store()
+    params = params or {}
+    lookback = required_lookback(indicators, params)
+    pool = get_pool("cpu")
+
+    def _one(ticker: str) -> List[IndicatorResult]:
+        prices = store.lazy(ticker).prefetch(lookback)
+        return [IndicatorWorker(name).run(prices, params.get(name) or {}) for name in indicators]
+
+    pending: deque = deque()
+    for ticker in tickers:
+        pending.append((ticker, pool.submit(_one, ticker)))
+        if len(pending) >= max_in_flight:
+            ticker_done, future = pending.popleft()
+            yield ticker_done, future.result()
+    while pending:
+        ticker_done, future = pending.popleft()
+        yield ticker_done, future.result()
+
+
+def scan_history(
+    ticker: str,
+    kernel: Callable[[pd.DataFrame], pd.DataFrame | pd.Series],
+    lookback: int,
+    rows: int = 2048,
+    store: PriceStore | None = None,
+) -> Iterator[pd.DataFrame | pd.Series]:
+    """Applies ``kernel`` over the ticker's full history, ``lookback + rows`` rows at a time.
+
+    Yields only the rows each chunk adds (the lookback context is dropped), so
+    concatenating the output equals ``kernel(full_history)`` for kernels whose
+    value depends on at most ``lookback`` trailing rows.
+    """
+    store = store or get_price_store()
+    for frame in store.iter_chunks(ticker, rows, lookback):
+        yield kernel(frame).iloc[frame.attrs["context_rows"]:]
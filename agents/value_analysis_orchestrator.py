@@ -2,29 +2,42 @@ from __future__ import annotations
 
 from core.orchestrator import Orchestrator
 from core.models import IndicatorResult, AnalysisReport, SummaryResult, OrchestratorPlan
-from openai import OpenAI
+from core.llm import PRIORITY_SUMMARY, get_llm_dispatcher
+from core.prompts import TABLE_HEADER, PromptBuilder
 from datetime import datetime
-import json
-import os
-import yfinance as yf
-
-from .value_analysis_worker import ValueAnalysisWorker
-import config
 
+import pandas as pd
 
-client = None  # Lazily initialized when needed
+from data.fundamentals import get_sector_percentiles, get_snapshot
+from data.sources import get_data_source
+from reporting.render import get_renderer
+from reporting.report_writer import ReportSection, ReportWriter, report_path
+from .deltas import get_delta_store
+from .value_analysis_worker import ValueAnalysisWorker
+from .value_scoring import score_snapshot, score_snapshot_peer
 
 
 class ValueAnalysisOrchestrator(Orchestrator):
     """Orchestrator for performing value/fundamental analysis on a stock."""
 
-    def run(self, ticker: str) -> str:
-        # Run a single value-analysis worker
-        worker = ValueAnalysisWorker(ticker)
+    def __init__(self, writer: ReportWriter | None = None, deltas: bool = False):
+        # Shared writer lets a batch buffer reports and combine them in memory
+        self.writer = writer or ReportWriter()
+        # Compare each run with the ticker's previous one; unchanged tickers get a compact report
+        self.deltas = deltas
+
+    def run(self, ticker: str, snapshot: pd.DataFrame | None = None, mode: str = "absolute") -> str:
+        # Run a single value-analysis worker (reads the snapshot row when one is given;
+        # peer mode looks up today's precomputed sector percentiles)
+        worker = ValueAnalysisWorker(ticker, snapshot=snapshot, mode=mode)
         result: IndicatorResult = worker.run()
 
-        # Summarize the result (LLM with fallback)
-        summary = self._summarize([result])
+        # Summarize the result (LLM with fallback); skipped when signal and score are unchanged
+        delta = get_delta_store().update(ticker, "value", [result]) if self.deltas else None
+        if delta is not None and delta.status == "unchanged":
+            summary = SummaryResult(summary_text=f"No change since {delta.since}.", method="local_fallback")
+        else:
+            summary = self._summarize([result])
 
         # Build and save analysis report
         analysis = AnalysisReport(
@@ -33,20 +46,44 @@ class ValueAnalysisOrchestrator(Orchestrator):
             generated_at=datetime.now(),
             indicators=[result],
             summary=summary,
-            plan=self._fake_plan(ticker),
+            plan=self._fake_plan(ticker, mode=result.meta.get("mode", "absolute") if result.meta else "absolute"),
+            delta=delta,
         )
 
         report_path = self._save_report(ticker, analysis)
         return report_path
 
-    def _fake_plan(self, ticker: str) -> OrchestratorPlan:
+    def rank(
+        self, tickers: list[str], date: str | None = None, rationales: bool = False, mode: str = "absolute"
+    ) -> pd.DataFrame:
+        """Scores a whole universe from the daily fundamentals snapshot, best first.
+
+        Args:
+            tickers: Universe to rank; missing tickers are fetched into the snapshot once.
+            date: Snapshot date (YYYYMMDD); defaults to today.
+            rationales: Include per-ticker rationales/details (slower for large universes).
+            mode: "absolute" thresholds or "peer" (sector percentile) scoring.
+
+        Returns:
+            DataFrame indexed by ticker with score and signal columns, sorted by score.
+        """
+        subset = get_snapshot(tickers, date=date)
+        if mode == "peer":
+            # Percentiles are ranked against the full day's snapshot, not just this subset
+            pct = get_sector_percentiles(date)
+            scored = score_snapshot_peer(subset, pct, rationales=rationales)
+        else:
+            scored = score_snapshot(subset, rationales=rationales)
+        return scored.sort_values("score", ascending=False, kind="stable")
+
+    def _fake_plan(self, ticker: str, mode: str = "absolute") -> OrchestratorPlan:
         # Provide a minimal plan-like object so downstream stays consistent
         return OrchestratorPlan(
             ticker=ticker,
             period="n/a",
             requested_indicators=["Value Analysis"],
             plan_indicators=["Value Analysis"],
-            plan_items=[OrchestratorPlan.IndicatorPlanItem(name="Value Analysis", params={})],
+            plan_items=[OrchestratorPlan.IndicatorPlanItem(name="Value Analysis", params={"mode": mode} if mode != "absolute" else {})],
             rationale=(
                 "Evaluate fundamental metrics such as P/E, P/B, margins, ROE, revenue growth, FCF yield, and leverage to form a value thesis."
             ),
@@ -54,32 +91,29 @@ class ValueAnalysisOrchestrator(Orchestrator):
         )
 
     def _summarize(self, results: list[IndicatorResult]) -> SummaryResult:
-        payload = [r.model_dump() for r in results]
+        # Compact table (metrics rounded, rationale lists left out) within the token budget
+        payload = PromptBuilder().build(results)
         prompt = (
             "You are a financial analyst specializing in value investing.\n"
             "Given the following fundamental metrics and heuristic score, write a concise Markdown summary of the business quality and valuation. "
             "Include highlights on margins, growth, returns on capital, leverage, and whether valuation appears attractive.\n\n"
-            f"Results (JSON):\n{json.dumps(payload)}\n\n"
+            f"Results ({TABLE_HEADER} table):\n{payload.text}\n\n"
             "Be balanced and note caveats when data is missing."
         )
 
         try:
-            if not config.OPENAI_API_KEY:
-                raise RuntimeError("OPENAI_API_KEY not configured")
-            global client
-            if client is None:
-                client = OpenAI(api_key=config.OPENAI_API_KEY)
             model_name = "gpt-4-turbo"
-            response = client.chat.completions.create(
+            summary_text = get_llm_dispatcher().complete(
                 model=model_name,
                 messages=[
                     {"role": "system", "content": "You are a value-focused equity analyst."},
                     {"role": "user", "content": prompt},
                 ],
                 temperature=0.2,
+                priority=PRIORITY_SUMMARY,
             )
-            summary_text = response.choices[0].message.content
-            return SummaryResult(summary_text=summary_text, method="openai", model=model_name)
+            return SummaryResult(summary_text=summary_text, method="openai", model=model_name,
+                                 prompt_tokens=payload.tokens, tokens_saved=payload.saved)
         except Exception as e:
             # Fallback: simple summary
             r = results[0]
@@ -98,23 +132,16 @@ class ValueAnalysisOrchestrator(Orchestrator):
             return SummaryResult(summary_text="\n".join(lines), method="local_fallback", model=None)
 
     def _save_report(self, ticker: str, analysis: AnalysisReport) -> str:
-        reports_dir = "reports"
-        if not os.path.exists(reports_dir):
-            os.makedirs(reports_dir)
-
-        date_str = datetime.now().strftime("%Y%m%d")
-        md_path = os.path.join(reports_dir, f"{ticker}_{date_str}_value.md")
+        md_path = report_path(ticker, "value", reports_dir=self.writer.reports_dir)
 
         stock_name = self._resolve_stock_name(ticker)
-        header = f"### Value Analysis Report: {stock_name}\n\n"
-        with open(md_path, "w") as f:
-            f.write(header + analysis.summary.summary_text)
-        return md_path
+        markdown = get_renderer("md").report(analysis, "value", name=stock_name)
+        section = ReportSection(ticker, "value", markdown, md_path, analysis)
+        return self.writer.add_section(section)
 
     def _resolve_stock_name(self, ticker: str) -> str:
         try:
-            stock = yf.Ticker(ticker)
-            info = getattr(stock, "info", {}) or {}
+            info = get_data_source().info(ticker) or {}
             name = info.get("shortName") or info.get("longName")
             return name or ticker
         except Exception:
@@ -0,0 +1,255 @@
+"""Vectorized value scoring over a fundamentals snapshot.
+
+The P/E, P/B, FCF-yield, margin, ROE, growth, leverage and liquidity rules are
+declared once in ``VALUE_RULES``; ``score_snapshot`` applies them to a whole
+(ticker x metric) table with numpy, and ``ValueAnalysisWorker`` scores a single
+ticker through the same table, so both paths agree exactly.
+
+``PEER_RULES`` is the peer-relative variant: instead of absolute thresholds it
+scores each metric by its percentile rank within the ticker's sector (see
+``data.fundamentals.sector_percentiles``).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class Band:
+    op: str  # "<", ">", "<=" or ">="
+    threshold: float
+    points: int
+    label: str  # threshold as shown in rationales, e.g. "15" or "8%"
+
+
+@dataclass(frozen=True)
+class ValueRule:
+    """Ordered bands for one metric; the first matching band wins (if/elif)."""
+
+    column: str
+    name: str
+    fmt: str
+    bands: Tuple[Band, ...]
+
+
+VALUE_RULES: Tuple[ValueRule, ...] = (
+    # P/E (prefer lower vs growth caveat)
+    ValueRule("trailingPE", "Trailing P/E", ".1f", (
+        Band("<", 15, 2, "15"), Band("<", 25, 1, "25"), Band(">", 35, -2, "35"), Band(">", 25, -1, "25"),
+    )),
+    ValueRule("priceToBook", "P/B", ".2f", (
+        Band("<", 1.0, 2, "1.0"), Band("<", 2.0, 1, "2.0"), Band(">", 5.0, -2, "5.0"), Band(">", 3.0, -1, "3.0"),
+    )),
+    ValueRule("fcfYield", "FCF yield", ".2%", (
+        Band(">", 0.08, 2, "8%"), Band(">", 0.04, 1, "4%"), Band("<", 0.00, -2, "0%"), Band("<", 0.02, -1, "2%"),
+    )),
+    ValueRule("profitMargins", "Profit margin", ".1%", (
+        Band(">", 0.15, 2, "15%"), Band(">", 0.08, 1, "8%"), Band("<", 0.00, -2, "0%"), Band("<", 0.03, -1, "3%"),
+    )),
+    ValueRule("returnOnEquity", "ROE", ".1%", (
+        Band(">", 0.15, 2, "15%"), Band(">", 0.08, 1, "8%"), Band("<", 0.00, -2, "0%"), Band("<", 0.05, -1, "5%"),
+    )),
+    ValueRule("revenueGrowth", "Revenue growth", ".1%", (
+        Band(">", 0.10, 1, "10%"), Band("<", 0.00, -1, "0%"),
+    )),
+    # Leverage: yfinance uses percentage points sometimes; keep lenient
+    ValueRule("debtToEquity", "Debt/Equity", ".1f", (
+        Band("<", 50, 2, "50"), Band("<", 100, 1, "100"), Band(">", 200, -2, "200"), Band(">", 150, -1, "150"),
+    )),
+    ValueRule("currentRatio", "Current ratio", ".2f", (
+        Band(">", 2.0, 1, "2.0"), Band("<", 1.0, -1, "1.0"),
+    )),
+)
+
+
+@dataclass(frozen=True)
+class PeerRule:
+    """Scores a metric by its sector percentile; ``higher_is_better`` orients the rank."""
+
+    column: str
+    name: str
+    fmt: str
+    higher_is_better: bool
+    points: int  # magnitude for the top/bottom quintile
+
+
+PEER_RULES: Tuple[PeerRule, ...] = (
+    PeerRule("trailingPE", "Trailing P/E", ".1f", False, 2),
+    PeerRule("priceToBook", "P/B", ".2f", False, 2),
+    PeerRule("fcfYield", "FCF yield", ".2%", True, 2),
+    PeerRule("profitMargins", "Profit margin", ".1%", True, 2),
+    PeerRule("returnOnEquity", "ROE", ".1%", True, 2),
+    PeerRule("revenueGrowth", "Revenue growth", ".1%", True, 1),
+    PeerRule("debtToEquity", "Debt/Equity", ".1f", False, 2),
+    PeerRule("currentRatio", "Current ratio", ".2f", True, 1),
+)
+
+
+def _peer_bands(points: int) -> Tuple[Band, ...]:
+    # Bands apply to "goodness" = percentile oriented so that 1.0 is best in sector
+    if points >= 2:
+        return (
+            Band(">=", 0.8, points, "top 20%"), Band(">=", 0.6, 1, "top 40%"),
+            Band("<=", 0.2, -points, "bottom 20%"), Band("<=", 0.4, -1, "bottom 40%"),
+        )
+    return (Band(">=", 0.8, points, "top 20%"), Band("<=", 0.2, -points, "bottom 20%"))
+
+
+_PEER_VALUE_RULES: Tuple[ValueRule, ...] = tuple(
+    ValueRule(r.column, r.name, r.fmt, _peer_bands(r.points)) for r in PEER_RULES
+)
+
+_OPS = {"<": np.less, ">": np.greater, "<=": np.less_equal, ">=": np.greater_equal}
+
+
+def signal_for_scores(score: np.ndarray) -> np.ndarray:
+    """Maps integer value scores to signal labels."""
+    return np.select(
+        [score >= 4, score >= 1, score <= -3],
+        ["Undervalued/Quality", "Reasonable", "Overvalued/Risky"],
+        default="Mixed/Neutral",
+    )
+
+
+def score_snapshot(snapshot: pd.DataFrame, rationales: bool = True) -> pd.DataFrame:
+    """Scores every ticker in a fundamentals snapshot at once.
+
+    Args:
+        snapshot: Table indexed by ticker with the columns referenced by VALUE_RULES.
+        rationales: Also build rationale lists and details strings (skip for pure ranking).
+
+    Returns:
+        DataFrame indexed like ``snapshot`` with ``score`` and ``signal`` (plus
+        ``details`` and ``rationales`` when requested).
+    """
+    columns = {rule.column: snapshot[rule.column].to_numpy(dtype=float) for rule in VALUE_RULES}
+    score, matches = _score_arrays(columns)
+    out = pd.DataFrame({"score": score, "signal": signal_for_scores(score)}, index=snapshot.index)
+    if rationales:
+        texts = _rationales(columns, matches, len(snapshot))
+        out["rationales"] = texts
+        out["details"] = [_details(int(s), r) for s, r in zip(score, texts)]
+    return out
+
+
+def score_metrics(metrics: Mapping[str, Optional[float]]) -> Tuple[int, str, str, List[str]]:
+    """Scores one ticker's metrics dict; returns (score, signal, details, rationales)."""
+    columns = {
+        rule.column: np.array([np.nan if metrics.get(rule.column) is None else metrics[rule.column]], dtype=float)
+        for rule in VALUE_RULES
+    }
+    score, matches = _score_arrays(columns)
+    texts = _rationales(columns, matches, 1)[0]
+    s = int(score[0])
+    return s, str(signal_for_scores(score)[0]), _details(s, texts), texts
+
+
+def score_snapshot_peer(
+    snapshot: pd.DataFrame, percentiles: pd.DataFrame, rationales: bool = True
+) -> pd.DataFrame:
+    """Peer-relative variant of ``score_snapshot`` driven by sector percentiles.
+
+    Args:
+        snapshot: Fundamentals snapshot (raw values, used for rationale text).
+        percentiles: Output of ``sector_percentiles`` for the same snapshot.
+        rationales: Also build rationale lists and details strings.
+    """
+    pct = percentiles.reindex(snapshot.index)
+    goodness = _goodness(pct)
+    score, matches = _score_arrays(goodness, _PEER_VALUE_RULES)
+    out = pd.DataFrame({"score": score, "signal": signal_for_scores(score)}, index=snapshot.index)
+    if rationales:
+        raw = {r.column: snapshot[r.column].to_numpy(dtype=float) for r in PEER_RULES}
+        groups = pct["sector"].fillna("Universe").astype(str).to_numpy()
+
+        def reason(rule: ValueRule, band: Band, i: int) -> str:
+            g = goodness[rule.column][i]
+            return _peer_reason(rule, band, float(raw[rule.column][i]), float(g), groups[i])
+
+        texts = _rationales(goodness, matches, len(snapshot), _PEER_VALUE_RULES, reason)
+        out["rationales"] = texts
+        out["details"] = [_details(int(s), r) for s, r in zip(score, texts)]
+    return out
+
+
+def score_metrics_peer(
+    metrics: Mapping[str, Optional[float]], percentiles: Mapping[str, float], sector: str
+) -> Tuple[int, str, str, List[str]]:
+    """Peer-relative ``score_metrics`` for one ticker given its precomputed percentile row."""
+    pct = {
+        r.column: np.array([np.nan if percentiles.get(r.column) is None else percentiles[r.column]], dtype=float)
+        for r in PEER_RULES
+    }
+    goodness = _goodness(pct)
+    score, matches = _score_arrays(goodness, _PEER_VALUE_RULES)
+
+    def reason(rule: ValueRule, band: Band, _i: int) -> str:
+        return _peer_reason(rule, band, float(metrics[rule.column]), float(goodness[rule.column][0]), sector)
+
+    texts = _rationales(goodness, matches, 1, _PEER_VALUE_RULES, reason)[0]
+    s = int(score[0])
+    return s, str(signal_for_scores(score)[0]), _details(s, texts), texts
+
+
+def _goodness(pct) -> Dict[str, np.ndarray]:
+    out = {}
+    for r in PEER_RULES:
+        p = np.asarray(pct[r.column], dtype=float)
+        out[r.column] = p if r.higher_is_better else 1.0 - p
+    return out
+
+
+def _score_arrays(
+    columns: Dict[str, np.ndarray], rules: Tuple[ValueRule, ...] = VALUE_RULES
+) -> Tuple[np.ndarray, List[np.ndarray]]:
+    n = len(next(iter(columns.values())))
+    score = np.zeros(n, dtype=np.int64)
+    matches: List[np.ndarray] = []
+    for rule in rules:
+        x = columns[rule.column]
+        # NaN compares False everywhere, so missing metrics match no band
+        conds = [_OPS[b.op](x, b.threshold) for b in rule.bands]
+        idx = np.select(conds, np.arange(len(rule.bands)), default=-1)
+        points = np.array([b.points for b in rule.bands] + [0], dtype=np.int64)
+        score += points[idx]
+        matches.append(idx)
+    return score, matches
+
+
+def _rationales(
+    columns: Dict[str, np.ndarray],
+    matches: List[np.ndarray],
+    n: int,
+    rules: Tuple[ValueRule, ...] = VALUE_RULES,
+    reason: Optional[Callable[[ValueRule, Band, int], str]] = None,
+) -> List[List[str]]:
+    if reason is None:
+        def reason(rule: ValueRule, band: Band, i: int) -> str:
+            return _reason(rule, band, float(columns[rule.column][i]))
+
+    texts = np.full((n, len(rules)), None, dtype=object)
+    for j, (rule, idx) in enumerate(zip(rules, matches)):
+        rows = np.flatnonzero(idx >= 0)
+        if rows.size == 0:
+            continue
+        texts[rows, j] = [reason(rule, rule.bands[b], int(i)) for b, i in zip(idx[rows], rows)]
+    return [[t for t in row if t is not None] for row in texts]
+
+
+def _reason(rule: ValueRule, band: Band, value: float) -> str:
+    sign = "+" if band.points >= 0 else ""
+    return f"{sign}{band.points}: {rule.name} {value:{rule.fmt}} {band.op} {band.label}"
+
+
+def _peer_reason(rule: ValueRule, band: Band, value: float, pct: float, group: str) -> str:
+    sign = "+" if band.points >= 0 else ""
+    return f"{sign}{band.points}: {rule.name} {value:{rule.fmt}} in {band.label} of {group} peers (peer rank {pct:.0%})"
+
+
+def _details(score: int, rationales: List[str]) -> str:
+    return f"Value score {score}. Key points: " + "; ".join(rationales[:8]) + ("; ..." if len(rationales) > 8 else "")
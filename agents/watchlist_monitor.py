@@ -0,0 +1,309 @@
+"""Live watchlist monitor with incremental per-ticker indicator state.
+
+Each ticker keeps streaming indicator states (``indicators/streaming.py``)
+seeded once from history. New bars are either pushed (``on_bars``) or pulled
+from the data source (``poll``, which fetches back to each ticker's last
+applied bar, so a stale seed or a long outage is backfilled rather than
+skipped); only tickers with bars later than the last one applied, or whose
+last bar was revised, are advanced, so evaluation work scales with the number
+of tickers that changed rather than with the watchlist size. The newest bar
+may still be forming (today's daily bar, the current intraday bar): the state
+from before it is kept, and the bar is re-applied when a later fetch revises
+its close, so indicators never keep a provisional close. Every signal
+transition (e.g. RSI Neutral -> Oversold, MACD Bearish -> Bullish) becomes an
+``Alert`` written to a local sink (JSON Lines by default).
+
+    python -m agents.watchlist_monitor AAPL MSFT NVDA --interval 5m --every 60
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+import argparse
+import concurrent.futures
+import json
+import math
+import os
+import threading
+import time
+
+import pandas as pd
+
+import config
+from core.execution import get_pool
+from data.data_fetcher import get_stock_data
+from data.sources import DataSource, get_data_source
+from indicators.streaming import StreamingIndicator, make_streaming
+
+DEFAULT_WATCH_INDICATORS = ["RSI", "MACD", "Bollinger Bands", "Moving Average"]
+
+# Fetch periods by the calendar days they are sure to cover, shortest first
+_CATCH_UP_PERIODS = [("1d", 1), ("5d", 5), ("1mo", 28), ("3mo", 89), ("6mo", 181),
+                     ("1y", 365), ("2y", 730), ("5y", 1826), ("10y", 3652)]
+
+
+@dataclass
+class Alert:
+    ticker: str
+    indicator: str
+    previous: str
+    current: str
+    bar_time: str
+    values: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def message(self) -> str:
+        return f"{self.ticker} {self.indicator}: {self.previous} -> {self.current} at {self.bar_time}"
+
+
+class JsonlAlertSink:
+    """Appends alerts as JSON Lines to ``reports/alerts_<YYYYMMDD>.jsonl``."""
+
+    def __init__(self, path: str | None = None, echo: bool = False):
+        self.path = path or os.path.join("reports", f"alerts_{datetime.now().strftime('%Y%m%d')}.jsonl")
+        self.echo = echo
+        self._lock = threading.Lock()
+
+    def emit(self, alerts: List[Alert]) -> None:
+        if not alerts:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        lines = "".join(json.dumps({**asdict(a), "message": a.message}) + "\n" for a in alerts)
+        with self._lock, open(self.path, "a") as f:
+            f.write(lines)
+        if self.echo:
+            for a in alerts:
+                print(a.message)
+
+
+class TickerState:
+    """Streaming indicator states and the timestamp (UTC) and close of the last applied bar."""
+
+    def __init__(self, ticker: str, indicators: Dict[str, StreamingIndicator]):
+        self.ticker = ticker
+        self.indicators = indicators
+        self.last_bar: Optional[pd.Timestamp] = None
+        self.last_close: Optional[float] = None
+        self.applied = 0  # bars applied (or re-applied) by the last ``apply``
+        self._before_last: Optional[Dict[str, StreamingIndicator]] = None  # states before the last bar
+
+    def seed(self, bars: pd.DataFrame) -> None:
+        """Primes the indicators from history (the last bar stays revisable)."""
+        closes = bars["Close"].to_numpy(dtype=float)
+        if not len(closes):
+            return
+        for ind in self.indicators.values():
+            ind.seed(closes[:-1])
+        self._before_last = {name: ind.copy() for name, ind in self.indicators.items()}
+        for ind in self.indicators.values():
+            ind.update(float(closes[-1]))
+        self.last_bar, self.last_close = _utc_index(bars.index)[-1], float(closes[-1])
+
+    def apply(self, bars: pd.DataFrame) -> List[Alert]:
+        """Advances every indicator over bars newer than ``last_bar``; returns transitions.
+
+        If ``bars`` repeat the last applied bar with a different close (it was still
+        forming), the indicators are rewound to before it and it is applied again.
+        """
+        times = _utc_index(bars.index)
+        closes = bars["Close"].to_numpy(dtype=float)
+        start, shown = 0, None
+        if self.last_bar is not None:
+            start = int(times.searchsorted(self.last_bar))
+            if start < len(times) and times[start] == self.last_bar:
+                if _same_close(closes[start], self.last_close) or self._before_last is None:
+                    start += 1
+                else:
+                    # Revised close: rewind, and report transitions from the signals shown so far
+                    shown = {name: ind.signal for name, ind in self.indicators.items()}
+                    self.indicators = self._before_last
+        self.applied = len(times) - start
+        alerts: List[Alert] = []
+        for k in range(start, len(times)):
+            if k == len(times) - 1:
+                self._before_last = {name: ind.copy() for name, ind in self.indicators.items()}
+            for name, state in self.indicators.items():
+                before = shown[name] if shown is not None and k == start else state.signal
+                after = state.update(float(closes[k]))
+                if before is not None and after is not None and after != before:
+                    alerts.append(Alert(self.ticker, name, before, after, str(bars.index[k]), dict(state.values)))
+        if self.applied:
+            self.last_bar, self.last_close = times[-1], float(closes[-1])
+        return alerts
+
+
+class WatchlistMonitor:
+    """Keeps incremental indicator state for a watchlist and emits signal transitions."""
+
+    def __init__(
+        self,
+        tickers: Iterable[str],
+        indicators: List[str] | None = None,
+        params: Dict[str, dict] | None = None,
+        interval: str = "1d",
+        source: DataSource | None = None,
+        sink: Any = None,
+    ):
+        """
+        Args:
+            tickers: Symbols to watch.
+            indicators: Indicator names with a streaming implementation (defaults to the report set).
+            params: Optional per-indicator params keyed by indicator name.
+            interval: Bar interval to monitor ("1d" or an intraday interval from ``data/bars.py``).
+            source: Data source for seeding and polling; defaults to the process-wide source.
+            sink: Object with ``emit(alerts)``; defaults to a JSON Lines file under ``reports/``.
+        """
+        self.tickers = list(dict.fromkeys(tickers))
+        self.indicator_names = indicators or list(DEFAULT_WATCH_INDICATORS)
+        self.params = params or {}
+        self.interval = interval
+        self.source = source or get_data_source()
+        self.sink = sink if sink is not None else JsonlAlertSink()
+        self.states: Dict[str, TickerState] = {}
+        self._stats = {"cycles": 0, "changed": 0, "bars": 0, "alerts": 0}
+        self.last_changed = 0  # tickers advanced by the most recent push/poll
+
+    def seed(self) -> None:
+        """Loads history for every ticker (on the I/O pool) and primes the indicator states."""
+        pool = get_pool("io")
+        futures = {pool.submit(self._history, t): t for t in self.tickers if t not in self.states}
+        for future in concurrent.futures.as_completed(futures):
+            ticker = futures[future]
+            try:
+                bars = future.result()
+            except Exception as exc:
+                print(f"Could not seed {ticker}: {exc}")
+                continue
+            state = self._new_state(ticker)
+            state.seed(bars)
+            self.states[ticker] = state
+
+    def on_bars(self, ticker: str, bars: pd.DataFrame) -> List[Alert]:
+        """Push entry point: applies new bars for one ticker and emits its alerts."""
+        alerts = self._apply(ticker, bars)
+        self.sink.emit(alerts)
+        return alerts
+
+    def push(self, updates: Dict[str, pd.DataFrame]) -> List[Alert]:
+        """Applies a batch of pushed bars (only the tickers present are touched)."""
+        alerts: List[Alert] = []
+        changed = 0
+        for ticker, bars in updates.items():
+            before = self._stats["changed"]
+            alerts.extend(self._apply(ticker, bars))
+            changed += self._stats["changed"] - before
+        self._stats["cycles"] += 1
+        self.last_changed = changed
+        self.sink.emit(alerts)
+        return alerts
+
+    def poll(self, tickers: Iterable[str] | None = None) -> List[Alert]:
+        """Pull entry point: fetches the latest bars and advances tickers with new or revised bars."""
+        tickers = list(tickers) if tickers is not None else self.tickers
+        pool = get_pool("io")
+        futures = {pool.submit(self._latest, t): t for t in tickers}
+        updates: Dict[str, pd.DataFrame] = {}
+        for future in concurrent.futures.as_completed(futures):
+            ticker = futures[future]
+            try:
+                bars = future.result()
+            except Exception as exc:
+                print(f"Could not poll {ticker}: {exc}")
+                continue
+            if len(bars):
+                updates[ticker] = bars
+        return self.push(updates)
+
+    def run(self, every: float = 60.0, iterations: int | None = None) -> None:
+        """Seeds, then polls every ``every`` seconds (forever unless ``iterations`` is set)."""
+        self.seed()
+        n = 0
+        while iterations is None or n < iterations:
+            started = time.monotonic()
+            alerts = self.poll()
+            print(f"Polled {len(self.tickers)} tickers: {self.last_changed} changed, "
+                  f"{len(alerts)} alerts in {time.monotonic() - started:.2f}s")
+            n += 1
+            if iterations is None or n < iterations:
+                time.sleep(max(0.0, every - (time.monotonic() - started)))
+
+    def signals(self, ticker: str) -> Dict[str, Optional[str]]:
+        """Current signal per indicator for ``ticker``."""
+        state = self.states.get(ticker)
+        return {name: ind.signal for name, ind in state.indicators.items()} if state else {}
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._stats, "tickers": len(self.states)}
+
+    def _apply(self, ticker: str, bars: pd.DataFrame) -> List[Alert]:
+        state = self.states.get(ticker)
+        if state is None:
+            # Unseen ticker: the pushed bars become its seed history
+            state = self._new_state(ticker)
+            self.states[ticker] = state
+        alerts = state.apply(bars)
+        if state.applied:
+            self._stats["changed"] += 1
+            self._stats["bars"] += state.applied
+        self._stats["alerts"] += len(alerts)
+        return alerts
+
+    def _new_state(self, ticker: str) -> TickerState:
+        return TickerState(
+            ticker, {name: make_streaming(name, self.params.get(name)) for name in self.indicator_names}
+        )
+
+    def _history(self, ticker: str) -> pd.DataFrame:
+        return get_stock_data(ticker, source=self.source, interval=self.interval)
+
+    def _latest(self, ticker: str) -> pd.DataFrame:
+        # Reach back to the last applied bar: the seed may come from an old cached
+        # CSV, and bars missed during a gap must be applied in order
+        state = self.states.get(ticker)
+        period = catch_up_period(state.last_bar if state else None, self.interval)
+        try:
+            return self.source.history(ticker, period, self.interval)
+        except FileNotFoundError:
+            # A replay with no recording for that period: re-read the seed history
+            return self._history(ticker)
+
+
+def catch_up_period(last_bar: Optional[pd.Timestamp], interval: str = "1d") -> str:
+    """Shortest fetch period (yfinance style) whose window still includes ``last_bar``."""
+    minimum = "5d" if interval == "1d" else "1d"
+    if last_bar is None:
+        return minimum
+    gap_days = (pd.Timestamp.now(tz="UTC") - _utc_index([last_bar])[0]).total_seconds() / 86400
+    start = [p for p, _ in _CATCH_UP_PERIODS].index(minimum)
+    for period, days in _CATCH_UP_PERIODS[start:]:
+        if days >= gap_days:
+            return period
+    return "max"
+
+
+def _utc_index(index) -> pd.DatetimeIndex:
+    """Bar timestamps in UTC; naive ones are exchange-local wall time (``MARKET_TIMEZONE``)."""
+    if not isinstance(index, pd.DatetimeIndex):
+        index = pd.to_datetime(index, utc=True, format="ISO8601")
+    if index.tz is None:
+        index = index.tz_localize(config.MARKET_TIMEZONE)
+    return index.tz_convert("UTC")
+
+
+def _same_close(a: float, b: Optional[float]) -> bool:
+    return b is not None and (a == b or (math.isnan(a) and math.isnan(b)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Watch tickers and alert on indicator signal transitions.")
+    parser.add_argument("tickers", nargs="+")
+    parser.add_argument("--indicators", nargs="+", default=DEFAULT_WATCH_INDICATORS)
+    parser.add_argument("--interval", default="1d", help="Bar interval to monitor (e.g. 1d, 1h, 5m).")
+    parser.add_argument("--every", type=float, default=60.0, help="Seconds between polls.")
+    parser.add_argument("--iterations", type=int, default=None)
+    args = parser.parse_args()
+    WatchlistMonitor(args.tickers, args.indicators, interval=args.interval, sink=JsonlAlertSink(echo=True)).run(
+        every=args.every, iterations=args.iterations
+    )
@@ -0,0 +1,366 @@
+"""Sharded batch runs: a shared work queue leased by worker processes.
+
+A coordinator splits a ticker universe into shards and ``submit``s them, with
+the batch's run arguments, to a SQLite file (``WORK_QUEUE_PATH``) that stands
+in for a broker. Any number of workers (``run_worker``, or ``python main.py --work``) then:
+
+- ``lease`` one shard at a time (an atomic claim with an expiry);
+- ``heartbeat`` it from a background thread while it runs, extending the lease;
+- run the shard's tickers through the normal orchestrators/``BatchRunner``
+  into the shared report directory, and mark the shard ``done`` with its
+  report paths (or ``fail`` it, which re-queues it up to ``WORK_MAX_ATTEMPTS``).
+
+A worker that dies stops heartbeating. Its lease lapses, and the next
+worker asking for work reclaims the shard. A shard's per-shard journal then
+lets the new worker skip units the dead one had already finished. Workers
+share nothing but the queue file and the report directory, so throughput
+grows with the number of workers until the data source or the disk is the
+bottleneck.
+
+The queue runs in WAL mode by default, which needs every process on the same
+host (WAL's shared-memory index does not work over NFS/SMB). For workers on
+several machines, set ``WORK_QUEUE_JOURNAL_MODE=DELETE`` and put the file on a
+filesystem with working POSIX locks; SQLite is not safe on one without them.
+
+    python -m agents.work_queue            # status of every batch
+    python -m agents.work_queue --reset    # drop finished batches
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+import config
+
+_JOURNAL_MODES = ("WAL", "DELETE", "TRUNCATE", "PERSIST")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    batch_id TEXT PRIMARY KEY,
+    args TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS shards (
+    batch_id TEXT NOT NULL,
+    shard INTEGER NOT NULL,
+    tickers TEXT NOT NULL,
+    status TEXT NOT NULL,
+    worker TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    outputs TEXT,
+    error TEXT,
+    updated REAL NOT NULL,
+    PRIMARY KEY (batch_id, shard)
+);
+CREATE INDEX IF NOT EXISTS shards_by_status ON shards (status, lease_until);
+"""
+
+SHARD_STATUSES = ("pending", "leased", "done", "failed")
+
+
+@dataclass
+class Shard:
+    batch_id: str
+    shard: int
+    tickers: List[str]
+    args: Dict[str, Any]  # the batch's run arguments
+    attempt: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.batch_id}_{self.shard:05d}"
+
+
+class WorkQueue:
+    """SQLite-backed queue of ticker shards with leases."""
+
+    def __init__(
+        self,
+        path: str | None = None,
+        lease_seconds: float | None = None,
+        max_attempts: int | None = None,
+        journal_mode: str | None = None,
+    ):
+        """
+        Args:
+            path: Queue database (default ``WORK_QUEUE_PATH``); shared by every coordinator and worker.
+            lease_seconds: How long a lease lasts without a heartbeat (default ``WORK_LEASE_SECONDS``).
+            max_attempts: Leases per shard before it is marked failed (default ``WORK_MAX_ATTEMPTS``).
+            journal_mode: SQLite journal mode (default ``WORK_QUEUE_JOURNAL_MODE``); "WAL" on one
+                host, "DELETE" when the file is shared over a network filesystem.
+
+        Raises:
+            ValueError: For an unsupported journal mode.
+        """
+        self.path = path or config.WORK_QUEUE_PATH
+        self.lease_seconds = lease_seconds or config.WORK_LEASE_SECONDS
+        self.max_attempts = max_attempts or config.WORK_MAX_ATTEMPTS
+        self.journal_mode = (journal_mode or config.WORK_QUEUE_JOURNAL_MODE).upper()
+        if self.journal_mode not in _JOURNAL_MODES:
+            raise ValueError(f"Unsupported work queue journal mode: {self.journal_mode}")
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        # Autocommit mode; claims take the write lock explicitly (BEGIN IMMEDIATE)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute(f"PRAGMA journal_mode={self.journal_mode}")
+        # NORMAL is only crash-safe with WAL
+        self._conn.execute(f"PRAGMA synchronous={'NORMAL' if self.journal_mode == 'WAL' else 'FULL'}")
+        self._conn.executescript(_SCHEMA)
+
+    def submit(self, tickers: List[str], args: Dict[str, Any] | None = None, shard_size: int | None = None) -> str:
+        """Splits ``tickers`` into shards of ``shard_size`` and queues them; returns the batch id."""
+        size = max(1, int(shard_size or config.WORK_SHARD_SIZE))
+        tickers = list(dict.fromkeys(tickers))
+        batch_id = f"{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("INSERT INTO batches (batch_id, args, created) VALUES (?, ?, ?)",
+                                   (batch_id, json.dumps(args or {}, default=str), now))
+                self._conn.executemany(
+                    "INSERT INTO shards (batch_id, shard, tickers, status, updated) VALUES (?, ?, ?, 'pending', ?)",
+                    [(batch_id, i, json.dumps(tickers[start:start + size]), now)
+                     for i, start in enumerate(range(0, len(tickers), size))],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return batch_id
+
+    def lease(self, worker: str, batch_id: str | None = None) -> Shard | None:
+        """Claims the next pending shard, or one whose lease lapsed; None when there is none."""
+        now = time.time()
+        where = "(status = 'pending' OR (status = 'leased' AND lease_until < ?))"
+        params: list = [now]
+        if batch_id:
+            where += " AND s.batch_id = ?"
+            params.append(batch_id)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                while True:
+                    row = self._conn.execute(
+                        "SELECT s.batch_id, s.shard, s.tickers, s.attempts, b.args FROM shards s "
+                        f"JOIN batches b ON b.batch_id = s.batch_id WHERE {where} "
+                        "ORDER BY b.created, s.shard LIMIT 1",
+                        params,
+                    ).fetchone()
+                    if row is None:
+                        self._conn.execute("COMMIT")
+                        return None
+                    batch, shard, tickers, attempts, args = row
+                    if attempts >= self.max_attempts:
+                        # Its last lease lapsed too: stop handing it out
+                        self._conn.execute(
+                            "UPDATE shards SET status = 'failed', error = COALESCE(error, 'lease expired'), updated = ? "
+                            "WHERE batch_id = ? AND shard = ?",
+                            (now, batch, shard),
+                        )
+                        continue
+                    self._conn.execute(
+                        "UPDATE shards SET status = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1, "
+                        "updated = ? WHERE batch_id = ? AND shard = ?",
+                        (worker, now + self.lease_seconds, now, batch, shard),
+                    )
+                    self._conn.execute("COMMIT")
+                    return Shard(batch, shard, json.loads(tickers), json.loads(args), attempts + 1)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def heartbeat(self, shard: Shard, worker: str) -> bool:
+        """Extends ``worker``'s lease on ``shard``; False if the lease was lost to another worker."""
+        return self._update_owned(shard, worker, "lease_until = ?", time.time() + self.lease_seconds)
+
+    def complete(self, shard: Shard, worker: str, outputs: List[str]) -> bool:
+        """Marks ``shard`` done with its report paths; False if the lease was lost meanwhile."""
+        return self._update_owned(shard, worker, "status = 'done', outputs = ?, error = NULL", json.dumps(outputs))
+
+    def fail(self, shard: Shard, worker: str, error: str) -> bool:
+        """Re-queues ``shard`` after an error (marks it failed once its attempts are used up)."""
+        status = "failed" if shard.attempt >= self.max_attempts else "pending"
+        return self._update_owned(shard, worker, f"status = '{status}', error = ?", error)
+
+    def open_shards(self, batch_id: str | None = None) -> int:
+        """Shards still pending or leased (all batches unless ``batch_id`` is given)."""
+        sql = "SELECT COUNT(*) FROM shards WHERE status IN ('pending', 'leased')"
+        params: tuple = ()
+        if batch_id:
+            sql += " AND batch_id = ?"
+            params = (batch_id,)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()[0]
+
+    def status(self, batch_id: str | None = None) -> Dict[str, Dict[str, Any]]:
+        """Per batch: shard counts by status, tickers, active workers and failed shards' errors."""
+        sql = "SELECT batch_id, shard, tickers, status, worker, error FROM shards"
+        params: tuple = ()
+        if batch_id:
+            sql += " WHERE batch_id = ?"
+            params = (batch_id,)
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY batch_id, shard", params).fetchall()
+        out: Dict[str, Dict[str, Any]] = {}
+        for batch, shard, tickers, status, worker, error in rows:
+            entry = out.setdefault(batch, {**{s: 0 for s in SHARD_STATUSES}, "tickers": 0, "workers": [], "errors": {}})
+            entry[status] += 1
+            entry["tickers"] += len(json.loads(tickers))
+            if status == "leased" and worker not in entry["workers"]:
+                entry["workers"].append(worker)
+            if status == "failed":
+                entry["errors"][shard] = error
+        return out
+
+    def outputs(self, batch_id: str) -> List[str]:
+        """Report paths of the batch's finished shards, in shard order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT outputs FROM shards WHERE batch_id = ? AND status = 'done' ORDER BY shard", (batch_id,)
+            ).fetchall()
+        return [path for (paths,) in rows for path in json.loads(paths or "[]")]
+
+    def reset(self, finished_only: bool = True) -> int:
+        """Deletes batches with no open shards (every batch with ``finished_only=False``)."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                sql = "SELECT batch_id FROM batches"
+                if finished_only:
+                    sql += " WHERE batch_id NOT IN (SELECT batch_id FROM shards WHERE status IN ('pending', 'leased'))"
+                doomed = [r[0] for r in self._conn.execute(sql)]
+                self._conn.executemany("DELETE FROM shards WHERE batch_id = ?", [(b,) for b in doomed])
+                self._conn.executemany("DELETE FROM batches WHERE batch_id = ?", [(b,) for b in doomed])
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(doomed)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _update_owned(self, shard: Shard, worker: str, assignment: str, value: Any) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE shards SET {assignment}, updated = ? "
+                "WHERE batch_id = ? AND shard = ? AND worker = ? AND status = 'leased'",
+                (value, time.time(), shard.batch_id, shard.shard, worker),
+            )
+            return cursor.rowcount == 1
+
+
+class _Heartbeat:
+    """Background thread keeping a shard's lease alive while it runs."""
+
+    def __init__(self, queue: WorkQueue, shard: Shard, worker: str):
+        self.queue, self.shard, self.worker = queue, shard, worker
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"heartbeat-{shard.key}", daemon=True)
+
+    def __enter__(self) -> "_Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        interval = max(0.1, self.queue.lease_seconds / 3)
+        while not self._stop.wait(interval):
+            try:
+                if not self.queue.heartbeat(self.shard, self.worker):
+                    self.lost = True
+                    print(f"Lost the lease on shard {self.shard.key}; another worker took it over")
+                    return
+            except sqlite3.Error as exc:
+                print(f"Heartbeat for shard {self.shard.key} failed: {exc}")
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def run_worker(
+    queue: WorkQueue,
+    handler: Callable[[Shard], List[str]],
+    worker: str | None = None,
+    batch_id: str | None = None,
+    poll: float = 1.0,
+) -> int:
+    """Leases and runs shards until the queue has no open shard left; returns shards done.
+
+    Args:
+        queue: The shared work queue.
+        handler: Runs one shard and returns its report paths (raise to re-queue the shard).
+        worker: This worker's id (default ``host:pid``).
+        batch_id: Only work on this batch.
+        poll: Seconds between lease attempts while other workers still hold leases
+            (their shards are reclaimed here if those workers die).
+    """
+    worker = worker or default_worker_id()
+    done = 0
+    while True:
+        shard = queue.lease(worker, batch_id=batch_id)
+        if shard is None:
+            if not queue.open_shards(batch_id):
+                return done
+            time.sleep(poll)
+            continue
+        start = time.monotonic()
+        with _Heartbeat(queue, shard, worker):
+            try:
+                outputs = handler(shard)
+            except Exception as exc:
+                print(f"Shard {shard.key} failed (attempt {shard.attempt}): {exc}")
+                queue.fail(shard, worker, f"{type(exc).__name__}: {exc}")
+                continue
+        if queue.complete(shard, worker, outputs):
+            done += 1
+            print(f"Shard {shard.key}: {len(shard.tickers)} ticker(s) in {time.monotonic() - start:.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Show (or clean up) the batches in the shared work queue.")
+    parser.add_argument("--queue", default=None, help="Queue database (default WORK_QUEUE_PATH).")
+    parser.add_argument("--batch", default=None, help="Only this batch.")
+    parser.add_argument("--reset", action="store_true", help="Delete finished batches.")
+    parser.add_argument("--json", action="store_true", help="Print the status as JSON.")
+    args = parser.parse_args()
+
+    queue = WorkQueue(args.queue)
+    if args.reset:
+        print(f"Deleted {queue.reset()} finished batch(es)")
+        return
+    status = queue.status(args.batch)
+    if args.json:
+        print(json.dumps(status, indent=2))
+        return
+    if not status:
+        print("No batches")
+    for batch, entry in status.items():
+        counts = ", ".join(f"{entry[s]} {s}" for s in SHARD_STATUSES if entry[s])
+        workers = f" (workers: {', '.join(entry['workers'])})" if entry["workers"] else ""
+        print(f"{batch}: {entry['tickers']} tickers; {counts}{workers}")
+        for shard, error in entry["errors"].items():
+            print(f"  shard {shard}: {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Local fake OpenAI-compatible chat-completions server for offline and load runs.
+
+Serves ``POST /v1/chat/completions`` with a canned reply, an adjustable
+latency, and ``429`` responses (with ``Retry-After``) to exercise the
+dispatcher's backoff: a random fraction (``error_rate``) or, for
+deterministic checks, the first ``fail_first`` requests. Clearing ``gate``
+holds every response until it is set again. Planning prompts (those asking
+for JSON) get a valid plan object so the orchestrators' parsing path is
+exercised too.
+
+This is a test double; it lives with the benchmarks, not in the runtime packages.
+
+    python benchmarks/fake_llm_server.py --port 8765 --latency 0.2 --error-rate 0.1
+    OPENAI_API_KEY=fake OPENAI_BASE_URL=http://127.0.0.1:8765/v1 python main.py AAPL
+"""
+
+from __future__ import annotations
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+import argparse
+import json
+import random
+import threading
+import time
+
+
+class FakeLLMServer:
+    """Threaded HTTP server emulating the chat-completions endpoint."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.05, error_rate: float = 0.0,
+                 seed: int = 0, fail_first: int = 0, retry_after: float = 0.05):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.fail_first = fail_first
+        self.retry_after = retry_after
+        self.gate = threading.Event()
+        self.gate.set()
+        self.requests = 0
+        self.errors = 0
+        self.max_concurrent = 0
+        self._active = 0
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeLLMServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-llm", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeLLMServer":
+        return self.start()
+
+    def __exit__(self, *_exc) -> None:
+        self.stop()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *_args):  # keep output quiet
+                pass
+
+            def do_POST(self):
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send(404, {"error": {"message": "not found"}})
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                with server._lock:
+                    server.requests += 1
+                    server._active += 1
+                    server.max_concurrent = max(server.max_concurrent, server._active)
+                    fail = server.requests <= server.fail_first or server._rng.random() < server.error_rate
+                try:
+                    server.gate.wait()
+                    time.sleep(server.latency)
+                    if fail:
+                        with server._lock:
+                            server.errors += 1
+                        self._send(429, {"error": {"message": "rate limited", "type": "rate_limit"}}, {"Retry-After": f"{server.retry_after:g}"})
+                        return
+                    self._send(200, _completion(body))
+                finally:
+                    with server._lock:
+                        server._active -= 1
+
+            def _send(self, status: int, payload: Dict[str, Any], headers: Dict[str, str] | None = None):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+
+def _completion(body: Dict[str, Any]) -> Dict[str, Any]:
+    messages = body.get("messages") or []
+    text = " ".join(str(m.get("content") or "") for m in messages)
+    if "Respond ONLY with JSON" in text:
+        content = json.dumps({
+            "plan_items": [{"name": "RSI", "params": {"period": 14}}, {"name": "MACD", "params": {}}],
+            "plan_indicators": ["RSI", "MACD"],
+            "rationale": "Fake plan from the local test server.",
+            "strategy": "Momentum first, then trend.",
+            "max_workers": 2,
+        })
+    else:
+        content = "## Summary\n\n- Fake summary from the local test server. Outlook: Neutral."
+    prompt_tokens = max(1, len(text) // 4)
+    completion_tokens = max(1, len(content) // 4)
+    return {
+        "id": f"chatcmpl-fake-{int(time.time() * 1000)}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model") or "fake",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                  "total_tokens": prompt_tokens + completion_tokens},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a fake OpenAI-compatible chat-completions server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per response.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 429.")
+    args = parser.parse_args()
+    srv = FakeLLMServer(args.host, args.port, args.latency, args.error_rate)
+    print(f"Fake LLM server on {srv.base_url}")
+    try:
+        srv._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
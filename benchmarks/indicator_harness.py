@@ -0,0 +1,406 @@
+"""Golden-value and speed regression harness for the indicators.
+
+Every indicator is run through each available engine and compared, output
+by output and bar by bar, with the slow loop implementations in
+``benchmarks/reference_indicators.py``:
+
+- ``kernel``: the module-level series kernels the indicators use
+  (e.g. ``indicators.rsi.rsi``), full series;
+- ``matrix``: the column-vectorized kernels of ``indicators/matrix.py``;
+- ``streaming``: the incremental states of ``indicators/streaming.py``, one
+  ``update`` per bar;
+- ``worker``: ``IndicatorWorker.run`` on the full frame (latest values in ``meta``);
+- ``worker_tail``: the same on only the declared ``lookback`` rows, which
+  checks that the lookbacks are long enough.
+
+Datasets are the bundled ``data_hist/*_1y.csv`` files (rows with missing
+prices dropped) plus seeded random OHLCV series, daily and intraday, with
+flat stretches and repeated prices, each run with default and randomized
+params. Errors are measured relative to the largest reference value of the
+output, and two NaNs compare equal; streaming states are compared from the
+bar their signal becomes defined. Outputs that add a rolling standard
+deviation (Bollinger bands) are only held to it beyond its cancellation
+floor: over a flat window the variance is a difference of nearly equal sums,
+so the std is known to about ``sqrt(window * eps)`` of the price scale by any
+engine, however exact the rest of the computation.
+
+Optimized and incremental engines are gated on speed as well as equality:
+``kernel`` must beat the reference, ``matrix`` (per column, on a 50-column
+frame) must stay within ``--max-slowdown`` of ``kernel``, and one
+``streaming`` update must stay within it of a ``worker_tail`` recompute (the
+work it replaces per new bar). Costs are totalled over the datasets, so long
+series weigh more than fixed per-call overheads.
+The exit status is 1 when any gate fails, so the harness can guard changes.
+
+    python benchmarks/indicator_harness.py --random 20 --json reports/indicator_harness.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.indicator_worker import IndicatorWorker  # noqa: E402
+from agents.plan_compiler import default_params_for  # noqa: E402
+from indicators import matrix  # noqa: E402
+from indicators.adx import adx  # noqa: E402
+from indicators.atr import atr  # noqa: E402
+from indicators.bollinger_bands import bollinger_bands  # noqa: E402
+from indicators.donchian_channels import donchian  # noqa: E402
+from indicators.ema import ema  # noqa: E402
+from indicators.macd import macd  # noqa: E402
+from indicators.moving_average import moving_averages  # noqa: E402
+from indicators.obv import obv  # noqa: E402
+from indicators.rsi import rsi  # noqa: E402
+from indicators.stochastic import stochastic  # noqa: E402
+from indicators.streaming import STREAMING_INDICATORS, make_streaming  # noqa: E402
+from indicators.vwap import vwap  # noqa: E402
+from reference_indicators import REFERENCES  # noqa: E402
+
+Outputs = Dict[str, np.ndarray]
+
+MATRIX_COLUMNS = 50  # per-column cost of the matrix engine is measured on this many columns
+
+# Engine -> (baseline engine, how costs compare) for the speed gates
+SPEED_GATES = {
+    "kernel": ("reference", "full series"),
+    "matrix": ("kernel", "full series"),
+    "streaming": ("worker_tail", "per new bar"),
+}
+
+_READY = "_ready"  # optional mask of the bars an engine defines
+
+# Worker meta keys read at an earlier bar than the last (Donchian compares with the prior channel)
+_META_OFFSETS = {"Donchian Channels": {"upper": -2, "lower": -2}}
+
+# Outputs carrying ``stddev`` x a rolling std over ``window`` bars (param names per indicator)
+_STD_OUTPUTS = {"Bollinger Bands": (("upper", "lower"), "window", "stddev")}
+_EPS = float(np.finfo(float).eps)
+
+
+@dataclass
+class Dataset:
+    name: str
+    frame: pd.DataFrame
+    intraday: bool = False
+    params: Dict[str, dict] = field(default_factory=dict)  # per-indicator overrides
+
+
+@dataclass
+class Record:
+    dataset: str
+    indicator: str
+    engine: str
+    error: float  # max |engine - reference| / max |reference|
+    cost: float  # seconds (full series, or per new bar for streaming)
+    ok: bool
+    note: str = ""
+
+
+def _f(frame: pd.DataFrame, col: str) -> pd.Series:
+    return frame[col].astype(float)
+
+
+def _kernel(name: str, frame: pd.DataFrame, p: dict, intraday: bool) -> Outputs:
+    h, l, c = _f(frame, "High"), _f(frame, "Low"), _f(frame, "Close")
+    if name == "RSI":
+        out = {"rsi": rsi(c, int(p.get("period", 14)))}
+    elif name == "MACD":
+        line, sig = macd(c, int(p.get("fast", 12)), int(p.get("slow", 26)), int(p.get("signal", 9)))
+        out = {"macd": line, "signal_line": sig}
+    elif name == "Bollinger Bands":
+        mid, up, lo = bollinger_bands(c, int(p.get("window", 20)), float(p.get("stddev", 2)))
+        out = {"middle": mid, "upper": up, "lower": lo}
+    elif name == "Moving Average":
+        short, long_ = moving_averages(c, int(p.get("short_window", 50)), int(p.get("long_window", 200)))
+        out = {"short_ma": short, "long_ma": long_}
+    elif name == "EMA":
+        out = {"ema12": ema(c, 12), "ema26": ema(c, 26)}
+    elif name == "ATR":
+        out = {"atr": atr(h, l, c, int(p.get("period", 14)))}
+    elif name == "Stochastic":
+        k, d = stochastic(h, l, c, int(p.get("k_period", 14)), int(p.get("d_period", 3)), int(p.get("smooth", 1)))
+        out = {"k": k, "d": d}
+    elif name == "OBV":
+        out = {"obv": obv(c, _f(frame, "Volume"))}
+    elif name == "VWAP":
+        out = {"vwap": vwap(h, l, c, _f(frame, "Volume"), int(p.get("window", 20)), str(p.get("anchor", "auto")))}
+    elif name == "ADX":
+        line, plus, minus = adx(h, l, c, int(p.get("period", 14)))
+        out = {"adx": line, "plus_di": plus, "minus_di": minus}
+    elif name == "Donchian Channels":
+        up, lo = donchian(h, l, int(p.get("window", 20)))
+        out = {"upper": up, "lower": lo}
+    else:
+        raise KeyError(name)
+    return {k: v.to_numpy(dtype=float) for k, v in out.items()}
+
+
+def _matrix(name: str, frame: pd.DataFrame, p: dict, intraday: bool, columns: int = 1) -> Outputs | None:
+    # The same series in ``columns`` columns: the universe-wide workload the kernels are built for
+    close = pd.concat([frame["Close"].astype(float)] * columns, axis=1, keys=range(columns))
+    if name == "RSI":
+        out = {"rsi": matrix.rsi_matrix(close, int(p.get("period", 14)))}
+    elif name == "MACD":
+        line, sig = matrix.macd_matrix(close, int(p.get("fast", 12)), int(p.get("slow", 26)), int(p.get("signal", 9)))
+        out = {"macd": line, "signal_line": sig}
+    elif name == "Bollinger Bands":
+        up, lo = matrix.bollinger_matrix(close, int(p.get("window", 20)), float(p.get("stddev", 2)))
+        out = {"upper": up, "lower": lo}
+    elif name == "Moving Average":
+        short, long_ = matrix.moving_average_matrix(close, int(p.get("short_window", 50)), int(p.get("long_window", 200)))
+        out = {"short_ma": short, "long_ma": long_}
+    else:
+        return None
+    return {k: v.iloc[:, 0].to_numpy(dtype=float) for k, v in out.items()}  # columns are identical
+
+
+def _streaming(name: str, frame: pd.DataFrame, p: dict, intraday: bool) -> Outputs | None:
+    if name.lower() not in STREAMING_INDICATORS:
+        return None
+    state = make_streaming(name, p)
+    rows: List[Dict[str, float]] = []
+    for close in frame["Close"].to_numpy(dtype=float):
+        state.update(float(close))
+        rows.append(dict(state.values) if state.signal is not None else {})
+    keys = {k for row in rows for k in row}
+    out = {k: np.array([row.get(k, np.nan) for row in rows]) for k in keys}
+    # Bars before the state is defined (signal None) are not compared
+    out[_READY] = np.array([bool(row) for row in rows])
+    return out
+
+
+def _worker(name: str, frame: pd.DataFrame, p: dict, intraday: bool, tail: bool = False) -> Outputs | None:
+    worker = IndicatorWorker(name)
+    if tail:
+        lookback = worker.resolve_class().lookback(p)
+        frame = frame if lookback is None else frame.tail(lookback)
+    result = worker.run(frame, p)
+    if result.signal == "Error":
+        raise RuntimeError(result.details)
+    return {k: np.array([v]) for k, v in (result.meta or {}).items() if isinstance(v, (int, float))}
+
+
+ENGINES: Dict[str, Callable[..., Optional[Outputs]]] = {
+    "kernel": _kernel,
+    "matrix": lambda *a: _matrix(*a, columns=MATRIX_COLUMNS),
+    "streaming": _streaming,
+    "worker": _worker,
+    "worker_tail": lambda *a: _worker(*a, tail=True),
+}
+
+
+def _reference(name: str, frame: pd.DataFrame, p: dict, intraday: bool) -> Outputs:
+    bars = {col: frame[col].astype(float).tolist() for col in ("Open", "High", "Low", "Close", "Volume")}
+    if name == "VWAP":
+        p = dict(p)
+        if p.get("anchor", "auto") == "auto":
+            p["anchor"] = "session" if intraday else "rolling"
+        bars["session"] = [str(ts)[:10] for ts in frame.index]
+    return REFERENCES[name](bars, **p)
+
+
+def _std_floor(name: str, key: str, params: dict) -> float:
+    # Relative error every engine may show on a std-derived output over a flat window
+    keys, window_param, k_param = _STD_OUTPUTS.get(name, ((), "", ""))
+    if key not in keys:
+        return 0.0
+    window, k = float(params.get(window_param, 20)), abs(float(params.get(k_param, 2)))
+    return 4.0 * k * np.sqrt(window * _EPS)
+
+
+def _compare(name: str, ref: Outputs, got: Outputs, last_only: bool, params: dict | None = None) -> tuple[float, str]:
+    offsets = _META_OFFSETS.get(name, {}) if last_only else {}
+    keys = [k for k in got if k in ref]
+    if not keys:
+        return float("nan"), "no comparable outputs"
+    ready = got.get(_READY)
+    worst = 0.0
+    for key in keys:
+        expected = ref[key][[offsets.get(key, -1)]] if last_only else ref[key]
+        actual = got[key]
+        if ready is not None and expected.shape == actual.shape:
+            expected, actual = expected[ready], actual[ready]
+        if expected.shape != actual.shape:
+            return float("inf"), f"{key}: shape {actual.shape} vs {expected.shape}"
+        both_nan = np.isnan(expected) & np.isnan(actual)
+        if np.any(np.isnan(expected) != np.isnan(actual)):
+            return float("inf"), f"{key}: NaN pattern differs"
+        finite = np.isfinite(ref[key])
+        scale = max(1.0, float(np.max(np.abs(ref[key][finite]))) if finite.any() else 1.0)
+        same_inf = np.isinf(expected) & (expected == actual)
+        diff = np.abs(np.where(both_nan | same_inf, 0.0, actual - expected)) / scale
+        diff = np.maximum(diff - _std_floor(name, key, params or {}), 0.0)
+        worst = max(worst, float(np.max(diff)) if diff.size else 0.0)
+    return worst, ""
+
+
+def _timed(fn: Callable[[], object], repeat: int) -> tuple[object, float]:
+    result, samples = None, []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return result, statistics.median(samples)
+
+
+def _random_frame(rng: np.random.Generator, rows: int, intraday: bool) -> pd.DataFrame:
+    steps = rng.normal(0, 0.015, rows)
+    steps[rng.random(rows) < 0.05] = 0.0  # flat stretches and repeated closes
+    close = np.round(100 * np.exp(np.cumsum(steps)), 2)
+    spread = np.round(np.abs(rng.normal(0, 0.01, (2, rows))) * close, 2)
+    high, low = close + spread[0], close - spread[1]
+    open_ = np.clip(np.round(close * (1 + rng.normal(0, 0.005, rows)), 2), low, high)
+    volume = rng.integers(1_000, 5_000_000, rows).astype(float)
+    if intraday:
+        per_day = 78  # 5-minute bars, 09:30-16:00
+        days = pd.bdate_range("2024-01-02", periods=rows // per_day + 1)
+        index = pd.DatetimeIndex(
+            [d + pd.Timedelta(hours=9, minutes=30) + pd.Timedelta(minutes=5 * i) for d in days for i in range(per_day)][:rows]
+        )
+    else:
+        index = pd.bdate_range("2000-01-03", periods=rows)
+    return pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume}, index=index)
+
+
+def _random_params(name: str, rng: np.random.Generator) -> dict:
+    r = lambda lo, hi: int(rng.integers(lo, hi + 1))  # noqa: E731
+    if name == "RSI":
+        return {"period": r(2, 30)}
+    if name == "MACD":
+        fast = r(3, 15)
+        return {"fast": fast, "slow": fast + r(2, 20), "signal": r(2, 12)}
+    if name == "Bollinger Bands":
+        return {"window": r(2, 40), "stddev": float(rng.choice([1.5, 2.0, 2.5]))}
+    if name == "Moving Average":
+        short = r(2, 30)
+        return {"short_window": short, "long_window": short + r(1, 60)}
+    if name in ("ATR", "ADX"):
+        return {"period": r(2, 30)}
+    if name == "Stochastic":
+        return {"k_period": r(3, 21), "d_period": r(2, 5), "smooth": r(1, 4)}
+    if name in ("OBV", "VWAP", "Donchian Channels"):
+        return {"window": r(2, 40)}
+    return {}
+
+
+def _datasets(args) -> List[Dataset]:
+    out = []
+    for path in sorted(glob.glob(os.path.join(args.data_dir, "*_1y.csv"))):
+        frame = pd.read_csv(path, index_col=0).dropna(subset=["Open", "High", "Low", "Close", "Volume"])
+        out.append(Dataset(os.path.basename(path).split("_")[0], frame))
+    rng = np.random.default_rng(args.seed)
+    for i in range(args.random):
+        intraday = bool(i % 2)
+        frame = _random_frame(rng, int(rng.integers(60, args.max_rows + 1)), intraday)
+        out.append(Dataset(f"random{i}{'-5m' if intraday else ''}", frame, intraday))
+        params = {name: _random_params(name, rng) for name in REFERENCES}
+        out.append(Dataset(f"random{i}{'-5m' if intraday else ''}+params", frame, intraday, params))
+    return out
+
+
+def run(args) -> List[Record]:
+    records: List[Record] = []
+    indicators = args.indicators or list(REFERENCES)
+    for ds in _datasets(args):
+        for name in indicators:
+            params = ds.params.get(name) or default_params_for(name)
+            ref, ref_cost = _timed(lambda: _reference(name, ds.frame, params, ds.intraday), 1)
+            records.append(Record(ds.name, name, "reference", 0.0, ref_cost, True))
+            for engine, fn in ENGINES.items():
+                try:
+                    got, cost = _timed(lambda: fn(name, ds.frame, params, ds.intraday), args.repeat)
+                except Exception as exc:
+                    records.append(Record(ds.name, name, engine, float("inf"), float("nan"), False, f"{type(exc).__name__}: {exc}"))
+                    continue
+                if got is None:
+                    continue  # engine has no implementation for this indicator
+                if engine == "streaming":
+                    cost /= max(1, len(ds.frame))
+                elif engine == "matrix":
+                    cost /= MATRIX_COLUMNS
+                error, note = _compare(name, ref, got, last_only=engine.startswith("worker"), params=params)
+                tol = args.tail_rtol if engine == "worker_tail" else args.rtol
+                ok = note == "no comparable outputs" or error <= tol
+                records.append(Record(ds.name, name, engine, error, cost, ok, note))
+    return records
+
+
+def summarize(records: List[Record], max_slowdown: float, speed_gate: bool) -> bool:
+    by_key: Dict[tuple, List[Record]] = {}
+    for rec in records:
+        by_key.setdefault((rec.indicator, rec.engine), []).append(rec)
+
+    print(f"{'indicator':<18} {'engine':<12} {'runs':>4} {'max rel err':>12} {'median cost':>12} {'vs baseline':>12}  status")
+    all_ok = True
+    for (indicator, engine), recs in by_key.items():
+        errors = [r.error for r in recs if not np.isnan(r.error)]
+        costs = [r.cost for r in recs if not np.isnan(r.cost)]
+        cost = statistics.median(costs) if costs else float("nan")
+        status = "ok" if all(r.ok for r in recs) else "FAIL (equality)"
+        ratio_text = ""
+        if engine in SPEED_GATES:
+            # Total cost over the shared datasets, so long series (not fixed overheads) dominate
+            base = {r.dataset: r.cost for r in by_key.get((indicator, SPEED_GATES[engine][0]), []) if not np.isnan(r.cost)}
+            shared = [r for r in recs if r.dataset in base and not np.isnan(r.cost)]
+            if shared:
+                ratio = sum(r.cost for r in shared) / sum(base[r.dataset] for r in shared)
+                ratio_text = f"{ratio:.3f}x"
+                limit = 1.0 if SPEED_GATES[engine][0] == "reference" else max_slowdown
+                if speed_gate and status == "ok" and ratio > limit:
+                    status = f"FAIL (speed > {limit:g}x {SPEED_GATES[engine][0]}, {SPEED_GATES[engine][1]})"
+        notes = sorted({r.note for r in recs if r.note and not r.ok})
+        all_ok &= status == "ok"
+        err_text = f"{max(errors):.2e}" if errors else "n/a"
+        print(f"{indicator:<18} {engine:<12} {len(recs):>4} {err_text:>12} {_fmt_cost(cost):>12} {ratio_text:>12}  {status}"
+              + (f" [{notes[0]}]" if notes else ""))
+    return all_ok
+
+
+def _fmt_cost(seconds: float) -> str:
+    if np.isnan(seconds):
+        return "n/a"
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f}us"
+    return f"{seconds * 1e3:.2f}ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", default="data_hist", help="Directory with the bundled <TICKER>_1y.csv files.")
+    parser.add_argument("--indicators", nargs="+", default=None, help="Subset of indicators (default: all).")
+    parser.add_argument("--random", type=int, default=10, help="Random OHLCV series (each also run with random params).")
+    parser.add_argument("--max-rows", type=int, default=5000, help="Longest random series.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per engine (median is kept).")
+    parser.add_argument("--rtol", type=float, default=1e-8, help="Tolerance for full-history engines.")
+    parser.add_argument("--tail-rtol", type=float, default=1e-5, help="Tolerance for lookback-tail runs (EMA warm-up).")
+    parser.add_argument("--max-slowdown", type=float, default=1.5, help="Speed gate for optimized/incremental engines.")
+    parser.add_argument("--no-speed-gate", action="store_true", help="Report timings without failing on them.")
+    parser.add_argument("--json", default=None, help="Also write every record (errors and timings) to this file.")
+    args = parser.parse_args()
+
+    records = run(args)
+    ok = summarize(records, args.max_slowdown, not args.no_speed_gate)
+    if args.json:
+        os.makedirs(os.path.dirname(args.json) or ".", exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump([asdict(r) for r in records], f, indent=1, default=str)
+    print("\nall gates passed" if ok else "\nsome gates FAILED")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
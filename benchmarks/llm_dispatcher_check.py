@@ -0,0 +1,142 @@
+"""Deterministic pass/fail check of the LLM dispatcher against the local fake server.
+
+Each scenario drives a fresh ``LLMDispatcher`` through ``fake_llm_server``
+with scripted failures instead of random ones, and holds responses behind
+the server's ``gate`` where ordering matters:
+
+- ``retry``: the first 429s (with ``Retry-After``) are retried until success,
+  honoring the header; past ``max_retries`` the error reaches the caller;
+- ``coalescing``: identical requests submitted while one is in flight share
+  one API call, and a later identical request makes a new one;
+- ``priority``: with one dispatcher thread busy, a queued plan is served
+  before summaries queued ahead of it;
+- ``rate-limit``: a burst beyond the request bucket's capacity is spread out
+  at ``requests_per_minute``, and a token-heavy burst at ``tokens_per_minute``.
+
+The exit status is 1 when any check fails.
+
+    python benchmarks/llm_dispatcher_check.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openai import OpenAI  # noqa: E402
+
+from fake_llm_server import FakeLLMServer  # noqa: E402
+from core.llm import PRIORITY_PLAN, PRIORITY_SUMMARY, LLMDispatcher  # noqa: E402
+
+_failures: list[str] = []
+
+
+def _check(name: str, ok: bool, detail: str) -> None:
+    print(f"{'PASS' if ok else 'FAIL'}  {name}: {detail}")
+    if not ok:
+        _failures.append(name)
+
+
+def _dispatcher(srv: FakeLLMServer, **kwargs) -> LLMDispatcher:
+    client = OpenAI(api_key="fake", base_url=srv.base_url, max_retries=0)
+    options = {"max_concurrency": 4, "requests_per_minute": 60_000, "tokens_per_minute": 10_000_000, "backoff_base": 0.01}
+    return LLMDispatcher(client, **{**options, **kwargs})
+
+
+def _messages(text: str) -> list[dict]:
+    return [{"role": "user", "content": text}]
+
+
+def check_retry() -> None:
+    with FakeLLMServer(latency=0.0, fail_first=2, retry_after=0.2) as srv:
+        dispatcher = _dispatcher(srv, max_retries=5)
+        start = time.perf_counter()
+        text = dispatcher.complete(_messages("retry"), model="fake")
+        elapsed = time.perf_counter() - start
+        stats = dispatcher.stats()
+        _check("retry", bool(text) and srv.requests == 3 and stats["retries"] == 2,
+               f"{srv.requests} calls, {srv.errors} answered 429, {stats['retries']} retries")
+        _check("retry-after", elapsed >= 0.4, f"waited {elapsed:.2f}s for two Retry-After: 0.2 replies")
+
+    with FakeLLMServer(latency=0.0, fail_first=10, retry_after=0.01) as srv:
+        dispatcher = _dispatcher(srv, max_retries=1)
+        try:
+            dispatcher.complete(_messages("give up"), model="fake")
+            raised = None
+        except Exception as exc:
+            raised = type(exc).__name__
+        stats = dispatcher.stats()
+        _check("retry-exhausted", raised is not None and srv.requests == 2 and stats["failed"] == 1,
+               f"raised {raised} after {srv.requests} calls; failed={stats['failed']}")
+
+
+def check_coalescing() -> None:
+    with FakeLLMServer(latency=0.0) as srv:
+        dispatcher = _dispatcher(srv)
+        srv.gate.clear()
+        futures = [dispatcher.submit(_messages("same prompt"), model="fake") for _ in range(5)]
+        srv.gate.set()
+        results = {f.result(timeout=10) for f in futures}
+        stats = dispatcher.stats()
+        _check("coalescing", srv.requests == 1 and stats["coalesced"] == 4 and len(results) == 1,
+               f"5 identical submits -> {srv.requests} call(s), coalesced={stats['coalesced']}")
+        dispatcher.complete(_messages("same prompt"), model="fake")
+        _check("coalescing-done", srv.requests == 2, "an identical request after completion makes a new call")
+
+
+def check_priority() -> None:
+    with FakeLLMServer(latency=0.0) as srv:
+        dispatcher = _dispatcher(srv, max_concurrency=1)
+        order: list[str] = []
+        srv.gate.clear()
+        blocker = dispatcher.submit(_messages("blocker"), model="fake")
+        while srv.requests < 1:  # the only dispatcher thread is now waiting on the server
+            time.sleep(0.01)
+        futures = []
+        for name, priority in (("summary-1", PRIORITY_SUMMARY), ("summary-2", PRIORITY_SUMMARY), ("plan", PRIORITY_PLAN)):
+            future = dispatcher.submit(_messages(name), model="fake", priority=priority)
+            future.add_done_callback(lambda _f, n=name: order.append(n))
+            futures.append(future)
+        srv.gate.set()
+        for future in [blocker] + futures:
+            future.result(timeout=10)
+        _check("priority", order == ["plan", "summary-1", "summary-2"], f"completion order {order}")
+
+
+def check_rate_limit() -> None:
+    with FakeLLMServer(latency=0.0) as srv:
+        # 60 rpm: 1 request/s with a burst capacity of 5
+        dispatcher = _dispatcher(srv, requests_per_minute=60)
+        start = time.perf_counter()
+        futures = [dispatcher.submit(_messages(f"rpm {i}"), model="fake") for i in range(7)]
+        for future in futures:
+            future.result(timeout=30)
+        elapsed = time.perf_counter() - start
+        _check("rate-limit-requests", 1.8 <= elapsed < 6, f"7 requests at 60 rpm (burst 5) took {elapsed:.2f}s, expected ~2s")
+
+    with FakeLLMServer(latency=0.0) as srv:
+        # 6000 tpm: 100 tokens/s with a capacity of 500; each request estimates 100 tokens
+        dispatcher = _dispatcher(srv, tokens_per_minute=6000)
+        start = time.perf_counter()
+        futures = [dispatcher.submit(_messages(f"tpm {i:02d}"), model="fake", max_tokens=98) for i in range(7)]
+        for future in futures:
+            future.result(timeout=30)
+        elapsed = time.perf_counter() - start
+        _check("rate-limit-tokens", 1.8 <= elapsed < 6, f"7 x 100 tokens at 6000 tpm (burst 500) took {elapsed:.2f}s, expected ~2s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args()
+    for scenario in (check_retry, check_coalescing, check_priority, check_rate_limit):
+        scenario()
+    print(f"{len(_failures)} check(s) failed" if _failures else "all checks passed")
+    sys.exit(1 if _failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Peak memory of lazy/chunked indicator runs vs. history length and universe size.
+
+Builds a temporary price store from the synthetic source for each
+(tickers, years) configuration, then measures the traced peak allocation
+(``tracemalloc``, which also sees numpy/pandas buffers) of:
+
+- ``scan_universe``: latest indicator values via lookback-only reads;
+- ``full``: the same indicators on fully materialized histories, for contrast
+  (holds every frame at once, like loading a universe into RAM).
+
+The ``scan_universe`` peak should stay flat as years and tickers grow.
+
+    python benchmarks/memory_chunked.py --tickers 100 500 --years 2 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.indicator_worker import IndicatorWorker  # noqa: E402
+from agents.universe_scan import scan_universe  # noqa: E402
+from data.price_store import PriceStore  # noqa: E402
+from data.sources import SyntheticSource  # noqa: E402
+
+INDICATORS = ["RSI", "MACD", "Bollinger Bands", "Moving Average", "EMA"]
+
+
+def _measure(fn) -> tuple[float, float]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2**20, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickers", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--years", type=float, nargs="+", default=[2, 20])
+    parser.add_argument("--skip-full", action="store_true", help="Skip the fully materialized comparison.")
+    args = parser.parse_args()
+
+    print(f"{'tickers':>8} {'years':>6} {'rows/ticker':>12} {'scan peak MiB':>14} {'scan s':>7} {'full peak MiB':>14}")
+    for n in args.tickers:
+        for years in args.years:
+            root = tempfile.mkdtemp(prefix="price_store_bench_")
+            try:
+                store = PriceStore(root)
+                universe = SyntheticSource.universe(n)
+                store.ingest(universe, source=SyntheticSource(years=years))
+
+                def _scan():
+                    for _ticker, _results in scan_universe(universe, INDICATORS, store=store):
+                        pass
+
+                def _full():
+                    frames = {t: store.read(t) for t in universe}
+                    for frame in frames.values():
+                        for name in INDICATORS:
+                            IndicatorWorker(name).run(frame, {})
+
+                scan_peak, scan_s = _measure(_scan)
+                full_peak = float("nan") if args.skip_full else _measure(_full)[0]
+                print(f"{n:>8} {years:>6g} {store.rows(universe[0]):>12} {scan_peak:>14.1f} {scan_s:>7.2f} {full_peak:>14.1f}")
+            finally:
+                shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Per-indicator timing of the OHLCV indicators on the bundled price data.
+
+Two tables:
+
+- ``bundled``: median ``IndicatorWorker.run`` time per indicator on each
+  ``data_hist/<TICKER>_1y.csv`` shipped with the repo (what a report pays);
+- ``scaling``: the raw kernels on synthetic series of growing length, in
+  microseconds and nanoseconds per bar. The kernels are single-pass and
+  vectorized, so ns/bar should stay flat as the series grows.
+
+    python benchmarks/ohlcv_indicators.py --rows 10000 100000 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.indicator_worker import IndicatorWorker  # noqa: E402
+from agents.plan_compiler import default_params_for  # noqa: E402
+from data.sources import SyntheticSource  # noqa: E402
+from indicators.adx import adx  # noqa: E402
+from indicators.atr import atr  # noqa: E402
+from indicators.donchian_channels import donchian  # noqa: E402
+from indicators.obv import obv  # noqa: E402
+from indicators.stochastic import stochastic  # noqa: E402
+from indicators.vwap import vwap  # noqa: E402
+
+INDICATORS = ["ATR", "Stochastic", "OBV", "VWAP", "ADX", "Donchian Channels"]
+
+KERNELS = {
+    "ATR": lambda f: atr(f["High"], f["Low"], f["Close"]),
+    "Stochastic": lambda f: stochastic(f["High"], f["Low"], f["Close"], smooth=3),
+    "OBV": lambda f: obv(f["Close"], f["Volume"]),
+    "VWAP": lambda f: vwap(f["High"], f["Low"], f["Close"], f["Volume"], anchor="rolling"),
+    "ADX": lambda f: adx(f["High"], f["Low"], f["Close"]),
+    "Donchian Channels": lambda f: donchian(f["High"], f["Low"]),
+}
+
+
+def _median_seconds(fn, repeat: int) -> float:
+    fn()  # warm-up (imports, caches)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def _synthetic(rows: int) -> pd.DataFrame:
+    frame = SyntheticSource(years=rows / 252 + 1).history("BENCH", "max")
+    while len(frame) < rows:
+        frame = pd.concat([frame, frame])
+    frame = frame.iloc[-rows:].astype(float)
+    frame.index = pd.RangeIndex(rows)  # rolling VWAP only; avoids duplicate dates
+    return frame
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", default="data_hist", help="Directory with the bundled <TICKER>_1y.csv files.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    files = sorted(glob.glob(os.path.join(args.data_dir, "*_1y.csv")))
+    if files:
+        print(f"bundled: median IndicatorWorker.run time (ms) over {args.repeat} runs")
+        tickers = [os.path.basename(path).split("_")[0] for path in files]
+        print(f"{'indicator':<18}" + "".join(f"{t:>9}" for t in tickers))
+        frames = [pd.read_csv(path, index_col=0) for path in files]
+        for name in INDICATORS:
+            worker, params = IndicatorWorker(name), default_params_for(name)
+            cells = [_median_seconds(lambda f=f: worker.run(f, params), args.repeat) * 1e3 for f in frames]
+            print(f"{name:<18}" + "".join(f"{c:>9.2f}" for c in cells))
+        print()
+    else:
+        print(f"No bundled CSVs under {args.data_dir}; skipping the bundled table\n")
+
+    print("scaling: kernel time per series (ms) and per bar (ns)")
+    print(f"{'indicator':<18}" + "".join(f"{n:>12} {'ns/bar':>7}" for n in args.rows))
+    frames = {n: _synthetic(n) for n in args.rows}
+    for name, kernel in KERNELS.items():
+        cells = []
+        for n, frame in frames.items():
+            seconds = _median_seconds(lambda: kernel(frame), max(3, args.repeat // 4))
+            cells.append(f"{seconds * 1e3:>12.2f} {seconds * 1e9 / n:>7.1f}")
+        print(f"{name:<18}" + "".join(cells))
+
+
+if __name__ == "__main__":
+    main()
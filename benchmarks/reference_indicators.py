@@ -0,0 +1,230 @@
+"""Slow, obviously-correct reference implementations of every indicator.
+
+Plain Python loops over lists, written straight from the textbook
+definitions with the conventions the production kernels use:
+
+- EMAs are seeded with the first value (``ewm(span, adjust=False)``);
+- Wilder smoothing is an EMA with alpha = 1/period, seeded the same way;
+- rolling windows are undefined (NaN) until they hold ``window`` values;
+- standard deviations are sample deviations (ddof=1);
+- RSI averages gains and losses with simple rolling means (not Wilder).
+
+Each function returns ``{output name: np.ndarray}`` with one value per bar,
+keyed like the production indicator's ``meta``. Inputs must not contain NaN.
+Used by ``benchmarks/indicator_harness.py`` as the golden values.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+
+NAN = float("nan")
+
+
+def _ema(values: Sequence[float], alpha: float) -> List[float]:
+    out: List[float] = []
+    prev = NAN
+    for x in values:
+        if math.isnan(x):
+            out.append(prev)
+            continue
+        prev = x if math.isnan(prev) else prev + alpha * (x - prev)
+        out.append(prev)
+    return out
+
+
+def _span_ema(values: Sequence[float], span: int) -> List[float]:
+    return _ema(values, 2.0 / (span + 1.0))
+
+
+def _wilder(values: Sequence[float], period: int) -> List[float]:
+    return _ema(values, 1.0 / period)
+
+
+def _window(values: Sequence[float], i: int, window: int) -> List[float] | None:
+    if i + 1 < window:
+        return None
+    chunk = list(values[i + 1 - window:i + 1])
+    return None if any(math.isnan(v) for v in chunk) else chunk
+
+
+def _sma(values: Sequence[float], window: int) -> List[float]:
+    out = []
+    for i in range(len(values)):
+        chunk = _window(values, i, window)
+        out.append(NAN if chunk is None else sum(chunk) / window)
+    return out
+
+
+def _sample_std(values: Sequence[float], window: int) -> List[float]:
+    out = []
+    for i in range(len(values)):
+        chunk = _window(values, i, window)
+        if chunk is None or window < 2:
+            out.append(NAN)
+            continue
+        mean = sum(chunk) / window
+        out.append(math.sqrt(sum((v - mean) ** 2 for v in chunk) / (window - 1)))
+    return out
+
+
+def _div(a: float, b: float) -> float:
+    if math.isnan(a) or math.isnan(b):
+        return NAN
+    if b == 0:
+        return NAN if a == 0 else math.copysign(math.inf, a)
+    return a / b
+
+
+def _arrays(**series: Sequence[float]) -> Dict[str, np.ndarray]:
+    return {name: np.asarray(values, dtype=float) for name, values in series.items()}
+
+
+def rsi(bars: Dict[str, List[float]], period: int = 14, **_) -> Dict[str, np.ndarray]:
+    close = bars["Close"]
+    gains = [NAN] + [max(close[i] - close[i - 1], 0.0) for i in range(1, len(close))]
+    losses = [NAN] + [max(close[i - 1] - close[i], 0.0) for i in range(1, len(close))]
+    out = []
+    for up, down in zip(_sma(gains, period), _sma(losses, period)):
+        rs = _div(up, down)
+        out.append(NAN if math.isnan(rs) else 100.0 - 100.0 / (1.0 + rs))
+    return _arrays(rsi=out)
+
+
+def macd(bars: Dict[str, List[float]], fast: int = 12, slow: int = 26, signal: int = 9, **_) -> Dict[str, np.ndarray]:
+    close = bars["Close"]
+    line = [f - s for f, s in zip(_span_ema(close, fast), _span_ema(close, slow))]
+    return _arrays(macd=line, signal_line=_span_ema(line, signal))
+
+
+def bollinger_bands(bars: Dict[str, List[float]], window: int = 20, stddev: float = 2, **_) -> Dict[str, np.ndarray]:
+    close = bars["Close"]
+    middle, sd = _sma(close, window), _sample_std(close, window)
+    return _arrays(
+        middle=middle,
+        upper=[m + stddev * s for m, s in zip(middle, sd)],
+        lower=[m - stddev * s for m, s in zip(middle, sd)],
+    )
+
+
+def moving_average(bars: Dict[str, List[float]], short_window: int = 50, long_window: int = 200, **_) -> Dict[str, np.ndarray]:
+    close = bars["Close"]
+    return _arrays(short_ma=_sma(close, short_window), long_ma=_sma(close, long_window))
+
+
+def ema(bars: Dict[str, List[float]], **_) -> Dict[str, np.ndarray]:
+    close = bars["Close"]
+    return _arrays(ema12=_span_ema(close, 12), ema26=_span_ema(close, 26))
+
+
+def _true_range(bars: Dict[str, List[float]]) -> List[float]:
+    high, low, close = bars["High"], bars["Low"], bars["Close"]
+    out = []
+    for i in range(len(close)):
+        tr = high[i] - low[i]
+        if i:
+            tr = max(tr, abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        out.append(tr)
+    return out
+
+
+def atr(bars: Dict[str, List[float]], period: int = 14, **_) -> Dict[str, np.ndarray]:
+    return _arrays(atr=_wilder(_true_range(bars), period))
+
+
+def stochastic(bars: Dict[str, List[float]], k_period: int = 14, d_period: int = 3, smooth: int = 1, **_) -> Dict[str, np.ndarray]:
+    high, low, close = bars["High"], bars["Low"], bars["Close"]
+    k = []
+    for i in range(len(close)):
+        if i + 1 < k_period:
+            k.append(NAN)
+            continue
+        hi = max(high[i + 1 - k_period:i + 1])
+        lo = min(low[i + 1 - k_period:i + 1])
+        k.append(100.0 * _div(close[i] - lo, hi - lo))
+    if smooth > 1:
+        k = _sma(k, smooth)
+    return _arrays(k=k, d=_sma(k, d_period))
+
+
+def obv(bars: Dict[str, List[float]], **_) -> Dict[str, np.ndarray]:
+    close, volume = bars["Close"], bars["Volume"]
+    total, out = 0.0, []
+    for i in range(len(close)):
+        if i and close[i] > close[i - 1]:
+            total += volume[i]
+        elif i and close[i] < close[i - 1]:
+            total -= volume[i]
+        out.append(total)
+    return _arrays(obv=out)
+
+
+def vwap(bars: Dict[str, List[float]], window: int = 20, anchor: str = "rolling", **_) -> Dict[str, np.ndarray]:
+    high, low, close, volume = bars["High"], bars["Low"], bars["Close"], bars["Volume"]
+    typical = [(h + l + c) / 3.0 for h, l, c in zip(high, low, close)]
+    out = []
+    if anchor == "session":
+        sessions = bars["session"]
+        pv = vol = 0.0
+        for i in range(len(close)):
+            if i and sessions[i] != sessions[i - 1]:
+                pv = vol = 0.0
+            pv += typical[i] * volume[i]
+            vol += volume[i]
+            out.append(_div(pv, vol))
+        return _arrays(vwap=out)
+    for i in range(len(close)):
+        if i + 1 < window:
+            out.append(NAN)
+            continue
+        pv = sum(typical[j] * volume[j] for j in range(i + 1 - window, i + 1))
+        out.append(_div(pv, sum(volume[i + 1 - window:i + 1])))
+    return _arrays(vwap=out)
+
+
+def adx(bars: Dict[str, List[float]], period: int = 14, **_) -> Dict[str, np.ndarray]:
+    high, low = bars["High"], bars["Low"]
+    plus_dm, minus_dm = [0.0], [0.0]
+    for i in range(1, len(high)):
+        up, down = high[i] - high[i - 1], low[i - 1] - low[i]
+        plus_dm.append(up if up > down and up > 0 else 0.0)
+        minus_dm.append(down if down > up and down > 0 else 0.0)
+    tr = _wilder(_true_range(bars), period)
+    plus_di = [100.0 * _div(p, t) for p, t in zip(_wilder(plus_dm, period), tr)]
+    minus_di = [100.0 * _div(m, t) for m, t in zip(_wilder(minus_dm, period), tr)]
+    dx = []
+    for p, m in zip(plus_di, minus_di):
+        total = p + m
+        dx.append(0.0 if math.isnan(total) or total == 0 else 100.0 * abs(p - m) / total)
+    return _arrays(adx=_wilder(dx, period), plus_di=plus_di, minus_di=minus_di)
+
+
+def donchian_channels(bars: Dict[str, List[float]], window: int = 20, **_) -> Dict[str, np.ndarray]:
+    high, low = bars["High"], bars["Low"]
+    upper, lower = [], []
+    for i in range(len(high)):
+        if i + 1 < window:
+            upper.append(NAN)
+            lower.append(NAN)
+            continue
+        upper.append(max(high[i + 1 - window:i + 1]))
+        lower.append(min(low[i + 1 - window:i + 1]))
+    return _arrays(upper=upper, lower=lower)
+
+
+REFERENCES: Dict[str, Callable[..., Dict[str, np.ndarray]]] = {
+    "RSI": rsi,
+    "MACD": macd,
+    "Bollinger Bands": bollinger_bands,
+    "Moving Average": moving_average,
+    "EMA": ema,
+    "ATR": atr,
+    "Stochastic": stochastic,
+    "OBV": obv,
+    "VWAP": vwap,
+    "ADX": adx,
+    "Donchian Channels": donchian_channels,
+}
@@ -0,0 +1,139 @@
+"""Reports rendered per second by the template renderer (``reporting/render.py``).
+
+Builds ``--reports`` synthetic tickers, each with a technical report (real
+indicator results on a synthetic price series) and a value report, then times:
+
+- ``legacy``: the former header + summary string building plus the list-append
+  combined report (no indicator tables), for reference;
+- ``md`` / ``html``: ``ReportRenderer.report`` for every section plus the
+  combined report of each ticker;
+- ``batch-<fmt>``: ``BatchRenderer.render``, i.e. every per-ticker page plus
+  the index page in one pass;
+- ``write-<fmt>``: the same batch through a ``ReportWriter`` into a temporary
+  directory (bulk atomic writes included).
+
+    python benchmarks/render_reports.py --reports 1000 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.indicator_worker import IndicatorWorker  # noqa: E402
+from agents.plan_compiler import DEFAULT_INDICATORS, default_params_for  # noqa: E402
+from core.models import AnalysisReport, IndicatorResult, SummaryResult  # noqa: E402
+from data.sources import SyntheticSource  # noqa: E402
+from reporting.render import BatchRenderer, ReportRenderer  # noqa: E402
+from reporting.report_writer import SECTION_TITLES, ReportSection, ReportWriter  # noqa: E402
+
+SUMMARY = (
+    "## Summary\n\n- Momentum is **neutral**; RSI sits mid-range.\n- Trend is up: the short MA is above the long MA.\n\n"
+    "Volatility is moderate and price trades inside the bands."
+)
+
+
+def _analyses(count: int) -> list[tuple[str, AnalysisReport]]:
+    frame = SyntheticSource().history("BENCH", "1y")
+    technical = [IndicatorWorker(n).run(frame, default_params_for(n)) for n in DEFAULT_INDICATORS]
+    value = IndicatorResult(indicator="Value Analysis", signal="Reasonable", details="Value score 2.",
+                            meta={"score": 2, "metrics": {"trailingPE": 21.5, "priceToBook": 3.2, "fcfYield": 0.05}})
+    now = datetime.now()
+    out = []
+    for i in range(count):
+        ticker = f"SYN{i:05d}"
+        out.append(("technical", AnalysisReport(ticker=ticker, generated_at=now, indicators=technical,
+                                                summary=SummaryResult(summary_text=SUMMARY, method="local_fallback"))))
+        out.append(("value", AnalysisReport(ticker=ticker, period="n/a", generated_at=now, indicators=[value],
+                                            summary=SummaryResult(summary_text=SUMMARY, method="local_fallback"))))
+    return out
+
+
+def _legacy(analyses) -> None:
+    by_ticker: dict[str, list[tuple[str, str]]] = {}
+    for kind, a in analyses:
+        header = f"### {SECTION_TITLES[kind]} Report: {a.ticker}\n\n"
+        if a.interval != "1d":
+            header += f"_Bars: {a.interval} over {a.period}_\n\n"
+        by_ticker.setdefault(a.ticker, []).append((kind, header + a.summary.summary_text))
+    for ticker, parts in by_ticker.items():
+        lines = [f"### Final Combined Report: {ticker}", ""]
+        for kind, markdown in parts:
+            lines.append(f"## {SECTION_TITLES[kind]}")
+            lines.append("")
+            lines.append(markdown.strip())
+            lines.append("")
+        "\n".join(lines).strip()
+
+
+def _sections(renderer: ReportRenderer, analyses) -> None:
+    by_ticker: dict[str, list[tuple[str, str]]] = {}
+    for kind, a in analyses:
+        by_ticker.setdefault(a.ticker, []).append((kind, renderer.report(a, kind)))
+    for ticker, parts in by_ticker.items():
+        renderer.combined(ticker, parts)
+
+
+def _batch(fmt: str, analyses) -> None:
+    site = BatchRenderer(fmt, out_dir="unused")
+    for kind, a in analyses:
+        site.add(a, kind)
+    site.render()
+
+
+def _write(fmt: str, analyses) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        site = BatchRenderer(fmt, out_dir=os.path.join(tmp, "site"))
+        renderer = ReportRenderer("md")
+        with ReportWriter(reports_dir=tmp, flush_every=500, keep_sections=True, site=site) as writer:
+            for kind, a in analyses:
+                path = os.path.join(tmp, f"{a.ticker}_{kind}.md")
+                writer.add_section(ReportSection(a.ticker, kind, renderer.report(a, kind), path, a))
+            for ticker in dict.fromkeys(a.ticker for _, a in analyses):
+                writer.combine(ticker)
+
+
+def _median_seconds(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reports", type=int, nargs="+", default=[1000, 5000], help="Tickers per batch (two reports each).")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = {
+        "legacy": _legacy,
+        "md": lambda an: _sections(ReportRenderer("md"), an),
+        "html": lambda an: _sections(ReportRenderer("html"), an),
+        "batch-md": lambda an: _batch("md", an),
+        "batch-html": lambda an: _batch("html", an),
+        "write-md": lambda an: _write("md", an),
+        "write-html": lambda an: _write("html", an),
+    }
+    print("tickers per second (each ticker: technical + value report, combined report or page)")
+    print(f"{'case':<12}" + "".join(f"{n:>12}" for n in args.reports))
+    batches = {n: _analyses(n) for n in args.reports}
+    for name, fn in cases.items():
+        cells = []
+        for n, analyses in batches.items():
+            seconds = _median_seconds(lambda: fn(analyses), args.repeat)
+            cells.append(f"{n / seconds:>12,.0f}")
+        print(f"{name:<12}" + "".join(cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Cost of a watchlist monitor cycle vs. the number of tickers that changed.
+
+Seeds a ``WatchlistMonitor`` over a synthetic universe, then pushes one new
+bar to ``k`` tickers per cycle and times the cycle. For reference it also
+times a full batch recompute of the same indicators for every ticker, which
+is what a one-shot ``main.py`` run does.
+
+    python benchmarks/watchlist_monitor.py --tickers 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from agents.indicator_worker import IndicatorWorker  # noqa: E402
+from agents.watchlist_monitor import DEFAULT_WATCH_INDICATORS, WatchlistMonitor  # noqa: E402
+from data.sources import SyntheticSource  # noqa: E402
+
+
+class _CountingSink:
+    def __init__(self):
+        self.alerts = 0
+
+    def emit(self, alerts):
+        self.alerts += len(alerts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--cycles", type=int, default=20)
+    args = parser.parse_args()
+
+    source = SyntheticSource(seed=7)
+    tickers = SyntheticSource.universe(args.tickers)
+    sink = _CountingSink()
+    monitor = WatchlistMonitor(tickers, source=source, sink=sink)
+
+    start = time.perf_counter()
+    monitor.seed()
+    print(f"seed {len(tickers)} tickers: {time.perf_counter() - start:.2f}s")
+
+    rng = np.random.default_rng(0)
+    for k in (1, 10, 50, len(tickers)):
+        elapsed = 0.0
+        for _ in range(args.cycles):
+            updates = {}
+            for t in rng.choice(tickers, size=k, replace=False):
+                state = monitor.states[t]
+                last_close = state.indicators["RSI"]._prev
+                ts = state.last_bar + pd.offsets.BDay(1)
+                updates[t] = pd.DataFrame({"Close": [last_close * float(np.exp(rng.normal(0, 0.03)))]}, index=[ts])
+            start = time.perf_counter()
+            monitor.push(updates)
+            elapsed += time.perf_counter() - start
+        print(f"changed={k:4d}: {elapsed / args.cycles * 1000:8.2f} ms/cycle")
+
+    frames = {t: source.history(t, "1y") for t in tickers}
+    start = time.perf_counter()
+    for t, df in frames.items():
+        for name in DEFAULT_WATCH_INDICATORS:
+            IndicatorWorker(name).run(df, {})
+    print(f"full batch recompute: {(time.perf_counter() - start) * 1000:8.2f} ms")
+    print(f"alerts emitted: {sink.alerts}; stats: {monitor.stats()}")
+
+
+if __name__ == "__main__":
+    main()
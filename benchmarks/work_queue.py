@@ -0,0 +1,74 @@
+"""Throughput of sharded batch runs versus the number of worker processes.
+
+For each worker count, queues ``--tickers`` synthetic tickers (technical
+analysis only) as shards on a fresh queue in a temporary directory, starts
+that many ``main.py --work`` processes and times the batch until every shard
+is done. ``--latency`` adds a synthetic per-fetch delay, which stands in for
+the network and makes the runs I/O-bound like a real universe sweep.
+
+    python benchmarks/work_queue.py --tickers 200 --workers 1 2 4 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from agents.work_queue import WorkQueue  # noqa: E402
+
+
+def _run(tickers: int, workers: int, shard_size: int, latency: float) -> tuple[float, int]:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "DATA_SOURCE": "synthetic",
+            "SYNTHETIC_LATENCY": str(latency),
+            "WORK_QUEUE_PATH": os.path.join(tmp, "queue.db"),
+            "JOURNAL_DIR": os.path.join(tmp, "journal"),
+            "PLAN_CACHE_DIR": "",
+            "OPENAI_API_KEY": "",
+        }
+        queue = WorkQueue(env["WORK_QUEUE_PATH"])
+        args = {"indicators": ["RSI", "MACD", "Bollinger Bands", "Moving Average"], "interval": "1d",
+                "analysis": "technical", "value_mode": "absolute", "news": False, "deltas": False,
+                "source": "synthetic", "flush_every": 50, "no_journal": True, "retries": 0, "retry_backoff": 0.0}
+        batch_id = queue.submit([f"SYN{i:05d}" for i in range(tickers)], args, shard_size)
+
+        command = [sys.executable, os.path.join(ROOT, "main.py"), "--work", "--queue", env["WORK_QUEUE_PATH"], "--batch", batch_id]
+        start = time.perf_counter()
+        procs = [subprocess.Popen(command, cwd=tmp, env=env, stdout=subprocess.DEVNULL) for _ in range(workers)]
+        for proc in procs:
+            proc.wait()
+        seconds = time.perf_counter() - start
+        done = queue.status(batch_id)[batch_id]["done"]
+        queue.close()
+        return seconds, done
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--shard-size", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05, help="Synthetic seconds per data fetch.")
+    args = parser.parse_args()
+
+    print(f"{args.tickers} tickers, shards of {args.shard_size}, {args.latency:g}s synthetic fetch latency")
+    print(f"{'workers':>8}{'seconds':>10}{'tickers/s':>12}{'speedup':>10}{'shards':>8}")
+    base = None
+    for workers in args.workers:
+        seconds, done = _run(args.tickers, workers, args.shard_size, args.latency)
+        rate = args.tickers / seconds
+        base = base or rate
+        print(f"{workers:>8}{seconds:>10.2f}{rate:>12.1f}{rate / base:>9.2f}x{done:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,63 @@
 import os
 
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
+
+# Market-data backend: "yfinance" (live), "replay" (recorded fixtures), "record" or "synthetic"
+DATA_SOURCE = os.environ.get("DATA_SOURCE", "yfinance")
+DATA_REPLAY_DIR = os.environ.get("DATA_REPLAY_DIR", "data_hist")
+SYNTHETIC_SEED = int(os.environ.get("SYNTHETIC_SEED", "0"))
+SYNTHETIC_LATENCY = float(os.environ.get("SYNTHETIC_LATENCY", "0"))
+
+# Shared indicator pools (upper bounds; effective concurrency adapts below these)
+CPU_POOL_MAX_WORKERS = int(os.environ.get("CPU_POOL_MAX_WORKERS", str(os.cpu_count() or 4)))
+IO_POOL_MAX_WORKERS = int(os.environ.get("IO_POOL_MAX_WORKERS", "32"))
+# Per-task deadlines in seconds from submission, by pool (0 = none); indicators may set ``timeout``
+CPU_TASK_TIMEOUT = float(os.environ.get("CPU_TASK_TIMEOUT", "30"))
+IO_TASK_TIMEOUT = float(os.environ.get("IO_TASK_TIMEOUT", "20"))
+
+# Incremental news store (SQLite) and minimum seconds between feed fetches per ticker
+NEWS_DB_PATH = os.environ.get("NEWS_DB_PATH", os.path.join("data_hist", "news.db"))
+NEWS_POLL_INTERVAL = float(os.environ.get("NEWS_POLL_INTERVAL", "300"))
+
+# LLM dispatcher: OpenAI-compatible endpoint (None = api.openai.com), concurrency, rate limits, retries
+OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL") or None
+LLM_MAX_CONCURRENCY = int(os.environ.get("LLM_MAX_CONCURRENCY", "4"))
+LLM_REQUESTS_PER_MINUTE = float(os.environ.get("LLM_REQUESTS_PER_MINUTE", "500"))
+LLM_TOKENS_PER_MINUTE = float(os.environ.get("LLM_TOKENS_PER_MINUTE", "150000"))
+LLM_MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", "5"))
+# Estimated-token budget for the indicator results encoded into a summary prompt (0 = unlimited)
+LLM_PROMPT_TOKEN_BUDGET = int(os.environ.get("LLM_PROMPT_TOKEN_BUDGET", "600"))
+
+# Intraday bars: one stored base interval per ticker, coarser intervals resampled on demand (LRU-cached)
+BASE_INTERVAL = os.environ.get("BASE_INTERVAL", "5m")
+INTRADAY_PERIOD = os.environ.get("INTRADAY_PERIOD", "60d")
+BAR_CACHE_SIZE = int(os.environ.get("BAR_CACHE_SIZE", "256"))
+MARKET_TIMEZONE = os.environ.get("MARKET_TIMEZONE", "America/New_York")
+
+# Portfolio analysis: benchmark ticker for beta
+PORTFOLIO_BENCHMARK = os.environ.get("PORTFOLIO_BENCHMARK", "SPY")
+
+# Columnar price store for lazy/chunked reads (one directory of .npy arrays per ticker)
+PRICE_STORE_DIR = os.environ.get("PRICE_STORE_DIR", os.path.join("data_hist", "store"))
+
+# Batch checkpoint journals (resume interrupted runs) and retry policy for failed tickers
+JOURNAL_DIR = os.environ.get("JOURNAL_DIR", os.path.join("data_hist", "journal"))
+BATCH_RETRIES = int(os.environ.get("BATCH_RETRIES", "2"))
+BATCH_RETRY_BACKOFF = float(os.environ.get("BATCH_RETRY_BACKOFF", "5"))
+
+# Materialized daily signal table (latest default-indicator values per cached ticker)
+SIGNAL_TABLE_DIR = os.environ.get("SIGNAL_TABLE_DIR", os.path.join("data_hist", "signals"))
+
+# Compiled technical-analysis plans reused across runs (empty disables persistence)
+PLAN_CACHE_DIR = os.environ.get("PLAN_CACHE_DIR", os.path.join("data_hist", "plans"))
+
+# Previous run's signals per ticker, for cross-run delta detection (--deltas)
+DELTA_DB_PATH = os.environ.get("DELTA_DB_PATH", os.path.join("data_hist", "deltas.db"))
+
+# Sharded batch runs: shared SQLite work queue, tickers per shard, lease length and attempts per shard
+WORK_QUEUE_PATH = os.environ.get("WORK_QUEUE_PATH", os.path.join("data_hist", "queue.db"))
+# SQLite journal mode of the queue: WAL needs every process on one host; use DELETE on a network filesystem
+WORK_QUEUE_JOURNAL_MODE = os.environ.get("WORK_QUEUE_JOURNAL_MODE", "WAL")
+WORK_SHARD_SIZE = int(os.environ.get("WORK_SHARD_SIZE", "25"))
+WORK_LEASE_SECONDS = float(os.environ.get("WORK_LEASE_SECONDS", "60"))
+WORK_MAX_ATTEMPTS = int(os.environ.get("WORK_MAX_ATTEMPTS", "3"))
@@ -0,0 +1,185 @@
+"""Dependency-graph execution on the shared pools.
+
+A plan is a set of ``DagNode`` objects, each naming the nodes whose results
+it consumes. ``run_dag`` submits every node whose inputs are all done, as
+soon as they are done, so independent branches run in parallel and each
+intermediate result is computed once and handed to all of its consumers.
+When a node fails (raises, or ``failed(result)`` is true) only its
+descendants are skipped; unrelated branches carry on.
+
+A node with a ``timeout`` gets a deadline from the moment it is submitted, so
+time spent queued behind a busy pool counts too. An overrunning node is
+reported as ``timeout`` without waiting for it: its ``CancelToken`` is
+cancelled (see ``core/tasks.py``), the pool is told to ``abandon`` it (freeing
+its slot for other work) and its late result, if any, is discarded.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from core.execution import CapGroup, get_pool
+from core.tasks import CancelToken, TaskCancelled, bind
+
+
+@dataclass
+class DagNode:
+    id: str
+    fn: Callable[[Dict[str, Any]], Any]  # called with {input_id: result}
+    inputs: List[str] = field(default_factory=list)
+    pool: str = "cpu"
+    timeout: Optional[float] = None  # seconds from submission (None = no deadline)
+
+
+@dataclass
+class DagOutcome:
+    status: str  # "ok", "failed", "timeout" or "skipped"
+    result: Any = None
+    error: Optional[BaseException] = None
+    failed_input: Optional[str] = None  # for skipped nodes: the upstream node that failed
+    latency: Optional[float] = None  # seconds from submission to result (the deadline for timeouts)
+
+
+def validate_dag(nodes: List[DagNode]) -> List[str]:
+    """Returns the node ids in a topological order.
+
+    Raises:
+        ValueError: On duplicate ids, unknown inputs or cycles.
+    """
+    by_id: Dict[str, DagNode] = {}
+    for node in nodes:
+        if node.id in by_id:
+            raise ValueError(f"Duplicate plan node id: {node.id}")
+        by_id[node.id] = node
+    for node in nodes:
+        for dep in node.inputs:
+            if dep not in by_id:
+                raise ValueError(f"Plan node {node.id} depends on unknown node {dep}")
+
+    order: List[str] = []
+    indegree = {n.id: len(set(n.inputs)) for n in nodes}
+    children = _children(nodes)
+    ready = [n.id for n in nodes if indegree[n.id] == 0]
+    while ready:
+        nid = ready.pop(0)
+        order.append(nid)
+        for child in children[nid]:
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                ready.append(child)
+    if len(order) != len(nodes):
+        stuck = sorted(nid for nid, d in indegree.items() if d > 0)
+        raise ValueError(f"Plan has a dependency cycle through: {', '.join(stuck)}")
+    return order
+
+
+def run_dag(
+    nodes: List[DagNode],
+    cap: int | None = None,
+    failed: Callable[[Any], bool] | None = None,
+    validate: bool = True,
+) -> Dict[str, DagOutcome]:
+    """Runs the graph on the shared pools; returns an outcome for every node.
+
+    Args:
+        nodes: Graph nodes (validated with ``validate_dag``).
+        cap: Optional cap on this graph's concurrently running nodes per pool (e.g. the
+            plan's max_workers); other callers of the shared pools are not held back by it.
+        failed: Predicate marking a returned result as a failure (e.g. an "Error" signal).
+        validate: Set to False for graphs already checked with ``validate_dag``
+            (e.g. compiled plans).
+    """
+    if validate:
+        validate_dag(nodes)
+    by_id = {n.id: n for n in nodes}
+    children = _children(nodes)
+    waiting = {n.id: set(n.inputs) for n in nodes}
+    outcomes: Dict[str, DagOutcome] = {}
+    running: Dict[Future, str] = {}
+    tokens: Dict[str, CancelToken] = {}
+    groups: Dict[str, CapGroup] = {}
+
+    def _submit_ready(candidates: List[str]) -> None:
+        for nid in candidates:
+            if nid in outcomes or waiting[nid]:
+                continue
+            node = by_id[nid]
+            args = {dep: outcomes[dep].result for dep in node.inputs}
+            tokens[nid] = CancelToken(node.timeout)
+            tokens[nid].start()
+            group = None
+            if cap and cap > 0:
+                group = groups.setdefault(node.pool, CapGroup(cap))
+            running[get_pool(node.pool).submit(_call, node.fn, args, tokens[nid], group=group)] = nid
+            outcomes[nid] = DagOutcome("running")
+
+    def _skip_descendants(nid: str, cause: str) -> None:
+        stack = list(children[nid])
+        while stack:
+            child = stack.pop()
+            if child in outcomes:
+                continue
+            outcomes[child] = DagOutcome("skipped", failed_input=cause)
+            stack.extend(children[child])
+
+    _submit_ready([n.id for n in nodes])
+    while running:
+        done, _ = wait(list(running), timeout=_wait_timeout(running.values(), tokens), return_when=FIRST_COMPLETED)
+        for future in done:
+            nid = running.pop(future)
+            latency = tokens[nid].latency
+            try:
+                result = future.result()
+            except TaskCancelled as exc:
+                outcomes[nid] = DagOutcome("timeout", error=exc, latency=latency)
+                _skip_descendants(nid, nid)
+                continue
+            except Exception as exc:
+                outcomes[nid] = DagOutcome("failed", error=exc, latency=latency)
+                _skip_descendants(nid, nid)
+                continue
+            if failed is not None and failed(result):
+                outcomes[nid] = DagOutcome("failed", result=result, latency=latency)
+                _skip_descendants(nid, nid)
+                continue
+            outcomes[nid] = DagOutcome("ok", result=result, latency=latency)
+            for child in children[nid]:
+                waiting[child].discard(nid)
+            _submit_ready(children[nid])
+
+        # Abandon overrunning nodes; their threads are asked to stop via the token
+        for future, nid in list(running.items()):
+            token = tokens[nid]
+            if token.expired:
+                token.cancel(f"deadline of {token.timeout:g}s exceeded")
+                get_pool(by_id[nid].pool).abandon(future)
+                del running[future]
+                outcomes[nid] = DagOutcome("timeout", error=TaskCancelled(token.reason), latency=token.timeout)
+                _skip_descendants(nid, nid)
+    return outcomes
+
+
+def _call(fn: Callable[[Dict[str, Any]], Any], args: Dict[str, Any], token: CancelToken) -> Any:
+    # Runs on the pool thread; the token is current while fn runs
+    try:
+        with bind(token):
+            return fn(args)
+    finally:
+        token.finish()
+
+
+def _wait_timeout(running: Iterable[str], tokens: Dict[str, CancelToken]) -> float | None:
+    # Until the nearest deadline among the running nodes (None = wait for a completion)
+    remaining = [tokens[nid].remaining() for nid in running]
+    return min((r for r in remaining if r is not None), default=None)
+
+
+def _children(nodes: List[DagNode]) -> Dict[str, List[str]]:
+    children: Dict[str, List[str]] = {n.id: [] for n in nodes}
+    for node in nodes:
+        for dep in dict.fromkeys(node.inputs):
+            if dep in children:
+                children[dep].append(node.id)
+    return children
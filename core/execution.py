@@ -0,0 +1,239 @@
+"""Shared, long-lived execution pools with adaptive concurrency.
+
+Orchestrators submit indicator work here instead of spinning up a fresh
+``ThreadPoolExecutor`` per ticker. Two pools exist: ``cpu`` for pandas-bound
+indicators and ``io`` for network-bound ones (news, fundamentals). Each pool
+keeps an effective concurrency ``limit`` that is tuned after completions:
+
+- latency gradient: when the smoothed task latency drifts above the best
+  latency seen so far, the limit shrinks proportionally (queueing detected);
+  otherwise it grows by roughly ``sqrt(limit)``.
+- CPU saturation (``cpu`` pool only): when process CPU time approaches
+  ``cpu_count`` cores' worth of wall time, the limit is backed off.
+
+Callers may pass a ``CapGroup`` (e.g. one per ``run_dag`` call, limited to
+``OrchestratorPlan.max_workers``) to bound how many of *their* tasks run at
+once. A full group only holds back its own queued tasks; tasks of other
+callers queued behind them are dispatched past them.
+
+A caller that gives up on a running task (a deadline in ``run_dag``) calls
+``abandon``: the task's slot is released at once, and while abandoned tasks
+still occupy every executor thread, newly dispatched tasks start on a fresh
+daemon thread instead of queueing behind them.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+import math
+import os
+import threading
+import time
+
+import config
+
+
+class CapGroup:
+    """Per-caller concurrency cap: at most ``limit`` of the group's tasks run at once in a pool.
+
+    A group belongs to one pool (its counter is guarded by that pool's lock).
+    """
+
+    def __init__(self, limit: int):
+        self.limit = max(1, int(limit))
+        self.active = 0
+
+
+class AdaptivePool:
+    """Thread pool that dispatches at most ``limit`` tasks at once and adapts ``limit``."""
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        min_workers: int = 1,
+        cpu_bound: bool = False,
+        adjust_interval: float = 0.25,
+    ):
+        self.name = name
+        self.max_workers = max(1, int(max_workers))
+        self.min_workers = max(1, min(int(min_workers), self.max_workers))
+        self.cpu_bound = cpu_bound
+        self.adjust_interval = adjust_interval
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"{name}-pool")
+        self._lock = threading.Lock()
+        self._pending: deque = deque()
+        self._running: Dict[Future, CapGroup | None] = {}  # dispatched and not abandoned
+        self._active = 0
+        self._stuck = 0  # abandoned tasks still running
+        self._executor_busy = 0  # tasks occupying an executor thread
+        self._spilled = 0
+        self._limit = self.max_workers if not cpu_bound else min(self.max_workers, os.cpu_count() or 1)
+
+        self._ewma_latency: float | None = None
+        self._best_latency: float | None = None
+        self._completed = 0
+        self._failed = 0
+        self._cpu_util = 0.0
+        self._last_adjust = time.monotonic()
+        self._last_cpu = time.process_time()
+
+    def submit(self, fn: Callable[..., Any], *args, group: CapGroup | None = None, **kwargs) -> Future:
+        """Queues ``fn(*args, **kwargs)`` and returns a Future for its result.
+
+        Args:
+            fn: Callable to run on a pool thread.
+            group: Optional per-caller cap shared by the caller's tasks in this pool.
+        """
+        future: Future = Future()
+        with self._lock:
+            self._pending.append((future, fn, args, kwargs, group))
+        self._dispatch()
+        return future
+
+    def abandon(self, future: Future) -> None:
+        """Gives up on a task: a queued one is dropped, a running one stops counting.
+
+        The running task's slot (and its ``CapGroup`` slot) is freed for other
+        tasks; it is counted as ``stuck`` until it returns.
+        """
+        if not future.cancel():
+            with self._lock:
+                if future not in self._running:
+                    return  # already finished
+                group = self._running.pop(future)
+                self._active -= 1
+                if group is not None:
+                    group.active -= 1
+                self._stuck += 1
+        self._dispatch()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns a snapshot of the pool's limit, load and latency estimates."""
+        with self._lock:
+            return {
+                "name": self.name,
+                "limit": self._limit,
+                "max_workers": self.max_workers,
+                "active": self._active,
+                "stuck": self._stuck,
+                "spilled": self._spilled,
+                "queued": len(self._pending),
+                "completed": self._completed,
+                "failed": self._failed,
+                "ewma_latency_s": self._ewma_latency,
+                "best_latency_s": self._best_latency,
+                "cpu_utilization": self._cpu_util,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def _dispatch(self) -> None:
+        to_start = []
+        with self._lock:
+            i = 0
+            while i < len(self._pending) and self._active < self._limit:
+                future, fn, args, kwargs, group = self._pending[i]
+                if group is not None and group.active >= group.limit and not future.cancelled():
+                    i += 1  # this caller is at its cap; later tasks may still run
+                    continue
+                del self._pending[i]
+                if not future.set_running_or_notify_cancel():
+                    continue
+                self._active += 1
+                if group is not None:
+                    group.active += 1
+                self._running[future] = group
+                # Every executor thread is held by abandoned tasks: don't queue behind them
+                spill = self._stuck > 0 and self._executor_busy >= self.max_workers
+                if spill:
+                    self._spilled += 1
+                else:
+                    self._executor_busy += 1
+                to_start.append((future, fn, args, kwargs, spill))
+        for future, fn, args, kwargs, spill in to_start:
+            if spill:
+                threading.Thread(target=self._run_task, args=(future, fn, args, kwargs, spill),
+                                 name=f"{self.name}-spill", daemon=True).start()
+            else:
+                self._executor.submit(self._run_task, future, fn, args, kwargs, spill)
+
+    def _run_task(self, future: Future, fn, args, kwargs, spilled: bool) -> None:
+        start = time.perf_counter()
+        ok = True
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as exc:  # propagate to the caller via the future
+            ok = False
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+        finally:
+            self._on_done(future, time.perf_counter() - start, ok, spilled)
+            self._dispatch()
+
+    def _on_done(self, future: Future, latency: float, ok: bool, spilled: bool) -> None:
+        with self._lock:
+            if not spilled:
+                self._executor_busy -= 1
+            if future not in self._running:
+                self._stuck -= 1  # abandoned: its slots were released by ``abandon``
+                return
+            group = self._running.pop(future)
+            self._active -= 1
+            if group is not None:
+                group.active -= 1
+            self._completed += 1
+            if not ok:
+                self._failed += 1
+            self._ewma_latency = latency if self._ewma_latency is None else 0.8 * self._ewma_latency + 0.2 * latency
+            if self._best_latency is None or self._ewma_latency < self._best_latency:
+                self._best_latency = self._ewma_latency
+            now = time.monotonic()
+            if now - self._last_adjust >= self.adjust_interval:
+                self._adjust(now)
+
+    def _adjust(self, now: float) -> None:
+        # Called with self._lock held
+        cpu_now = time.process_time()
+        wall = max(now - self._last_adjust, 1e-9)
+        self._cpu_util = (cpu_now - self._last_cpu) / wall / (os.cpu_count() or 1)
+        self._last_adjust, self._last_cpu = now, cpu_now
+
+        gradient = 1.0
+        if self._best_latency and self._ewma_latency:
+            gradient = max(0.5, min(1.0, self._best_latency / self._ewma_latency))
+        new_limit = self._limit * gradient + (math.sqrt(self._limit) if gradient >= 0.95 else 0)
+        if self.cpu_bound and self._cpu_util > 0.9:
+            new_limit = min(new_limit, self._limit - 1)
+        self._limit = int(max(self.min_workers, min(self.max_workers, round(new_limit))))
+
+
+_pools: Dict[str, AdaptivePool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(kind: str = "cpu") -> AdaptivePool:
+    """Returns the shared pool for ``kind`` ("cpu" or "io"), creating it on first use."""
+    with _pools_lock:
+        pool = _pools.get(kind)
+        if pool is None:
+            if kind == "cpu":
+                pool = AdaptivePool("cpu", max_workers=config.CPU_POOL_MAX_WORKERS, cpu_bound=True)
+            elif kind == "io":
+                pool = AdaptivePool("io", max_workers=config.IO_POOL_MAX_WORKERS)
+            else:
+                raise ValueError(f"Unknown pool kind: {kind}")
+            _pools[kind] = pool
+        return pool
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Returns stats for every pool created so far."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {p.name: p.stats() for p in pools}
@@ -0,0 +1,161 @@
+"""Append-only checkpoint journal for resumable batch runs.
+
+Every finished (ticker, stage) unit of a batch is appended to a JSON Lines
+file and fsynced, so the journal survives a crash or kill at any point
+(a torn last line is ignored on replay). Reopening the same journal replays
+it: units recorded as ``done`` are skipped by the next run, failed ones are
+attempted again. The journal also tracks throughput for progress/ETA lines.
+
+A journal is for resuming an unfinished batch: once every unit is done the
+caller ``retire``s it, so a later run with the same path starts fresh rather
+than skipping everything.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+import json
+import os
+import threading
+import time
+
+Unit = Tuple[str, str]  # (ticker, stage)
+
+
+@dataclass
+class Progress:
+    done: int
+    failed: int
+    total: int
+    rate: float  # units per second finished in this session
+    eta: Optional[float]  # seconds left at the current rate (None = unknown)
+
+    def __str__(self) -> str:
+        eta = "?" if self.eta is None else _fmt_seconds(self.eta)
+        return (
+            f"{self.done}/{self.total} units done, {self.failed} failed, "
+            f"{self.rate:.2f} units/s, ETA {eta}"
+        )
+
+
+class RunJournal:
+    """Durable record of completed and failed batch units."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._done: Dict[Unit, dict] = {}
+        self._failed: Dict[Unit, dict] = {}
+        self._started = time.monotonic()
+        self._session_done = 0
+        self._replay()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._fh = open(path, "a", encoding="utf-8")
+
+    def is_done(self, ticker: str, stage: str) -> bool:
+        with self._lock:
+            return (ticker, stage) in self._done
+
+    def output(self, ticker: str, stage: str) -> str | None:
+        """Output path recorded for a done unit, if any."""
+        with self._lock:
+            entry = self._done.get((ticker, stage))
+        return entry.get("output") if entry else None
+
+    def failures(self) -> Dict[Unit, dict]:
+        """Units whose latest record is a failure."""
+        with self._lock:
+            return dict(self._failed)
+
+    def record(
+        self,
+        ticker: str,
+        stage: str,
+        status: str,
+        output: str | None = None,
+        error: str | None = None,
+        attempt: int = 1,
+        elapsed: float | None = None,
+    ) -> None:
+        """Appends a ``done`` or ``failed`` record and syncs it to disk."""
+        entry = {
+            "ticker": ticker,
+            "stage": stage,
+            "status": status,
+            "attempt": attempt,
+            "ts": time.time(),
+        }
+        if output is not None:
+            entry["output"] = output
+        if error is not None:
+            entry["error"] = error
+        if elapsed is not None:
+            entry["elapsed"] = round(elapsed, 3)
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._fh.write(line)
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+            self._apply(entry)
+            if status == "done":
+                self._session_done += 1
+
+    def progress(self, total: int) -> Progress:
+        """Progress towards ``total`` units; the ETA uses this session's throughput."""
+        with self._lock:
+            done, failed, session_done = len(self._done), len(self._failed), self._session_done
+        elapsed = max(time.monotonic() - self._started, 1e-9)
+        rate = session_done / elapsed
+        remaining = max(0, total - done)
+        eta = remaining / rate if rate > 0 else (0.0 if remaining == 0 else None)
+        return Progress(done=done, failed=failed, total=total, rate=rate, eta=eta)
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._fh.closed:
+                self._fh.close()
+
+    def retire(self) -> str | None:
+        """Closes the journal of a finished batch and moves it to ``<path>.done``; returns that path."""
+        self.close()
+        if not os.path.exists(self.path):
+            return None
+        done_path = self.path + ".done"
+        os.replace(self.path, done_path)
+        return done_path
+
+    def __enter__(self) -> "RunJournal":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+    def _replay(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    self._apply(json.loads(line))
+                except (ValueError, KeyError):
+                    continue  # torn write from a crash mid-line
+
+    def _apply(self, entry: dict) -> None:
+        unit = (entry["ticker"], entry["stage"])
+        if entry["status"] == "done":
+            self._done[unit] = entry
+            self._failed.pop(unit, None)
+        elif unit not in self._done:
+            self._failed[unit] = entry
+
+
+def _fmt_seconds(seconds: float) -> str:
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    if minutes:
+        return f"{minutes}m{secs:02d}s"
+    return f"{secs}s"
@@ -0,0 +1,247 @@
+"""Central LLM dispatcher shared by all orchestrators.
+
+Every chat completion goes through one ``LLMDispatcher``:
+
+- a priority queue, so planning calls (``PRIORITY_PLAN``) are served before
+  summaries (``PRIORITY_SUMMARY``) when the system is saturated;
+- a fixed number of dispatcher threads bounding concurrent requests;
+- token-bucket limits on requests/minute and (estimated) tokens/minute;
+- exponential backoff with jitter on rate-limit, timeout and 5xx errors
+  (honoring ``Retry-After`` when the server sends it);
+- coalescing: identical requests already queued or in flight share one call.
+
+``OPENAI_BASE_URL`` points the client at any OpenAI-compatible server, such as
+the local fake in ``benchmarks/fake_llm_server.py``.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+import hashlib
+import heapq
+import itertools
+import json
+import random
+import threading
+import time
+
+import config
+
+try:
+    from openai import OpenAI
+except Exception:  # pragma: no cover
+    OpenAI = None  # type: ignore
+
+PRIORITY_PLAN = 0
+PRIORITY_SUMMARY = 10
+PRIORITY_BACKGROUND = 20
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap local token estimate (~4 characters per token for English prose)."""
+    return max(1, (len(text) + 3) // 4)
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at ``rate`` tokens/second."""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, n: float = 1.0) -> float:
+        """Blocks until ``n`` tokens are available; returns seconds waited."""
+        n = min(float(n), self.capacity)  # oversized requests wait for a full bucket
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= n:
+                    self._tokens -= n
+                    return waited
+                delay = (n - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+@dataclass(order=True)
+class _Request:
+    priority: int
+    seq: int
+    key: str = field(compare=False)
+    kwargs: Dict[str, Any] = field(compare=False)
+    tokens: int = field(compare=False)
+    future: Future = field(compare=False)
+
+
+class LLMDispatcher:
+    """Rate-limited, prioritized, retrying chat-completion scheduler."""
+
+    def __init__(
+        self,
+        client: Any = None,
+        max_concurrency: int | None = None,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        max_retries: int | None = None,
+        backoff_base: float = 0.5,
+        backoff_max: float = 20.0,
+    ):
+        self._client = client
+        self.max_concurrency = max(1, int(max_concurrency or config.LLM_MAX_CONCURRENCY))
+        rpm = float(requests_per_minute or config.LLM_REQUESTS_PER_MINUTE)
+        tpm = float(tokens_per_minute or config.LLM_TOKENS_PER_MINUTE)
+        self._request_bucket = TokenBucket(rpm / 60.0, capacity=max(1.0, rpm / 60.0 * 5))
+        self._token_bucket = TokenBucket(tpm / 60.0, capacity=max(1.0, tpm / 60.0 * 5))
+        self.max_retries = config.LLM_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._lock = threading.Condition()
+        self._queue: List[_Request] = []
+        self._inflight: Dict[str, Future] = {}
+        self._seq = itertools.count()
+        self._threads: List[threading.Thread] = []
+        self._stats = {"submitted": 0, "coalesced": 0, "completed": 0, "failed": 0, "retries": 0}
+
+    def submit(self, messages: List[Dict[str, str]], model: str = "gpt-4-turbo",
+               priority: int = PRIORITY_SUMMARY, **params) -> Future:
+        """Queues a chat completion; returns a Future resolving to the message content."""
+        kwargs = {"model": model, "messages": messages, **params}
+        key = hashlib.sha1(json.dumps(kwargs, sort_keys=True, default=str).encode()).hexdigest()
+        with self._lock:
+            self._stats["submitted"] += 1
+            existing = self._inflight.get(key)
+            if existing is not None:
+                self._stats["coalesced"] += 1
+                return existing
+            future: Future = Future()
+            self._inflight[key] = future
+            tokens = sum(estimate_tokens(m.get("content") or "") for m in messages) + int(params.get("max_tokens") or 512)
+            heapq.heappush(self._queue, _Request(priority, next(self._seq), key, kwargs, tokens, future))
+            self._ensure_threads()
+            self._lock.notify()
+        return future
+
+    def complete(self, messages: List[Dict[str, str]], model: str = "gpt-4-turbo",
+                 priority: int = PRIORITY_SUMMARY, timeout: float | None = None, **params) -> str:
+        """Blocking ``submit``; raises the final error if all retries fail."""
+        return self.submit(messages, model=model, priority=priority, **params).result(timeout=timeout)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "queued": len(self._queue), "inflight": len(self._inflight)}
+
+    def _ensure_threads(self) -> None:
+        # Called with self._lock held
+        while len(self._threads) < self.max_concurrency:
+            t = threading.Thread(target=self._loop, name=f"llm-dispatch-{len(self._threads)}", daemon=True)
+            self._threads.append(t)
+            t.start()
+
+    def _loop(self) -> None:
+        while True:
+            with self._lock:
+                while not self._queue:
+                    self._lock.wait()
+                req = heapq.heappop(self._queue)
+            if not req.future.set_running_or_notify_cancel():
+                self._finish(req.key)
+                continue
+            try:
+                content = self._call_with_retries(req)
+            except BaseException as exc:
+                self._finish(req.key, failed=True)
+                req.future.set_exception(exc)
+            else:
+                self._finish(req.key)
+                req.future.set_result(content)
+
+    def _finish(self, key: str, failed: bool = False) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+            self._stats["failed" if failed else "completed"] += 1
+
+    def _call_with_retries(self, req: _Request) -> str:
+        attempt = 0
+        while True:
+            self._request_bucket.acquire(1)
+            self._token_bucket.acquire(req.tokens)
+            try:
+                response = self._get_client().chat.completions.create(**req.kwargs)
+                return response.choices[0].message.content or ""
+            except Exception as exc:
+                if attempt >= self.max_retries or not _is_retryable(exc):
+                    raise
+                delay = _retry_after(exc)
+                if delay is None:
+                    delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+                    delay *= random.uniform(0.5, 1.0)
+                with self._lock:
+                    self._stats["retries"] += 1
+                attempt += 1
+                time.sleep(delay)
+
+    def _get_client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    if not config.OPENAI_API_KEY:
+                        raise RuntimeError("OPENAI_API_KEY not configured")
+                    if OpenAI is None:
+                        raise RuntimeError("openai package not installed")
+                    # Retries are handled here, not inside the SDK
+                    self._client = OpenAI(api_key=config.OPENAI_API_KEY, base_url=config.OPENAI_BASE_URL, max_retries=0)
+        return self._client
+
+
+def _is_retryable(exc: Exception) -> bool:
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    if status is not None:
+        return status == 429 or status == 408 or status >= 500
+    name = type(exc).__name__
+    return name in ("APIConnectionError", "APITimeoutError", "RateLimitError", "InternalServerError",
+                    "TimeoutError", "ConnectionError")
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        value = headers.get("retry-after")
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+_dispatcher: LLMDispatcher | None = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_llm_dispatcher() -> LLMDispatcher:
+    """Returns the process-wide dispatcher; raises if OpenAI is not configured."""
+    global _dispatcher
+    if _dispatcher is None and not config.OPENAI_API_KEY:
+        raise RuntimeError("OPENAI_API_KEY not configured")
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = LLMDispatcher()
+    return _dispatcher
+
+
+def set_llm_dispatcher(dispatcher: LLMDispatcher | None) -> None:
+    """Replaces the process-wide dispatcher (e.g. one bound to a fake server)."""
+    global _dispatcher
+    with _dispatcher_lock:
+        _dispatcher = dispatcher
@@ -20,11 +20,14 @@ class SummaryResult(BaseModel):
         ..., description="How the summary was generated"
     )
     model: Optional[str] = Field(None, description="Model used, when applicable")
+    prompt_tokens: Optional[int] = Field(None, description="Estimated tokens of the encoded results in the prompt")
+    tokens_saved: Optional[int] = Field(None, description="Estimated tokens saved versus the full JSON results")
 
 
 class OrchestratorPlan(BaseModel):
     ticker: str
     period: str = "1y"
+    interval: str = "1d"
     requested_indicators: Optional[List[str]] = None
     plan_indicators: List[str] = Field(
         default_factory=list, description="Ordered list of indicator names to execute"
@@ -34,6 +37,12 @@ class OrchestratorPlan(BaseModel):
         params: Dict[str, Any] = Field(
             default_factory=dict, description="Per-indicator parameters (e.g., window sizes)"
         )
+        id: Optional[str] = Field(
+            None, description="Node id other items refer to in inputs (defaults to the name)"
+        )
+        inputs: List[str] = Field(
+            default_factory=list, description="Ids of plan items whose results this item consumes"
+        )
 
     plan_items: List[IndicatorPlanItem] = Field(
         default_factory=list,
@@ -44,10 +53,28 @@ class OrchestratorPlan(BaseModel):
     max_workers: Optional[int] = Field(None, description="Suggested parallelism cap")
 
 
+class IndicatorDelta(BaseModel):
+    indicator: str
+    previous_signal: Optional[str] = Field(None, description="Signal in the previous run (None if new)")
+    signal: Optional[str] = Field(None, description="Signal in this run (None if removed)")
+    crossings: List[str] = Field(default_factory=list, description="Threshold levels crossed since the previous run")
+
+
+class ReportDelta(BaseModel):
+    status: Literal["new", "changed", "unchanged"]
+    since: Optional[str] = Field(None, description="Date of the previous run compared against")
+    indicators: List[IndicatorDelta] = Field(
+        default_factory=list, description="Indicators with a signal flip, a threshold crossing, or added/removed"
+    )
+    score_change: Optional[float] = Field(None, description="Change of the value score, when it changed")
+
+
 class AnalysisReport(BaseModel):
     ticker: str
     period: str = "1y"
+    interval: str = Field("1d", description="Bar interval the indicators ran on, e.g. 1d, 1h, 15m")
     generated_at: datetime
     indicators: List[IndicatorResult]
     summary: SummaryResult
     plan: Optional[OrchestratorPlan] = None
+    delta: Optional[ReportDelta] = Field(None, description="Changes since the previous run, when tracked")
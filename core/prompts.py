@@ -0,0 +1,174 @@
+"""Compact, budgeted encoding of indicator results for LLM prompts.
+
+``PromptBuilder.build`` turns a list of ``IndicatorResult`` into a
+pipe-separated table instead of the raw ``model_dump()`` JSON:
+
+- numbers are rounded to ``precision`` significant digits;
+- nested ``meta`` values are flattened, grouped under their shared prefix
+  (``metrics{trailingPE=21.5,priceToBook=3.2}``), and non-numeric entries
+  (``params``, rationale lists) are left out;
+- a signal label used more than once is replaced by a short code
+  (``S0``, ``S1`` ...) with a legend line;
+- identical details strings are written once and referenced (``=RSI``).
+
+The encoded payload must fit ``budget`` tokens (``estimate_tokens``). When
+it does not, it is degraded step by step (details shortened, then dropped,
+then only top-level values kept, then trailing rows dropped with a note).
+Each build records the estimated tokens of the JSON it replaces, so the
+savings per call are reported on ``PromptPayload`` and in ``prompt_stats``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+import json
+import math
+import threading
+
+import config
+from core.llm import estimate_tokens
+from core.models import IndicatorResult
+
+TABLE_HEADER = "indicator|signal|values|details"
+_DETAILS_SHORT = 120
+
+
+@dataclass
+class PromptPayload:
+    text: str
+    tokens: int  # estimated tokens of ``text``
+    baseline_tokens: int  # estimated tokens of the full model_dump() JSON
+    level: int = 0  # degradation steps applied to fit the budget (0 = none)
+    dropped_rows: int = 0
+
+    @property
+    def saved(self) -> int:
+        return max(0, self.baseline_tokens - self.tokens)
+
+
+class PromptBuilder:
+    """Encodes indicator results compactly within a token budget."""
+
+    def __init__(self, budget: int | None = None, precision: int = 4):
+        """
+        Args:
+            budget: Token budget for the encoded results (default ``LLM_PROMPT_TOKEN_BUDGET``; 0 = unlimited).
+            precision: Significant digits kept for numbers.
+        """
+        self.budget = config.LLM_PROMPT_TOKEN_BUDGET if budget is None else int(budget)
+        self.precision = precision
+
+    def build(self, results: List[IndicatorResult], budget: int | None = None) -> PromptPayload:
+        """The compact table for ``results``, degraded as needed to fit the budget."""
+        budget = self.budget if budget is None else int(budget)
+        baseline = estimate_tokens(json.dumps([r.model_dump(mode="json") for r in results]))
+        rows = [self._row(r) for r in results]
+
+        text, level, dropped = self._encode(rows), 0, 0
+        steps = (
+            lambda rs: [(n, s, v, _shorten(d, _DETAILS_SHORT)) for n, s, v, d in rs],
+            lambda rs: [(n, s, v, "") for n, s, v, _ in rs],
+            lambda rs: [(n, s, [kv for kv in v if "." not in kv[0]], d) for n, s, v, d in rs],
+        )
+        for step in steps:
+            if not budget or estimate_tokens(text) <= budget:
+                break
+            rows = step(rows)
+            level += 1
+            text = self._encode(rows)
+        while budget and estimate_tokens(text) > budget and len(rows) > 1:
+            rows = rows[:-1]
+            dropped += 1
+            text = self._encode(rows, dropped)
+        if dropped:
+            level += 1
+
+        payload = PromptPayload(text=text, tokens=estimate_tokens(text), baseline_tokens=baseline,
+                                level=level, dropped_rows=dropped)
+        _record(payload)
+        return payload
+
+    def _row(self, result: IndicatorResult) -> Tuple[str, str, List[Tuple[str, str]], str]:
+        values = [(k, _num(v, self.precision)) for k, v in _flatten(result.meta or {})]
+        return result.indicator, result.signal, values, result.details or ""
+
+    def _encode(self, rows, dropped: int = 0) -> str:
+        counts: Dict[str, int] = {}
+        for _, signal, _, _ in rows:
+            counts[signal] = counts.get(signal, 0) + 1
+        codes = {s: f"S{i}" for i, s in enumerate(s for s, c in counts.items() if c > 1)}
+
+        lines = []
+        if codes:
+            lines.append("signals: " + " ".join(f"{code}={_cell(s)}" for s, code in codes.items()))
+        lines.append(TABLE_HEADER)
+        seen_details: Dict[str, str] = {}
+        for name, signal, values, details in rows:
+            if details and details in seen_details:
+                details = f"={seen_details[details]}"
+            elif details:
+                seen_details[details] = name
+            lines.append("|".join((_cell(name), codes.get(signal) or _cell(signal), _group(values), _cell(details))))
+        if dropped:
+            lines.append(f"({dropped} more indicator(s) omitted for length)")
+        return "\n".join(lines)
+
+
+_stats = {"calls": 0, "tokens": 0, "baseline_tokens": 0, "saved": 0, "degraded": 0}
+_stats_lock = threading.Lock()
+
+
+def prompt_stats() -> Dict[str, int]:
+    """Totals over every payload built in this process."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _record(payload: PromptPayload) -> None:
+    with _stats_lock:
+        _stats["calls"] += 1
+        _stats["tokens"] += payload.tokens
+        _stats["baseline_tokens"] += payload.baseline_tokens
+        _stats["saved"] += payload.saved
+        _stats["degraded"] += 1 if payload.level else 0
+
+
+def _flatten(meta: Dict[str, Any], prefix: str = "") -> List[Tuple[str, float]]:
+    out: List[Tuple[str, float]] = []
+    for key, value in meta.items():
+        if not prefix and key == "params":
+            continue
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            out.extend(_flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            if not (isinstance(value, float) and math.isnan(value)):
+                out.append((name, value))
+    return out
+
+
+def _group(values: List[Tuple[str, str]]) -> str:
+    # Keys sharing a dotted prefix are written once: metrics{pe=21.5,pb=3.2}
+    groups: Dict[str, List[str]] = {}
+    for key, value in values:
+        head, _, tail = key.rpartition(".")
+        groups.setdefault(head, []).append(f"{tail}={value}")
+    parts = []
+    for head, items in groups.items():
+        parts.append(",".join(items) if not head else f"{head}{{{','.join(items)}}}")
+    return _cell(",".join(parts))
+
+
+def _num(value: float, precision: int) -> str:
+    if float(value).is_integer() and abs(value) < 1e6:
+        return str(int(value))
+    return f"{value:.{precision}g}"
+
+
+def _cell(text: str) -> str:
+    return str(text).replace("|", "/").replace("\n", " ")
+
+
+def _shorten(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
@@ -0,0 +1,161 @@
+"""Deadlines, cooperative cancellation and latency stats for pool tasks.
+
+Python threads cannot be killed, so a task that overruns its deadline is
+abandoned by its caller (``run_dag`` reports it as timed out and moves on)
+and asked to stop: its ``CancelToken`` is cancelled. Code running inside a
+task cooperates through the thread's current token:
+
+- ``check_cancelled()`` raises ``TaskCancelled`` once the deadline passed or
+  the caller gave up (call it between network round trips);
+- ``remaining_time()`` bounds blocking calls (e.g. ``LLMDispatcher.complete(timeout=...)``).
+
+Outside a task both are no-ops. ``record_task`` / ``task_stats`` keep
+per-name counts, timeouts and latency percentiles for tuning the limits.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator
+import threading
+import time
+
+
+class TaskCancelled(TimeoutError):
+    """Raised inside a task whose deadline passed or whose caller cancelled it."""
+
+
+class CancelToken:
+    """Deadline and cancellation flag of one task; the clock starts at ``start()``."""
+
+    def __init__(self, timeout: float | None = None):
+        """
+        Args:
+            timeout: Seconds allowed from ``start()`` (None or <= 0 = no deadline).
+        """
+        self.timeout = timeout if timeout and timeout > 0 else None
+        self.started: float | None = None
+        self.finished: float | None = None
+        self._cancelled = threading.Event()
+        self.reason: str | None = None
+
+    @property
+    def deadline(self) -> float | None:
+        if self.timeout is None or self.started is None:
+            return None
+        return self.started + self.timeout
+
+    @property
+    def expired(self) -> bool:
+        deadline = self.deadline
+        return deadline is not None and time.monotonic() >= deadline
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set() or self.expired
+
+    @property
+    def latency(self) -> float | None:
+        """Seconds from start to finish (or until now for a task still running)."""
+        if self.started is None:
+            return None
+        return (self.finished or time.monotonic()) - self.started
+
+    def start(self) -> None:
+        self.started = time.monotonic()
+
+    def finish(self) -> None:
+        self.finished = time.monotonic()
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        self.reason = self.reason or reason
+        self._cancelled.set()
+
+    def remaining(self) -> float | None:
+        deadline = self.deadline
+        return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+    def check(self) -> None:
+        """Raises ``TaskCancelled`` if the task should stop."""
+        if self.cancelled:
+            raise TaskCancelled(self.reason or f"deadline of {self.timeout:g}s exceeded")
+
+
+_local = threading.local()
+
+
+@contextmanager
+def bind(token: CancelToken) -> Iterator[CancelToken]:
+    """Makes ``token`` the current thread's token for the duration of the block."""
+    previous = getattr(_local, "token", None)
+    _local.token = token
+    try:
+        yield token
+    finally:
+        _local.token = previous
+
+
+def current_token() -> CancelToken | None:
+    return getattr(_local, "token", None)
+
+
+def check_cancelled() -> None:
+    """Raises ``TaskCancelled`` if the current task should stop (no-op outside a task)."""
+    token = current_token()
+    if token is not None:
+        token.check()
+
+
+def remaining_time(default: float | None = None) -> float | None:
+    """Seconds left before the current task's deadline (``default`` without one)."""
+    token = current_token()
+    remaining = token.remaining() if token is not None else None
+    if remaining is None:
+        return default
+    return remaining if default is None else min(remaining, default)
+
+
+_STATUSES = ("ok", "failed", "timeout", "skipped")
+_WINDOW = 256  # latencies kept per task name for percentiles
+
+_stats: Dict[str, Dict[str, Any]] = {}
+_latencies: Dict[str, Deque[float]] = {}
+_stats_lock = threading.Lock()
+
+
+def record_task(name: str, status: str, latency: float | None = None) -> None:
+    """Counts one finished task of ``name`` ("ok", "failed", "timeout" or "skipped")."""
+    with _stats_lock:
+        entry = _stats.get(name)
+        if entry is None:
+            entry = _stats[name] = {"count": 0, **{s: 0 for s in _STATUSES}, "total_s": 0.0, "max_s": 0.0}
+            _latencies[name] = deque(maxlen=_WINDOW)
+        entry["count"] += 1
+        entry[status] = entry.get(status, 0) + 1
+        if latency is not None:
+            entry["total_s"] += latency
+            entry["max_s"] = max(entry["max_s"], latency)
+            _latencies[name].append(latency)
+
+
+def task_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-name counts by status, mean/max latency and p50/p95 over the recent window."""
+    with _stats_lock:
+        out = {}
+        for name, entry in _stats.items():
+            window = sorted(_latencies[name])
+            timed = len(window)
+            out[name] = {
+                **entry,
+                "mean_s": entry["total_s"] / max(1, entry["count"] - entry["skipped"]),
+                "p50_s": window[timed // 2] if timed else None,
+                "p95_s": window[min(timed - 1, int(timed * 0.95))] if timed else None,
+            }
+        return out
+
+
+def reset_task_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+        _latencies.clear()
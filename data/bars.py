@@ -0,0 +1,182 @@
+"""Multi-interval price bars resampled on demand from one base series per ticker.
+
+Only the base interval (``BASE_INTERVAL``, e.g. ``5m``) is downloaded and
+cached on disk, as ``data_hist/<TICKER>_<period>_<base>.csv``. Coarser bars
+(15m, 1h, 1d, ...) are produced from it with a single vectorized
+``DataFrame.resample`` and kept in an in-memory LRU cache, so asking for
+another timeframe never triggers another download.
+
+Intraday bins are aligned to the session open (the time of day of the first
+base bar), so 1h bars start at 09:30 for US equities like Yahoo's do.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Tuple
+import os
+import threading
+
+import pandas as pd
+
+import config
+from data.sources import DataSource, get_data_source, history_filename, read_history_csv
+
+# Supported intervals and their pandas resample rules
+INTERVALS: Dict[str, str] = {
+    "1m": "1min",
+    "2m": "2min",
+    "5m": "5min",
+    "15m": "15min",
+    "30m": "30min",
+    "1h": "1h",
+    "1d": "1D",
+}
+
+_AGG = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum",
+        "Dividends": "sum", "Stock Splits": "sum"}
+
+
+def interval_delta(interval: str) -> pd.Timedelta:
+    """Bar length of ``interval``; raises ValueError for unsupported intervals."""
+    if interval not in INTERVALS:
+        raise ValueError(f"Unsupported interval: {interval} (expected one of {list(INTERVALS)})")
+    return pd.Timedelta(INTERVALS[interval])
+
+
+def resample_ohlcv(bars: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """Aggregates OHLCV ``bars`` into ``interval`` bars (empty bins are dropped).
+
+    Open/Close take the first/last bar, High/Low the max/min, Volume and
+    corporate actions are summed; any other column keeps its last value.
+    """
+    step = interval_delta(interval)
+    if bars.empty:
+        return bars.copy()
+    agg = {c: _AGG.get(c, "last") for c in bars.columns}
+    if interval == "1d":
+        out = bars.resample(INTERVALS[interval]).agg(agg)
+    else:
+        first = bars.index[0]
+        offset = (first - first.normalize()) % step
+        out = bars.resample(INTERVALS[interval], origin="start_day", offset=offset).agg(agg)
+    if "Close" in out.columns:
+        return out.dropna(subset=["Close"])
+    return out.dropna(how="all")
+
+
+class BarCache:
+    """Thread-safe LRU cache of bar frames keyed by (source, ticker, period, interval)."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = max(1, int(maxsize))
+        self._data: "OrderedDict[Hashable, pd.DataFrame]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: Hashable) -> pd.DataFrame | None:
+        with self._lock:
+            frame = self._data.get(key)
+            if frame is None:
+                self._stats["misses"] += 1
+                return None
+            self._data.move_to_end(key)
+            self._stats["hits"] += 1
+            return frame
+
+    def put(self, key: Hashable, frame: pd.DataFrame) -> None:
+        with self._lock:
+            self._data[key] = frame
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "size": len(self._data), "maxsize": self.maxsize}
+
+
+_cache: BarCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_bar_cache() -> BarCache:
+    """Returns the process-wide resampled-bar cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = BarCache(config.BAR_CACHE_SIZE)
+    return _cache
+
+
+def get_base_series(ticker: str, period: str | None = None, source: DataSource | None = None) -> pd.DataFrame:
+    """Returns the stored base-interval series, downloading it once if needed.
+
+    Args:
+        ticker: The stock ticker symbol.
+        period: History length (defaults to ``INTRADAY_PERIOD``).
+        source: Optional data source; defaults to the process-wide source.
+    """
+    source = source or get_data_source()
+    period = period or config.INTRADAY_PERIOD
+    base = config.BASE_INTERVAL
+    cache = get_bar_cache()
+    key = _key(source, ticker, period, base)
+    bars = cache.get(key)
+    if bars is not None:
+        return bars
+
+    if source.cacheable:
+        os.makedirs("data_hist", exist_ok=True)
+        file_path = os.path.join("data_hist", history_filename(ticker, period, base))
+        if os.path.exists(file_path):
+            bars = read_history_csv(file_path)
+        else:
+            print(f"Fetching {base} bars for {ticker} from {type(source).__name__}...")
+            bars = source.history(ticker, period, base)
+            bars.to_csv(file_path)
+    else:
+        bars = source.history(ticker, period, base)
+    bars = bars.sort_index()
+    cache.put(key, bars)
+    return bars
+
+
+def get_bars(ticker: str, interval: str, period: str | None = None, source: DataSource | None = None) -> pd.DataFrame:
+    """Returns ``interval`` bars for the ticker, resampled from the base series.
+
+    Args:
+        ticker: The stock ticker symbol.
+        interval: Target interval; must be a multiple of ``BASE_INTERVAL`` (e.g. 15m, 1h, 1d).
+        period: History length of the base series (defaults to ``INTRADAY_PERIOD``).
+        source: Optional data source; defaults to the process-wide source.
+
+    Raises:
+        ValueError: If the interval is unsupported or finer than the base interval.
+    """
+    base = config.BASE_INTERVAL
+    step, base_step = interval_delta(interval), interval_delta(base)
+    if step < base_step or step % base_step:
+        raise ValueError(f"Interval {interval} cannot be built from base interval {base}")
+    source = source or get_data_source()
+    period = period or config.INTRADAY_PERIOD
+    if interval == base:
+        return get_base_series(ticker, period, source)
+
+    cache = get_bar_cache()
+    key = _key(source, ticker, period, interval)
+    bars = cache.get(key)
+    if bars is None:
+        bars = resample_ohlcv(get_base_series(ticker, period, source), interval)
+        cache.put(key, bars)
+    return bars
+
+
+def _key(source: DataSource, ticker: str, period: str, interval: str) -> Tuple[Any, ...]:
+    return (id(source), ticker, period, config.BASE_INTERVAL, interval)
@@ -1,17 +1,31 @@
 import pandas as pd
-import yfinance as yf
 import os
 
-def get_stock_data(ticker: str, period: str = "1y") -> pd.DataFrame:
+from data.bars import get_bars
+from data.sources import DataSource, get_data_source, read_history_csv
+
+def get_stock_data(ticker: str, period: str | None = None, source: DataSource | None = None, interval: str = "1d") -> pd.DataFrame:
     """Fetches historical stock data for the given ticker, using a local cache if available.
 
     Args:
         ticker: The stock ticker symbol.
-        period: The time period for the data (e.g., "1y", "6mo").
+        period: The time period for the data (e.g., "1y", "6mo"); defaults to "1y"
+            for daily bars and ``INTRADAY_PERIOD`` for intraday ones.
+        source: Optional data source; defaults to the configured process-wide source.
+        interval: Bar interval. "1d" fetches daily bars directly; intraday
+            intervals (e.g. "15m", "1h") are resampled from the stored base series.
 
     Returns:
         A pandas DataFrame with the historical stock data.
     """
+    if interval != "1d":
+        return get_bars(ticker, interval, period, source)
+    period = period or "1y"
+    source = source or get_data_source()
+    if not source.cacheable:
+        # Replay/synthetic sources are already local; don't write them into the cache
+        return source.history(ticker, period)
+
     cache_dir = "data_hist"
     if not os.path.exists(cache_dir):
         os.makedirs(cache_dir)
@@ -20,10 +34,54 @@ def get_stock_data(ticker: str, period: str = "1y") -> pd.DataFrame:
 
     if os.path.exists(file_path):
         print(f"Loading data for {ticker} from cache...")
-        return pd.read_csv(file_path, index_col=0, parse_dates=True)
+        return read_history_csv(file_path)
     else:
-        print(f"Fetching data for {ticker} from yfinance...")
-        stock = yf.Ticker(ticker)
-        hist = stock.history(period=period)
+        print(f"Fetching data for {ticker} from {type(source).__name__}...")
+        hist = source.history(ticker, period)
         hist.to_csv(file_path)
         return hist
+
+
+def load_close_matrix(
+    tickers: list[str],
+    period: str = "1y",
+    source: DataSource | None = None,
+    column: str = "Close",
+) -> pd.DataFrame:
+    """Loads many tickers' history (through the cache) as one aligned matrix.
+
+    Histories are fetched concurrently on the shared I/O pool and aligned on
+    calendar date in a single concat; tickers that fail to load are left out.
+
+    Returns:
+        DataFrame indexed by date with one ``column`` series per ticker.
+    """
+    from core.execution import get_pool
+
+    pool = get_pool("io")
+    futures = {t: pool.submit(get_stock_data, t, period, source) for t in dict.fromkeys(tickers)}
+    series = {}
+    for ticker, future in futures.items():
+        try:
+            hist = future.result()
+        except Exception as exc:
+            print(f"Could not load history for {ticker}: {exc}")
+            continue
+        if hist is None or hist.empty or column not in hist:
+            continue
+        s = hist[column].astype(float)
+        s.index = _session_dates(s.index)
+        series[ticker] = s[~s.index.duplicated(keep="last")]
+    if not series:
+        return pd.DataFrame(columns=list(futures))
+    return pd.concat(series, axis=1, sort=True)
+
+
+def _session_dates(index: pd.Index) -> pd.DatetimeIndex:
+    # yfinance indexes (and CSVs written from them) carry exchange-local offsets that
+    # change across DST; the local wall-clock date is the session date
+    if isinstance(index, pd.DatetimeIndex):
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        return index.normalize()
+    return pd.to_datetime(index.astype(str).str[:10])
@@ -0,0 +1,308 @@
+"""Daily fundamentals snapshot: one (ticker x metric) table per day.
+
+Fetching ``.info`` once per ticker per day and keeping the result as a single
+table lets the value scorer rank a whole universe in one vectorized pass.
+Snapshots are cached as ``data_hist/fundamentals_<YYYYMMDD>.csv``; per-sector
+percentile ranks derived from a snapshot are cached alongside it.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+import os
+import threading
+
+import pandas as pd
+
+from data.sources import DataSource, get_data_source
+
+# Snapshot column -> yfinance ``.info`` key
+INFO_FIELDS: Dict[str, str] = {
+    "trailingPE": "trailingPE",
+    "forwardPE": "forwardPE",
+    "priceToBook": "priceToBook",
+    "priceToSales": "priceToSalesTrailing12Months",
+    "dividendYield": "dividendYield",  # typically fraction (e.g., 0.01 == 1%)
+    "profitMargins": "profitMargins",
+    "operatingMargins": "operatingMargins",
+    "returnOnEquity": "returnOnEquity",
+    "revenueGrowth": "revenueGrowth",
+    "debtToEquity": "debtToEquity",
+    "currentRatio": "currentRatio",
+    "quickRatio": "quickRatio",
+    "marketCap": "marketCap",
+    "freeCashflow": "freeCashflow",
+}
+# Numeric columns, in the order reported in ValueAnalysisWorker meta["metrics"]
+METRIC_COLUMNS: List[str] = list(INFO_FIELDS) + ["fcfYield"]
+TEXT_COLUMNS: List[str] = ["sector", "shortName"]
+
+SNAPSHOT_DIR = "data_hist"
+
+_snapshot_cache: Dict[str, tuple] = {}
+_snapshot_lock = threading.Lock()
+
+
+def metrics_from_info(info: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    """Extracts the numeric metrics used by value scoring from a ``.info`` mapping."""
+    metrics = {col: _safe_float(info.get(key)) for col, key in INFO_FIELDS.items()}
+    fcf, mc = metrics["freeCashflow"], metrics["marketCap"]
+    metrics["fcfYield"] = _safe_div(fcf, mc) if fcf and mc else None
+    return metrics
+
+
+def build_snapshot(tickers: Iterable[str], source: DataSource | None = None) -> pd.DataFrame:
+    """Fetches fundamentals for every ticker (concurrently) into one table.
+
+    Returns:
+        DataFrame indexed by ticker with METRIC_COLUMNS (float, NaN when missing)
+        and TEXT_COLUMNS.
+    """
+    from core.execution import get_pool
+
+    source = source or get_data_source()
+    tickers = list(dict.fromkeys(tickers))
+    pool = get_pool("io")
+    futures = [pool.submit(source.info, t) for t in tickers]
+
+    rows = []
+    for ticker, future in zip(tickers, futures):
+        try:
+            info = future.result() or {}
+        except Exception:
+            info = {}
+        row: Dict[str, Any] = metrics_from_info(info)
+        for col in TEXT_COLUMNS:
+            row[col] = info.get(col)
+        rows.append(row)
+    return _frame(rows, tickers)
+
+
+def snapshot_from_infos(infos: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+    """Builds a snapshot from already-fetched ``.info`` mappings keyed by ticker."""
+    rows = []
+    for info in infos.values():
+        row: Dict[str, Any] = metrics_from_info(info or {})
+        for col in TEXT_COLUMNS:
+            row[col] = (info or {}).get(col)
+        rows.append(row)
+    return _frame(rows, list(infos))
+
+
+def snapshot_path(date: str | None = None) -> str:
+    date = date or datetime.now().strftime("%Y%m%d")
+    return os.path.join(SNAPSHOT_DIR, f"fundamentals_{date}.csv")
+
+
+def save_snapshot(snapshot: pd.DataFrame, date: str | None = None) -> str:
+    """Writes the snapshot for ``date`` (YYYYMMDD, default today) atomically."""
+    path = snapshot_path(date)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp{os.getpid()}"
+    snapshot.to_csv(tmp, index_label="ticker")
+    os.replace(tmp, path)
+    return path
+
+
+def load_snapshot(date: str | None = None) -> pd.DataFrame | None:
+    """Loads the snapshot for ``date`` (default today), or None when absent.
+
+    Parsed snapshots are memoized per path and reloaded only when the file changes.
+    """
+    path = snapshot_path(date)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    with _snapshot_lock:
+        hit = _snapshot_cache.get(path)
+    if hit is not None and hit[0] == mtime:
+        return hit[1]
+
+    # Only empty cells are missing; keeps tickers such as "NA" from parsing as NaN
+    df = pd.read_csv(
+        path,
+        index_col="ticker",
+        dtype={"ticker": str},
+        keep_default_na=False,
+        na_values={col: [""] for col in METRIC_COLUMNS + TEXT_COLUMNS},
+        float_precision="round_trip",
+    )
+    for col in METRIC_COLUMNS:
+        df[col] = df[col].astype(float)
+    with _snapshot_lock:
+        _snapshot_cache[path] = (mtime, df)
+    return df
+
+
+def get_snapshot(
+    tickers: Iterable[str], date: str | None = None, source: DataSource | None = None
+) -> pd.DataFrame:
+    """Returns today's (or ``date``'s) snapshot covering ``tickers``.
+
+    Tickers missing from the cached snapshot are fetched and merged in, and the
+    cache file is updated.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    cached = load_snapshot(date)
+    missing = tickers if cached is None else [t for t in tickers if t not in cached.index]
+    if missing:
+        fresh = build_snapshot(missing, source=source)
+        cached = fresh if cached is None else pd.concat([cached, fresh])
+        save_snapshot(cached, date)
+        invalidate_sector_percentiles(date)
+    return cached.loc[tickers]
+
+
+def _frame(rows: List[Dict[str, Any]], tickers: List[str]) -> pd.DataFrame:
+    df = pd.DataFrame(rows, index=pd.Index(tickers, name="ticker"), columns=METRIC_COLUMNS + TEXT_COLUMNS)
+    for col in METRIC_COLUMNS:
+        df[col] = df[col].astype(float)
+    return df
+
+
+def metrics_row(snapshot: pd.DataFrame, ticker: str) -> Dict[str, Optional[float]]:
+    """Returns one ticker's metrics as a dict with None for missing values."""
+    row = snapshot.loc[ticker, METRIC_COLUMNS]
+    return {col: (None if pd.isna(v) else float(v)) for col, v in row.items()}
+
+
+def _safe_float(x: Any) -> Optional[float]:
+    try:
+        return float(x) if x is not None else None
+    except Exception:
+        return None
+
+
+def _safe_div(a: Optional[float], b: Optional[float]) -> Optional[float]:
+    try:
+        if a is None or b is None or b == 0:
+            return None
+        return float(a) / float(b)
+    except Exception:
+        return None
+
+
+
+# ---------------------------------------------------------------------------
+# Sector/peer percentiles
+# ---------------------------------------------------------------------------
+
+# Sectors with fewer members than this are ranked against the whole universe
+MIN_PEERS = 5
+
+# Percentile tables kept in memory (LRU); explicit snapshots add one entry each
+PERCENTILE_CACHE_SIZE = 8
+
+_percentile_cache: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()  # (date, snapshot fingerprint or None)
+_percentile_lock = threading.Lock()
+
+
+def sector_percentiles(snapshot: pd.DataFrame, min_peers: int = MIN_PEERS) -> pd.DataFrame:
+    """Percentile rank (0-1] of every metric within each ticker's sector.
+
+    Uses pandas' sort-based grouped ranking in one pass over the table; ties get
+    their average rank and missing values stay NaN. Tickers whose sector has
+    fewer than ``min_peers`` members (or no sector) are ranked universe-wide.
+
+    Returns:
+        DataFrame indexed by ticker with METRIC_COLUMNS plus ``sector`` and
+        ``peer_count`` (the size of the group each ticker was ranked in).
+    """
+    metrics = snapshot[METRIC_COLUMNS]
+    sector = snapshot["sector"].fillna("Unknown").astype(str)
+    by_sector = metrics.groupby(sector, sort=False)
+    pct = by_sector.rank(pct=True, method="average")
+    counts = sector.map(sector.value_counts())
+    small = (counts < min_peers) | (sector == "Unknown")
+    if small.any():
+        pct.loc[small] = metrics.rank(pct=True, method="average").loc[small]
+    pct["sector"] = sector.where(~small, "Universe")
+    pct["peer_count"] = counts.where(~small, len(snapshot)).astype(int)
+    return pct
+
+
+def get_sector_percentiles(date: str | None = None, snapshot: pd.DataFrame | None = None) -> pd.DataFrame | None:
+    """Returns the (cached) sector percentiles for the snapshot of ``date``.
+
+    Percentiles of the stored snapshot are computed once per date, kept in
+    memory and written next to it as ``fundamentals_<date>_peers.csv`` so a
+    single-ticker request is a row lookup. An explicit ``snapshot`` is ranked
+    on its own: cached in memory under a fingerprint of its contents, never
+    in place of (or on disk as) the date's stored percentiles.
+    """
+    date = date or datetime.now().strftime("%Y%m%d")
+    if snapshot is not None:
+        key = (date, _fingerprint(snapshot))
+        cached = _cached_percentiles(key)
+        if cached is None:
+            cached = sector_percentiles(snapshot)
+            _cache_percentiles(key, cached)
+        return cached
+
+    cached = _cached_percentiles((date, None))
+    if cached is not None:
+        return cached
+
+    path = _percentiles_path(date)
+    if os.path.exists(path):
+        pct = pd.read_csv(
+            path,
+            index_col="ticker",
+            dtype={"ticker": str, "sector": str},
+            keep_default_na=False,
+            na_values={col: [""] for col in METRIC_COLUMNS},
+            float_precision="round_trip",
+        )
+    else:
+        snapshot = load_snapshot(date)
+        if snapshot is None:
+            return None
+        pct = sector_percentiles(snapshot)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp{os.getpid()}"
+        pct.to_csv(tmp, index_label="ticker")
+        os.replace(tmp, path)
+
+    _cache_percentiles((date, None), pct)
+    return pct
+
+
+def invalidate_sector_percentiles(date: str | None = None) -> None:
+    """Drops cached percentiles for ``date`` (call when its snapshot changes)."""
+    date = date or datetime.now().strftime("%Y%m%d")
+    with _percentile_lock:
+        for key in [k for k in _percentile_cache if k[0] == date]:
+            del _percentile_cache[key]
+    try:
+        os.remove(_percentiles_path(date))
+    except FileNotFoundError:
+        pass
+
+
+def _cached_percentiles(key: tuple) -> pd.DataFrame | None:
+    with _percentile_lock:
+        pct = _percentile_cache.get(key)
+        if pct is not None:
+            _percentile_cache.move_to_end(key)
+        return pct
+
+
+def _cache_percentiles(key: tuple, pct: pd.DataFrame) -> None:
+    with _percentile_lock:
+        _percentile_cache[key] = pct
+        _percentile_cache.move_to_end(key)
+        while len(_percentile_cache) > PERCENTILE_CACHE_SIZE:
+            _percentile_cache.popitem(last=False)
+
+
+def _fingerprint(snapshot: pd.DataFrame) -> int:
+    # Content hash of the columns the ranking reads (index included)
+    columns = [c for c in METRIC_COLUMNS + ["sector"] if c in snapshot.columns]
+    return int(pd.util.hash_pandas_object(snapshot[columns], index=True).sum())
+
+
+def _percentiles_path(date: str) -> str:
+    return os.path.join(SNAPSHOT_DIR, f"fundamentals_{date}_peers.csv")
@@ -0,0 +1,250 @@
+"""Persistent, incremental news store.
+
+Headlines are kept in SQLite (``data_hist/news.db`` by default) with a dedup
+index on a hash of each item's link (or normalized title), plus a per-ticker
+high-water mark of the newest publish time seen. A poll therefore only hashes
+and inserts items newer than the mark, and readers (``NewsOrchestrator``,
+``NewsIndicator``) query the store instead of refetching the feed.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import config
+from data.sources import DataSource, get_data_source
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS news (
+    ticker TEXT NOT NULL,
+    item_hash TEXT NOT NULL,
+    title TEXT,
+    link TEXT,
+    publisher TEXT,
+    published REAL,
+    ingested REAL NOT NULL,
+    raw TEXT,
+    PRIMARY KEY (ticker, item_hash)
+);
+CREATE INDEX IF NOT EXISTS news_ticker_published ON news (ticker, published DESC);
+CREATE TABLE IF NOT EXISTS watermarks (
+    ticker TEXT PRIMARY KEY,
+    high_water REAL,
+    last_poll REAL
+);
+"""
+
+
+class NewsStore:
+    """SQLite-backed news store with dedup and per-ticker high-water marks."""
+
+    def __init__(self, path: str | None = None):
+        self.path = path or config.NEWS_DB_PATH
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def ingest(self, ticker: str, items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Stores unseen items for ``ticker`` and returns only the new ones.
+
+        Items published at or before the ticker's high-water mark are skipped
+        without touching the dedup index; the rest are deduped by hash.
+        """
+        now = time.time()
+        with self._lock:
+            hwm = self._high_water(ticker)
+            candidates: Dict[str, Dict[str, Any]] = {}
+            for it in items or []:
+                if not it:
+                    continue
+                ts = pub_ts(it)
+                if hwm is not None and ts is not None and ts <= hwm:
+                    continue
+                candidates.setdefault(item_hash(it), it)
+
+            new_items: List[Dict[str, Any]] = []
+            if candidates:
+                hashes = list(candidates)
+                seen = set()
+                for chunk in _chunks(hashes, 500):
+                    rows = self._conn.execute(
+                        f"SELECT item_hash FROM news WHERE ticker = ? AND item_hash IN ({','.join('?' * len(chunk))})",
+                        [ticker, *chunk],
+                    ).fetchall()
+                    seen.update(r[0] for r in rows)
+                rows = []
+                for h in hashes:
+                    if h in seen:
+                        continue
+                    it = candidates[h]
+                    new_items.append(it)
+                    rows.append((
+                        ticker,
+                        h,
+                        it.get("title"),
+                        it.get("link"),
+                        it.get("publisher") or it.get("source"),
+                        pub_ts(it),
+                        now,
+                        json.dumps(it, default=str),
+                    ))
+                self._conn.executemany("INSERT OR IGNORE INTO news VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+            stamps = [t for t in (pub_ts(it) for it in new_items) if t is not None]
+            new_hwm = max([hwm or float("-inf"), *stamps]) if stamps else hwm
+            self._conn.execute(
+                "INSERT INTO watermarks (ticker, high_water, last_poll) VALUES (?, ?, ?) "
+                "ON CONFLICT(ticker) DO UPDATE SET high_water = excluded.high_water, last_poll = excluded.last_poll",
+                (ticker, new_hwm, now),
+            )
+            self._conn.commit()
+        return new_items
+
+    def poll(
+        self, ticker: str, source: DataSource | None = None, min_interval: float | None = None
+    ) -> List[Dict[str, Any]]:
+        """Fetches the feed for ``ticker`` and ingests it; returns new items.
+
+        Args:
+            ticker: Ticker to poll.
+            source: Data source; defaults to the configured one.
+            min_interval: Skip the fetch if the ticker was polled less than this
+                many seconds ago (defaults to ``config.NEWS_POLL_INTERVAL``).
+        """
+        interval = config.NEWS_POLL_INTERVAL if min_interval is None else min_interval
+        last = self.last_poll(ticker)
+        if last is not None and interval > 0 and time.time() - last < interval:
+            return []
+        try:
+            items = (source or get_data_source()).news(ticker) or []
+        except Exception:
+            items = []
+        return self.ingest(ticker, items)
+
+    def poll_many(
+        self, tickers: Iterable[str], source: DataSource | None = None, min_interval: float | None = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Polls many tickers concurrently on the shared I/O pool."""
+        from core.execution import get_pool
+
+        pool = get_pool("io")
+        tickers = list(dict.fromkeys(tickers))
+        futures = {t: pool.submit(self.poll, t, source, min_interval) for t in tickers}
+        out: Dict[str, List[Dict[str, Any]]] = {}
+        for t, f in futures.items():
+            try:
+                out[t] = f.result()
+            except Exception:
+                out[t] = []
+        return out
+
+    def recent(self, ticker: str, days: float | None = None, limit: int | None = None) -> List[Dict[str, Any]]:
+        """Returns stored items for ``ticker``, newest first.
+
+        Args:
+            days: Only items published within this many days (undated items excluded).
+            limit: Maximum number of items.
+        """
+        sql = "SELECT raw FROM news WHERE ticker = ?"
+        args: List[Any] = [ticker]
+        if days is not None:
+            sql += " AND published >= ?"
+            args.append(datetime.now(timezone.utc).timestamp() - days * 86400)
+        sql += " ORDER BY published IS NULL, published DESC, ingested DESC"
+        if limit:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def last_poll(self, ticker: str) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute("SELECT last_poll FROM watermarks WHERE ticker = ?", (ticker,)).fetchone()
+        return row[0] if row else None
+
+    def high_water(self, ticker: str) -> Optional[float]:
+        with self._lock:
+            return self._high_water(ticker)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _high_water(self, ticker: str) -> Optional[float]:
+        row = self._conn.execute("SELECT high_water FROM watermarks WHERE ticker = ?", (ticker,)).fetchone()
+        return row[0] if row else None
+
+
+def run_poller(
+    tickers: Iterable[str],
+    interval: float = 60.0,
+    iterations: int | None = None,
+    store: NewsStore | None = None,
+) -> None:
+    """Polls ``tickers`` every ``interval`` seconds (forever unless ``iterations`` is set)."""
+    store = store or get_news_store()
+    tickers = list(tickers)
+    n = 0
+    while iterations is None or n < iterations:
+        started = time.monotonic()
+        new = store.poll_many(tickers, min_interval=0)
+        total = sum(len(v) for v in new.values())
+        print(f"Polled {len(tickers)} tickers: {total} new items in {time.monotonic() - started:.2f}s")
+        n += 1
+        if iterations is None or n < iterations:
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+
+def item_hash(item: Dict[str, Any]) -> str:
+    """Dedup key: hash of the link, or of the normalized title when there is no link."""
+    key = (item.get("link") or "").strip() or " ".join(str(item.get("title") or "").lower().split())
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+_store: NewsStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_news_store() -> NewsStore:
+    """Returns the process-wide news store, opening it on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = NewsStore()
+    return _store
+
+
+def pub_ts(n: dict | None) -> float | None:
+    """Publish time of a news item as epoch seconds (None if the feed gave none)."""
+    if not n:
+        return None
+    # yfinance typically provides providerPublishTime (seconds epoch)
+    ts = n.get("providerPublishTime") or n.get("published_at") or n.get("time_published")
+    try:
+        if isinstance(ts, (int, float)):
+            return float(ts)
+        # some feeds use string epoch
+        if isinstance(ts, str) and ts.isdigit():
+            return float(ts)
+    except Exception:
+        return None
+    return None
+
+
+def _chunks(seq: List[str], size: int):
+    for i in range(0, len(seq), size):
+        yield seq[i:i + size]
@@ -0,0 +1,225 @@
+"""Columnar on-disk price store with lazy, tail-only and chunked reads.
+
+Each ticker is a directory of ``.npy`` arrays (one per column plus the
+int64 nanosecond index) under ``PRICE_STORE_DIR``. Arrays are opened with
+``np.load(mmap_mode="r")``, so reading the last ``n`` rows touches only
+those pages no matter how many years are stored. ``LazyPrices`` is what
+indicators receive instead of a full DataFrame: ``IndicatorWorker`` asks the
+indicator for its ``lookback`` and materializes just ``tail(lookback)``.
+``iter_chunks`` walks a whole history as ``lookback + rows`` windows for
+series computations.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Iterator, List, Sequence
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+import config
+from data.sources import parse_history_index
+
+_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def _wall_time(index: pd.Index) -> pd.DatetimeIndex:
+    """Naive exchange wall time (session dates), as ``data/bars.py`` keeps bars."""
+    if not isinstance(index, pd.DatetimeIndex):
+        index = parse_history_index(index)
+    if index.tz is not None:
+        index = index.tz_convert(config.MARKET_TIMEZONE).tz_localize(None)
+    return index
+
+
+class LazyPrices:
+    """A ticker's stored history; rows are only read when ``tail``/``window`` is called."""
+
+    def __init__(self, store: "PriceStore", ticker: str):
+        self.store = store
+        self.ticker = ticker
+        self._prefetched: pd.DataFrame | None = None
+
+    def __len__(self) -> int:
+        return self.store.rows(self.ticker)
+
+    def prefetch(self, n: int | None) -> "LazyPrices":
+        """Reads the last ``n`` rows once so several indicators can share them."""
+        self._prefetched = self.tail(n)
+        return self
+
+    def tail(self, n: int | None = None) -> pd.DataFrame:
+        """Materializes the last ``n`` rows (all rows when ``n`` is None)."""
+        total = len(self)
+        cached = self._prefetched
+        if cached is not None:
+            if n is None and len(cached) == total:
+                return cached
+            if n is not None and int(n) <= len(cached):
+                return cached.iloc[len(cached) - int(n):]
+        start = 0 if n is None else max(0, total - int(n))
+        return self.store.read(self.ticker, start, total)
+
+    def window(self, start: int, stop: int) -> pd.DataFrame:
+        return self.store.read(self.ticker, start, stop)
+
+
+class PriceStore:
+    """Per-ticker columnar arrays with memory-mapped range reads."""
+
+    def __init__(self, root: str | None = None, columns: Sequence[str] = _COLUMNS):
+        self.root = root or config.PRICE_STORE_DIR
+        self.columns = list(columns)
+        self._lock = threading.Lock()
+        self._meta: Dict[str, dict] = {}
+
+    def write(self, ticker: str, frame: pd.DataFrame) -> None:
+        """Replaces the ticker's stored history with ``frame`` (sorted by index)."""
+        frame = frame.set_axis(_wall_time(frame.index)).sort_index()
+        index = frame.index
+        target = self._dir(ticker)
+        os.makedirs(self.root, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=self.root, prefix=f".{ticker}.")
+        try:
+            np.save(os.path.join(tmp, "index.npy"), index.as_unit("ns").asi8)
+            columns = [c for c in self.columns if c in frame.columns]
+            for col in columns:
+                np.save(os.path.join(tmp, f"{col}.npy"), frame[col].to_numpy(dtype=float))
+            with open(os.path.join(tmp, "meta.json"), "w") as f:
+                json.dump({"rows": len(frame), "columns": columns}, f)
+            # Move the old directory aside before swapping the new one in, so there is
+            # always a complete copy on disk; ``has`` puts an aside copy back after a crash
+            aside = self._aside(ticker)
+            with self._lock:
+                if os.path.exists(aside):
+                    if os.path.exists(target):
+                        shutil.rmtree(aside)
+                    else:
+                        os.replace(aside, target)
+                if os.path.exists(target):
+                    os.replace(target, aside)
+                os.replace(tmp, target)
+                self._meta.pop(ticker, None)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)  # a partial write leaves nothing behind
+            raise
+        shutil.rmtree(aside, ignore_errors=True)
+
+    def append(self, ticker: str, frame: pd.DataFrame) -> int:
+        """Adds rows newer than the stored ones; returns how many were added."""
+        if not self.has(ticker):
+            self.write(ticker, frame)
+            return len(frame)
+        last = self._array(ticker, "index")[-1]
+        frame = frame.set_axis(_wall_time(frame.index))
+        new = frame[frame.index.as_unit("ns").asi8 > last]
+        if new.empty:
+            return 0
+        self.write(ticker, pd.concat([self.read(ticker), new]))
+        return len(new)
+
+    def has(self, ticker: str) -> bool:
+        if os.path.exists(os.path.join(self._dir(ticker), "meta.json")):
+            return True
+        aside = self._aside(ticker)
+        if not os.path.exists(os.path.join(aside, "meta.json")):
+            return False
+        # A write crashed between its two renames: restore the previous copy
+        with self._lock:
+            if not os.path.exists(self._dir(ticker)) and os.path.exists(aside):
+                os.replace(aside, self._dir(ticker))
+        return os.path.exists(os.path.join(self._dir(ticker), "meta.json"))
+
+    def tickers(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        names = set()
+        for d in os.listdir(self.root):
+            if not d.startswith("."):
+                names.add(d)
+            elif d.endswith(".old"):
+                names.add(d[1:-len(".old")])  # only an aside copy left (crashed write)
+        return sorted(n for n in names if self.has(n))
+
+    def rows(self, ticker: str) -> int:
+        return int(self._load_meta(ticker)["rows"])
+
+    def lazy(self, ticker: str) -> LazyPrices:
+        if not self.has(ticker):
+            raise FileNotFoundError(f"No stored prices for {ticker} under {self.root}")
+        return LazyPrices(self, ticker)
+
+    def read(self, ticker: str, start: int = 0, stop: int | None = None) -> pd.DataFrame:
+        """Rows ``[start, stop)`` as a DataFrame (copied out of the memory maps)."""
+        meta = self._load_meta(ticker)
+        stop = meta["rows"] if stop is None else min(stop, meta["rows"])
+        start = max(0, start)
+        index = pd.DatetimeIndex(np.array(self._array(ticker, "index")[start:stop]).view("datetime64[ns]"), name="Date")
+        data = {col: np.array(self._array(ticker, col)[start:stop]) for col in meta["columns"]}
+        return pd.DataFrame(data, index=index)
+
+    def iter_chunks(self, ticker: str, rows: int, lookback: int = 0) -> Iterator[pd.DataFrame]:
+        """Yields ``lookback + rows``-row windows covering the whole history.
+
+        Each window's first ``frame.attrs["context_rows"]`` rows are lookback
+        context that was already covered by the previous chunk.
+        """
+        total = self.rows(ticker)
+        for start in range(0, total, max(1, rows)):
+            lo = max(0, start - lookback)
+            frame = self.read(ticker, lo, start + rows)
+            frame.attrs["context_rows"] = start - lo
+            yield frame
+
+    def ingest(self, tickers: Iterable[str], period: str = "max", source=None) -> int:
+        """Copies history from the data source into the store; returns tickers written."""
+        from data.sources import get_data_source
+
+        source = source or get_data_source()
+        n = 0
+        for ticker in tickers:
+            try:
+                self.write(ticker, source.history(ticker, period))
+                n += 1
+            except Exception as exc:
+                print(f"Could not ingest {ticker}: {exc}")
+        return n
+
+    def _dir(self, ticker: str) -> str:
+        return os.path.join(self.root, ticker)
+
+    def _aside(self, ticker: str) -> str:
+        return os.path.join(self.root, f".{ticker}.old")
+
+    def _load_meta(self, ticker: str) -> dict:
+        # Under the lock so a concurrent write cannot be overwritten with stale metadata
+        with self._lock:
+            meta = self._meta.get(ticker)
+            if meta is None:
+                with open(os.path.join(self._dir(ticker), "meta.json"), "r") as f:
+                    meta = json.load(f)
+                self._meta[ticker] = meta
+            return meta
+
+    def _array(self, ticker: str, name: str) -> np.ndarray:
+        # Opened per read so no file handles or mappings outlive the call
+        return np.load(os.path.join(self._dir(ticker), f"{name}.npy"), mmap_mode="r")
+
+
+_store: PriceStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_price_store() -> PriceStore:
+    """Returns the process-wide price store."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = PriceStore()
+    return _store
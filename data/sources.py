@@ -0,0 +1,328 @@
+"""Pluggable market-data sources: yfinance, recorded-fixture replay and synthetic.
+
+Every consumer of price history, fundamentals (``.info``) or news goes through
+``get_data_source()`` so the pipeline can be pointed at Yahoo, at fixtures
+recorded from a previous run (offline), or at a deterministic generator for
+load tests.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+import json
+import os
+import re
+import threading
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+import config
+
+
+class DataSource(ABC):
+    """Abstract provider of price history, fundamentals and news for a ticker."""
+
+    # Whether get_stock_data should persist fetched history to the CSV cache.
+    cacheable: bool = False
+
+    @abstractmethod
+    def history(self, ticker: str, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+        """Returns OHLCV bars of ``interval`` (daily by default) for the ticker over the period."""
+        pass
+
+    @abstractmethod
+    def info(self, ticker: str) -> Dict[str, Any]:
+        """Returns a yfinance-style ``.info`` mapping (may be empty)."""
+        pass
+
+    @abstractmethod
+    def news(self, ticker: str) -> List[Dict[str, Any]]:
+        """Returns a yfinance-style list of news items (may be empty)."""
+        pass
+
+
+class YFinanceSource(DataSource):
+    """Live data from Yahoo Finance via yfinance."""
+
+    cacheable = True
+
+    def history(self, ticker: str, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+        import yfinance as yf
+
+        return yf.Ticker(ticker).history(period=period, interval=interval)
+
+    def info(self, ticker: str) -> Dict[str, Any]:
+        import yfinance as yf
+
+        try:
+            return getattr(yf.Ticker(ticker), "info", {}) or {}
+        except Exception:
+            return {}
+
+    def news(self, ticker: str) -> List[Dict[str, Any]]:
+        import yfinance as yf
+
+        try:
+            return yf.Ticker(ticker).news or []
+        except Exception:
+            return []
+
+
+class ReplaySource(DataSource):
+    """Serves recorded fixtures from a directory; never touches the network.
+
+    Layout (compatible with the ``data_hist/`` price cache):
+        ``<root>/<TICKER>_<period>.csv`` (daily), ``<root>/<TICKER>_<period>_<interval>.csv``
+        (intraday), ``<root>/<TICKER>_info.json``, ``<root>/<TICKER>_news.json``
+    """
+
+    def __init__(self, root: str = "data_hist"):
+        self.root = root
+
+    def history(self, ticker: str, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+        path = os.path.join(self.root, history_filename(ticker, period, interval))
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No recorded history for {ticker} ({period}, {interval}) at {path}")
+        return read_history_csv(path)
+
+    def info(self, ticker: str) -> Dict[str, Any]:
+        return self._read_json(f"{ticker}_info.json", {})
+
+    def news(self, ticker: str) -> List[Dict[str, Any]]:
+        return self._read_json(f"{ticker}_news.json", [])
+
+    def _read_json(self, name: str, default):
+        path = os.path.join(self.root, name)
+        if not os.path.exists(path):
+            return default
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except Exception:
+            return default
+
+
+class RecordingSource(DataSource):
+    """Wraps another source and writes every response as a replay fixture."""
+
+    def __init__(self, inner: DataSource, root: str = "data_hist"):
+        self.inner = inner
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def history(self, ticker: str, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+        hist = self.inner.history(ticker, period, interval)
+        hist.to_csv(os.path.join(self.root, history_filename(ticker, period, interval)))
+        return hist
+
+    def info(self, ticker: str) -> Dict[str, Any]:
+        info = self.inner.info(ticker)
+        self._write_json(f"{ticker}_info.json", info)
+        return info
+
+    def news(self, ticker: str) -> List[Dict[str, Any]]:
+        items = self.inner.news(ticker)
+        self._write_json(f"{ticker}_news.json", items)
+        return items
+
+    def _write_json(self, name: str, payload) -> None:
+        with open(os.path.join(self.root, name), "w") as f:
+            json.dump(payload, f, default=str)
+
+
+class SyntheticSource(DataSource):
+    """Deterministic generator for any ticker, any history length.
+
+    Each ticker gets its own RNG stream derived from ``seed`` and the ticker
+    symbol, so repeated runs produce identical data. ``latency`` (seconds) is
+    slept on every call to emulate a remote provider in throughput tests.
+    """
+
+    _NEWS_TEMPLATES = [
+        "{name} beats estimates as revenue growth accelerates",
+        "{name} shares fall after analyst downgrade",
+        "{name} announces record quarterly deliveries",
+        "Regulators open probe into {name} accounting",
+        "{name} upgrade: analysts see strong demand ahead",
+        "{name} cuts guidance amid weak consumer spending",
+        "{name} unveils new product line at annual event",
+        "{name} faces lawsuit over patent dispute",
+    ]
+    _SECTORS = ["Technology", "Healthcare", "Financial Services", "Energy", "Consumer Cyclical", "Industrials"]
+
+    def __init__(self, seed: int = 0, latency: float = 0.0, years: float | None = None):
+        self.seed = seed
+        self.latency = latency
+        self.years = years
+
+    @staticmethod
+    def universe(n: int, prefix: str = "SYN") -> List[str]:
+        """Returns ``n`` synthetic ticker symbols, e.g. ``SYN0000``..."""
+        width = max(4, len(str(max(n - 1, 0))))
+        return [f"{prefix}{i:0{width}d}" for i in range(n)]
+
+    def history(self, ticker: str, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+        self._sleep()
+        rng = self._rng(ticker, "history")
+        years = self.years if self.years is not None else _period_years(period)
+        days = max(2, int(round(years * 252)))
+        index = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=days, name="Date")
+
+        start = rng.uniform(10, 500)
+        drift = rng.normal(0.0003, 0.0004)
+        vol = rng.uniform(0.01, 0.035)
+        if interval != "1d":
+            # Regular-session bars (09:30-16:00) with per-bar drift/vol scaled from the daily ones
+            step = pd.Timedelta(interval.replace("m", "min"))
+            per_day = max(1, int(pd.Timedelta(hours=6.5) / step))
+            offsets = pd.Timedelta(hours=9, minutes=30) + pd.to_timedelta(np.arange(per_day) * step.value)
+            index = pd.DatetimeIndex((index.values[:, None] + offsets.values[None, :]).ravel(), name="Datetime")
+            drift, vol = drift / per_day, vol / np.sqrt(per_day)
+        n = len(index)
+        log_ret = rng.normal(drift, vol, n)
+        close = start * np.exp(np.cumsum(log_ret))
+        open_ = np.concatenate(([start], close[:-1])) * (1 + rng.normal(0, vol / 4, n))
+        spread = np.abs(rng.normal(0, vol, n)) * close
+        high = np.maximum(open_, close) + spread
+        low = np.maximum(np.minimum(open_, close) - spread, 0.01)
+        volume = rng.lognormal(mean=15 - np.log(n / days), sigma=0.5, size=n).astype(np.int64)
+
+        return pd.DataFrame(
+            {
+                "Open": open_,
+                "High": high,
+                "Low": low,
+                "Close": close,
+                "Volume": volume,
+                "Dividends": 0.0,
+                "Stock Splits": 0.0,
+            },
+            index=index,
+        )
+
+    def info(self, ticker: str) -> Dict[str, Any]:
+        self._sleep()
+        rng = self._rng(ticker, "info")
+        market_cap = float(rng.lognormal(mean=23, sigma=1.5))
+        return {
+            "shortName": f"{ticker} Synthetic Corp",
+            "sector": self._SECTORS[int(rng.integers(len(self._SECTORS)))],
+            "trailingPE": float(rng.uniform(5, 60)),
+            "forwardPE": float(rng.uniform(5, 50)),
+            "priceToBook": float(rng.uniform(0.5, 12)),
+            "priceToSalesTrailing12Months": float(rng.uniform(0.5, 15)),
+            "dividendYield": float(rng.uniform(0, 0.05)),
+            "profitMargins": float(rng.uniform(-0.1, 0.35)),
+            "operatingMargins": float(rng.uniform(-0.1, 0.4)),
+            "returnOnEquity": float(rng.uniform(-0.1, 0.4)),
+            "revenueGrowth": float(rng.uniform(-0.15, 0.4)),
+            "debtToEquity": float(rng.uniform(0, 300)),
+            "currentRatio": float(rng.uniform(0.5, 3.5)),
+            "quickRatio": float(rng.uniform(0.3, 3.0)),
+            "marketCap": market_cap,
+            "freeCashflow": float(market_cap * rng.uniform(-0.03, 0.12)),
+        }
+
+    def news(self, ticker: str) -> List[Dict[str, Any]]:
+        self._sleep()
+        rng = self._rng(ticker, "news")
+        now = datetime.now(timezone.utc).timestamp()
+        items = []
+        for i in range(int(rng.integers(3, 10))):
+            title = self._NEWS_TEMPLATES[int(rng.integers(len(self._NEWS_TEMPLATES)))].format(name=ticker)
+            items.append(
+                {
+                    "title": title,
+                    "link": f"https://example.invalid/{ticker.lower()}/{i}",
+                    "publisher": "Synthetic Wire",
+                    "providerPublishTime": int(now - float(rng.uniform(0, 10 * 86400))),
+                }
+            )
+        items.sort(key=lambda n: n["providerPublishTime"], reverse=True)
+        return items
+
+    def _rng(self, ticker: str, stream: str) -> np.random.Generator:
+        return np.random.default_rng([self.seed, zlib.crc32(f"{ticker}:{stream}".encode())])
+
+    def _sleep(self) -> None:
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+
+_source: DataSource | None = None
+_source_lock = threading.Lock()
+
+
+def get_data_source() -> DataSource:
+    """Returns the process-wide data source, building it from config on first use."""
+    global _source
+    if _source is None:
+        with _source_lock:
+            if _source is None:
+                _source = make_data_source(config.DATA_SOURCE)
+    return _source
+
+
+def set_data_source(source: DataSource | str) -> DataSource:
+    """Overrides the process-wide data source (instance or backend name)."""
+    global _source
+    with _source_lock:
+        _source = make_data_source(source) if isinstance(source, str) else source
+    return _source
+
+
+def make_data_source(name: str) -> DataSource:
+    """Builds a data source by backend name: yfinance, replay, record or synthetic."""
+    name_low = (name or "yfinance").lower()
+    if name_low == "yfinance":
+        return YFinanceSource()
+    if name_low == "replay":
+        return ReplaySource(config.DATA_REPLAY_DIR)
+    if name_low == "record":
+        return RecordingSource(YFinanceSource(), config.DATA_REPLAY_DIR)
+    if name_low == "synthetic":
+        return SyntheticSource(seed=config.SYNTHETIC_SEED, latency=config.SYNTHETIC_LATENCY)
+    raise ValueError(f"Unknown data source: {name}")
+
+
+def read_history_csv(path: str) -> pd.DataFrame:
+    """Reads a cached/recorded price CSV with a ``DatetimeIndex``, like a live history.
+
+    yfinance writes offsets that change across DST (``-04:00`` / ``-05:00``), which
+    ``parse_dates`` leaves as strings; those are restored to exchange-local time.
+    """
+    frame = pd.read_csv(path, index_col=0)
+    frame.index = parse_history_index(frame.index)
+    return frame
+
+
+def parse_history_index(index: pd.Index) -> pd.DatetimeIndex:
+    """Parses ISO 8601 timestamps; offset-bearing ones become exchange-local (``MARKET_TIMEZONE``)."""
+    parsed = pd.to_datetime(index, utc=True, format="ISO8601")
+    if index.astype(str).str.contains(r"[+-]\d\d:\d\d$").any():
+        # Offsets change across DST, so restore exchange-local wall time
+        parsed = parsed.tz_convert(config.MARKET_TIMEZONE)
+    else:
+        parsed = parsed.tz_localize(None)
+    return parsed.rename(index.name)
+
+
+def history_filename(ticker: str, period: str, interval: str = "1d") -> str:
+    """Cache/fixture file name for a price series; daily keeps the historical name."""
+    if interval == "1d":
+        return f"{ticker}_{period}.csv"
+    return f"{ticker}_{period}_{interval}.csv"
+
+
+def _period_years(period: str) -> float:
+    m = re.fullmatch(r"(\d+)(d|wk|mo|y)", (period or "1y").strip().lower())
+    if not m:
+        # "max", "ytd" and friends: pick a generous default
+        return 10.0 if period == "max" else 1.0
+    n, unit = int(m.group(1)), m.group(2)
+    return {"d": n / 252, "wk": n * 5 / 252, "mo": n / 12, "y": float(n)}[unit]
@@ -0,0 +1,64 @@
+"""Average Directional Index indicator."""
+
+from .atr import true_range
+from .base_indicator import BaseIndicator, wilder, wilder_lookback
+import numpy as np
+import pandas as pd
+
+
+def adx(
+    high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14
+) -> tuple[pd.Series, pd.Series, pd.Series]:
+    """ADX with the +DI and -DI lines (Wilder smoothing throughout)."""
+    up = high.diff()
+    down = -low.diff()
+    plus_dm = pd.Series(np.where((up > down) & (up > 0), up, 0.0), index=close.index)
+    minus_dm = pd.Series(np.where((down > up) & (down > 0), down, 0.0), index=close.index)
+    tr = wilder(true_range(high, low, close), period)
+    plus_di = 100.0 * wilder(plus_dm, period) / tr
+    minus_di = 100.0 * wilder(minus_dm, period) / tr
+    di_sum = (plus_di + minus_di).replace(0.0, np.nan)
+    dx = (100.0 * (plus_di - minus_di).abs() / di_sum).fillna(0.0)
+    return wilder(dx, period), plus_di, minus_di
+
+
+class ADXIndicator(BaseIndicator):
+    """Measures trend strength (ADX) and direction (+DI vs -DI)."""
+
+    @classmethod
+    def lookback(cls, params: dict | None = None) -> int:
+        # DI lines and the ADX smoothing of DX both need their own warm-up
+        return 2 * wilder_lookback(int((params or {}).get("period", 14))) + 1
+
+    @classmethod
+    def levels(cls, params: dict | None = None) -> dict:
+        return {"adx": (float((params or {}).get("strong", 25)),)}
+
+    def calculate(self, stock_data: pd.DataFrame, params: dict | None = None) -> dict:
+        p = params or {}
+        period = int(p.get("period", 14))
+        strong = float(p.get("strong", 25))
+
+        adx_line, plus_di, minus_di = adx(
+            stock_data["High"].astype(float),
+            stock_data["Low"].astype(float),
+            stock_data["Close"].astype(float),
+            period,
+        )
+        adx_value = float(adx_line.iloc[-1])
+        plus_value = float(plus_di.iloc[-1])
+        minus_value = float(minus_di.iloc[-1])
+
+        if adx_value < strong:
+            signal = "Weak trend"
+        elif plus_value > minus_value:
+            signal = "Strong uptrend"
+        else:
+            signal = "Strong downtrend"
+
+        return {
+            "indicator": "ADX",
+            "signal": signal,
+            "details": f"ADX(period={period}) is {adx_value:.2f} (+DI {plus_value:.2f}, -DI {minus_value:.2f}); strong above {strong}",
+            "meta": {"adx": adx_value, "plus_di": plus_value, "minus_di": minus_value},
+        }
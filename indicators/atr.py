@@ -0,0 +1,58 @@
+"""Average True Range indicator."""
+
+from .base_indicator import BaseIndicator, wilder, wilder_lookback
+import numpy as np
+import pandas as pd
+
+
+def true_range(high: pd.Series, low: pd.Series, close: pd.Series) -> pd.Series:
+    """Largest of high-low, |high - prev close| and |low - prev close| (first bar: high-low)."""
+    h, l, c = high.to_numpy(dtype=float), low.to_numpy(dtype=float), close.to_numpy(dtype=float)
+    prev_close = np.concatenate(([np.nan], c[:-1]))
+    # fmax ignores the NaN previous close of the first bar
+    tr = np.fmax(h - l, np.fmax(np.abs(h - prev_close), np.abs(l - prev_close)))
+    return pd.Series(tr, index=close.index)
+
+
+def atr(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
+    """Wilder-smoothed true range."""
+    return wilder(true_range(high, low, close), period)
+
+
+class ATRIndicator(BaseIndicator):
+    """Compares ATR with its recent average to flag expanding or contracting volatility."""
+
+    @classmethod
+    def lookback(cls, params: dict | None = None) -> int:
+        p = params or {}
+        return wilder_lookback(int(p.get("period", 14))) + int(p.get("baseline", 50))
+
+    def calculate(self, stock_data: pd.DataFrame, params: dict | None = None) -> dict:
+        p = params or {}
+        period = int(p.get("period", 14))
+        baseline = int(p.get("baseline", 50))
+        expanding = float(p.get("expanding", 1.25))
+        contracting = float(p.get("contracting", 0.8))
+
+        high = stock_data["High"].astype(float)
+        low = stock_data["Low"].astype(float)
+        close = stock_data["Close"].astype(float)
+        atr_line = atr(high, low, close, period)
+        atr_value = float(atr_line.iloc[-1])
+        atr_avg = float(atr_line.iloc[-baseline:].mean())
+        ratio = atr_value / atr_avg if atr_avg else float("nan")
+        atr_pct = 100.0 * atr_value / float(close.iloc[-1])
+
+        if ratio > expanding:
+            signal = "Expanding volatility"
+        elif ratio < contracting:
+            signal = "Contracting volatility"
+        else:
+            signal = "Stable volatility"
+
+        return {
+            "indicator": "ATR",
+            "signal": signal,
+            "details": f"ATR(period={period}) is {atr_value:.2f} ({atr_pct:.2f}% of price), {ratio:.2f}x its {baseline}-bar average",
+            "meta": {"atr": atr_value, "atr_pct": atr_pct, "ratio": ratio},
+        }
@@ -1,9 +1,59 @@
 from abc import ABC, abstractmethod
+import math
 import pandas as pd
 
+
+def ema_lookback(span: int, tol: float = 1e-6) -> int:
+    """Rows after which an EMA(span, adjust=False) has forgotten its seed to within ``tol``."""
+    alpha = 2.0 / (span + 1.0)
+    return int(math.ceil(math.log(tol) / math.log(1.0 - alpha))) + 1
+
+
+def wilder_lookback(period: int, tol: float = 1e-6) -> int:
+    """``ema_lookback`` for Wilder smoothing (alpha = 1/period, i.e. span = 2*period - 1)."""
+    return ema_lookback(2 * period - 1, tol)
+
+
+def wilder(series: pd.Series, period: int) -> pd.Series:
+    """Wilder's smoothing (RMA) as an EMA with alpha = 1/period."""
+    return series.ewm(alpha=1.0 / period, adjust=False).mean()
+
+
 class BaseIndicator(ABC):
     """Abstract base class for technical indicators."""
 
+    # Indicators that mostly wait on the network run on the shared I/O pool
+    io_bound: bool = False
+
+    # Seconds this indicator may run before the orchestrator gives up on it
+    # (None = the pool default, CPU_TASK_TIMEOUT / IO_TASK_TIMEOUT)
+    timeout: float | None = None
+
+    # Names of upstream indicators whose results ``calculate`` receives as ``inputs``
+    # (composites); plan items without explicit inputs are wired to these
+    requires: tuple = ()
+
+    # Whether the class rebuilds its ``calculate`` result from the latest values
+    # (its ``meta``) via a ``from_values(values, params)`` classmethod; only those
+    # indicators are served from precomputed values (``agents/signal_table.py``)
+    has_stored_values: bool = False
+
+    @classmethod
+    def lookback(cls, params: dict | None = None) -> int | None:
+        """Trailing rows needed to compute the latest value (None = the full history).
+
+        Lazy price windows (``data/price_store.py``) read only this many rows.
+        """
+        return None
+
+    @classmethod
+    def levels(cls, params: dict | None = None) -> dict:
+        """Levels per ``meta`` value whose crossing is a change worth reporting between runs.
+
+        Used by ``agents/deltas.py``; e.g. ``{"rsi": (30.0, 50.0, 70.0)}``.
+        """
+        return {}
+
     @abstractmethod
     def calculate(self, stock_data: pd.DataFrame, params: dict | None = None) -> dict:
         """Calculates the indicator and returns the result.
@@ -2,23 +2,44 @@ from .base_indicator import BaseIndicator
 import pandas as pd
 
 
+def bollinger_bands(close: pd.Series, window: int = 20, stddev: float = 2) -> tuple[pd.Series, pd.Series, pd.Series]:
+    """Middle (rolling mean), upper and lower bands (mean -/+ stddev sample deviations)."""
+    roll = close.rolling(window)
+    ma, sd = roll.mean(), roll.std()
+    return ma, ma + stddev * sd, ma - stddev * sd
+
+
 class BollingerBandsIndicator(BaseIndicator):
     """Calculates Bollinger Bands using rolling mean and stddev, honoring params."""
 
+    has_stored_values = True
+
+    @classmethod
+    def lookback(cls, params: dict | None = None) -> int:
+        return int((params or {}).get("window", 20))
+
     def calculate(self, stock_data: pd.DataFrame, params: dict | None = None) -> dict:
         p = params or {}
         window = int(p.get("window", 20))
         stddev = float(p.get("stddev", 2))
 
         close = stock_data["Close"].astype(float)
-        ma = close.rolling(window).mean()
-        sd = close.rolling(window).std()
-        upper_band = ma + stddev * sd
-        lower_band = ma - stddev * sd
+        ma, upper_band, lower_band = bollinger_bands(close, window, stddev)
+        return self.from_values({
+            "price": float(close.iloc[-1]),
+            "middle": float(ma.iloc[-1]),
+            "upper": float(upper_band.iloc[-1]),
+            "lower": float(lower_band.iloc[-1]),
+        }, params)
 
-        price = float(close.iloc[-1])
-        upper = float(upper_band.iloc[-1])
-        lower = float(lower_band.iloc[-1])
+    @classmethod
+    def from_values(cls, values: dict, params: dict | None = None) -> dict:
+        p = params or {}
+        window = int(p.get("window", 20))
+        stddev = float(p.get("stddev", 2))
+        price = float(values["price"])
+        upper = float(values["upper"])
+        lower = float(values["lower"])
 
         if price > upper:
             signal = "Price above upper band"
@@ -31,4 +52,5 @@ class BollingerBandsIndicator(BaseIndicator):
             "indicator": "Bollinger Bands",
             "signal": signal,
             "details": f"BB(window={window}, std={stddev}): price={price:.2f}, lower={lower:.2f}, upper={upper:.2f}",
+            "meta": {"price": price, "middle": float(values["middle"]), "upper": upper, "lower": lower},
         }
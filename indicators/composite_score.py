@@ -0,0 +1,80 @@
+"""Composite technical score built from upstream RSI, MACD and Bollinger results."""
+
+from .base_indicator import BaseIndicator
+import math
+import pandas as pd
+
+
+class CompositeScoreIndicator(BaseIndicator):
+    """Blends momentum (RSI), trend (MACD) and range position (Bollinger) into one score.
+
+    Consumes the upstream results instead of recomputing them; in a plan it
+    depends on the RSI, MACD and Bollinger Bands nodes (declared in
+    ``requires``). Each component maps to [-1, 1] (positive = bullish):
+
+    - RSI: (50 - rsi) / 50, i.e. oversold reads bullish (mean reversion);
+    - MACD: histogram scaled by the signal line's magnitude, clipped;
+    - Bollinger: 1 - 2 * position within the bands (near the lower band = bullish).
+    """
+
+    requires = ("RSI", "MACD", "Bollinger Bands")
+
+    @classmethod
+    def lookback(cls, params: dict | None = None) -> int:
+        return 1  # works from upstream results only
+
+    @classmethod
+    def levels(cls, params: dict | None = None) -> dict:
+        threshold = float((params or {}).get("threshold", 0.25))
+        return {"score": (-threshold, 0.0, threshold)}
+
+    def calculate(self, stock_data: pd.DataFrame, params: dict | None = None, inputs: dict | None = None) -> dict:
+        p = params or {}
+        weights = {
+            "RSI": float(p.get("rsi_weight", 1.0)),
+            "MACD": float(p.get("macd_weight", 1.0)),
+            "Bollinger Bands": float(p.get("bollinger_weight", 1.0)),
+        }
+        threshold = float(p.get("threshold", 0.25))
+        by_name = {r.indicator: (r.meta or {}) for r in (inputs or {}).values()}
+
+        # Raw components; undefined (NaN/inf) upstream values are left out, not clipped
+        raw = {}
+        if "rsi" in by_name.get("RSI", {}):
+            raw["RSI"] = (50.0 - by_name["RSI"]["rsi"]) / 50.0
+        macd = by_name.get("MACD", {})
+        if "histogram" in macd:
+            scale = max(abs(macd.get("signal_line", 0.0)), abs(macd.get("macd", 0.0)), 1e-9)
+            raw["MACD"] = macd["histogram"] / scale
+        bb = by_name.get("Bollinger Bands", {})
+        if {"price", "upper", "lower"} <= bb.keys() and bb["upper"] > bb["lower"]:
+            position = (bb["price"] - bb["lower"]) / (bb["upper"] - bb["lower"])
+            raw["Bollinger Bands"] = 1.0 - 2.0 * position
+        components = {k: _clip(v) for k, v in raw.items() if v is not None and math.isfinite(float(v))}
+
+        if not components:
+            return {
+                "indicator": "Composite Score",
+                "signal": "Error",
+                "details": "No usable upstream results (needs RSI, MACD and/or Bollinger Bands).",
+            }
+        total_weight = sum(weights[k] for k in components)
+        score = sum(weights[k] * v for k, v in components.items()) / total_weight if total_weight else 0.0
+
+        if score > threshold:
+            signal = "Bullish"
+        elif score < -threshold:
+            signal = "Bearish"
+        else:
+            signal = "Neutral"
+        parts = ", ".join(f"{k} {v:+.2f}" for k, v in components.items())
+        return {
+            "indicator": "Composite Score",
+            "signal": signal,
+            "details": f"Composite score {score:+.2f} from {parts} (threshold ±{threshold})",
+            "meta": {"score": score, "components": components},
+        }
+
+
+def _clip(x: float) -> float:
+    return max(-1.0, min(1.0, float(x)))
@@ -0,0 +1,43 @@
+"""Donchian Channels indicator."""
+
+from .base_indicator import BaseIndicator
+import pandas as pd
+
+
+def donchian(high: pd.Series, low: pd.Series, window: int = 20) -> tuple[pd.Series, pd.Series]:
+    """Highest high and lowest low over the trailing ``window`` bars (current bar included)."""
+    return high.rolling(window).max(), low.rolling(window).min()
+
+
+class DonchianChannelsIndicator(BaseIndicator):
+    """Flags closes breaking out of the prior ``window``-bar high/low channel."""
+
+    @classmethod
+    def lookback(cls, params: dict | None = None) -> int:
+        # The channel is taken up to the previous bar so today's close can break it
+        return int((params or {}).get("window", 20)) + 1
+
+    def calculate(self, stock_data: pd.DataFrame, params: dict | None = None) -> dict:
+        p = params or {}
+        window = int(p.get("window", 20))
+
+        close = stock_data["Close"].astype(float)
+        upper_line, lower_line = donchian(stock_data["High"].astype(float), stock_data["Low"].astype(float), window)
+        price = float(close.iloc[-1])
+        upper = float(upper_line.iloc[-2])
+        lower = float(lower_line.iloc[-2])
+
+        if price > upper:
+            signal = "Breakout above channel"
+        elif price < lower:
+            signal = "Breakdown below channel"
+        else:
+            signal = "Within channel"
+
+        position = (price - lower) / (upper - lower) if upper > lower else 0.5
+        return {
+            "indicator": "Donchian Channels",
+            "signal": signal,
+            "details": f"Donchian(window={window}): price={price:.2f}, lower={lower:.2f}, upper={upper:.2f}",
+            "meta": {"price": price, "upper": upper, "lower": lower, "position": position},
+        }
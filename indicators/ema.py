@@ -1,15 +1,32 @@
 """Exponential Moving Average crossover indicator."""
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, ema_lookback
 import pandas as pd
 
 
+def ema(close: pd.Series, span: int) -> pd.Series:
+    """EMA seeded with the first value (``ewm(span, adjust=False)``)."""
+    return close.ewm(span=span, adjust=False).mean()
+
+
 class EMAIndicator(BaseIndicator):
     """Checks the relationship between 12 and 26 day EMAs."""
 
-    def calculate(self, stock_data: pd.DataFrame) -> dict:
-        ema12 = stock_data["Close"].ewm(span=12, adjust=False).mean().iloc[-1]
-        ema26 = stock_data["Close"].ewm(span=26, adjust=False).mean().iloc[-1]
+    has_stored_values = True
+
+    @classmethod
+    def lookback(cls, params: dict | None = None) -> int:
+        return ema_lookback(26)
+
+    def calculate(self, stock_data: pd.DataFrame, params: dict | None = None) -> dict:
+        ema12 = float(ema(stock_data["Close"], 12).iloc[-1])
+        ema26 = float(ema(stock_data["Close"], 26).iloc[-1])
+        return self.from_values({"ema12": ema12, "ema26": ema26}, params)
+
+    @classmethod
+    def from_values(cls, values: dict, params: dict | None = None) -> dict:
+        ema12 = float(values["ema12"])
+        ema26 = float(values["ema26"])
 
         if ema12 > ema26:
             signal = "EMA12 above EMA26"
@@ -22,5 +39,6 @@ class EMAIndicator(BaseIndicator):
             "indicator": "EMA",
             "signal": signal,
             "details": f"EMA12 {ema12:.2f} vs EMA26 {ema26:.2f}",
+            "meta": {"ema12": ema12, "ema26": ema26},
         }
 
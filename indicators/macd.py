@@ -1,26 +1,47 @@
 """Moving Average Convergence Divergence indicator."""
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, ema_lookback
 import pandas as pd
 
 
+def macd(close: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> tuple[pd.Series, pd.Series]:
+    """MACD line (fast EMA - slow EMA) and its signal-line EMA."""
+    macd_line = close.ewm(span=fast, adjust=False).mean() - close.ewm(span=slow, adjust=False).mean()
+    return macd_line, macd_line.ewm(span=signal, adjust=False).mean()
+
+
 class MACDIndicator(BaseIndicator):
     """Compute MACD line and signal line crossover, honoring params."""
 
+    has_stored_values = True
+
+    @classmethod
+    def lookback(cls, params: dict | None = None) -> int:
+        # EMAs never fully forget their seed; warm up until it is below 1e-6
+        p = params or {}
+        return ema_lookback(max(int(p.get("fast", 12)), int(p.get("slow", 26)))) + ema_lookback(int(p.get("signal", 9)))
+
+    @classmethod
+    def levels(cls, params: dict | None = None) -> dict:
+        return {"macd": (0.0,), "histogram": (0.0,)}  # zero-line and signal-line crosses
+
     def calculate(self, stock_data: pd.DataFrame, params: dict | None = None) -> dict:
         p = params or {}
         fast = int(p.get("fast", 12))
         slow = int(p.get("slow", 26))
         signal_p = int(p.get("signal", 9))
 
-        close = stock_data["Close"].astype(float)
-        ema_fast = close.ewm(span=fast, adjust=False).mean()
-        ema_slow = close.ewm(span=slow, adjust=False).mean()
-        macd_line = ema_fast - ema_slow
-        signal_line = macd_line.ewm(span=signal_p, adjust=False).mean()
+        macd_line, signal_line = macd(stock_data["Close"].astype(float), fast, slow, signal_p)
+        return self.from_values({"macd": float(macd_line.iloc[-1]), "signal_line": float(signal_line.iloc[-1])}, params)
 
-        macd_value = float(macd_line.iloc[-1])
-        signal_value = float(signal_line.iloc[-1])
+    @classmethod
+    def from_values(cls, values: dict, params: dict | None = None) -> dict:
+        p = params or {}
+        fast = int(p.get("fast", 12))
+        slow = int(p.get("slow", 26))
+        signal_p = int(p.get("signal", 9))
+        macd_value = float(values["macd"])
+        signal_value = float(values["signal_line"])
 
         if macd_value > signal_value:
             signal = "Bullish Crossover"
@@ -33,4 +54,5 @@ class MACDIndicator(BaseIndicator):
             "indicator": "MACD",
             "signal": signal,
             "details": f"MACD(fast={fast}, slow={slow}, signal={signal_p}) → {macd_value:.2f} vs {signal_value:.2f}",
+            "meta": {"macd": macd_value, "signal_line": signal_value, "histogram": macd_value - signal_value},
         }
@@ -0,0 +1,99 @@
+"""Column-vectorized indicators over an aligned close-price matrix.
+
+``close`` is a DataFrame indexed by date with one column per ticker. Each
+kernel applies the same formula as the single-ticker indicator to every
+column at once (pandas rolling/ewm run column-wise in C), and
+``signal_matrix`` turns the latest value per ticker into the same signal
+labels the indicators emit, via ``np.select``. Tickers with a shorter
+history simply have leading NaNs and are read at their own latest bar; NaN
+values fall through to the neutral label just like the scalar comparisons.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+MATRIX_INDICATORS = ["RSI", "MACD", "Bollinger Bands", "Moving Average", "EMA"]
+
+
+def rsi_matrix(close: pd.DataFrame, period: int = 14) -> pd.DataFrame:
+    delta = close.diff()
+    roll_up = delta.clip(lower=0).rolling(period).mean()
+    roll_down = (-delta.clip(upper=0)).rolling(period).mean()
+    return 100 - (100 / (1 + roll_up / roll_down))
+
+
+def macd_matrix(close: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    macd_line = close.ewm(span=fast, adjust=False).mean() - close.ewm(span=slow, adjust=False).mean()
+    return macd_line, macd_line.ewm(span=signal, adjust=False).mean()
+
+
+def bollinger_matrix(close: pd.DataFrame, window: int = 20, stddev: float = 2) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    roll = close.rolling(window)
+    ma, sd = roll.mean(), roll.std()
+    return ma + stddev * sd, ma - stddev * sd
+
+
+def moving_average_matrix(close: pd.DataFrame, short_window: int = 50, long_window: int = 200) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    return close.rolling(short_window).mean(), close.rolling(long_window).mean()
+
+
+def signal_matrix(
+    close: pd.DataFrame,
+    indicators: List[str] | None = None,
+    params: Dict[str, dict] | None = None,
+) -> pd.DataFrame:
+    """Latest signal label per ticker (rows) and indicator (columns).
+
+    Args:
+        close: Aligned close prices, dates x tickers.
+        indicators: Subset of ``MATRIX_INDICATORS`` (default: all).
+        params: Optional per-indicator params, same keys as the single-ticker indicators.
+    """
+    indicators = indicators or MATRIX_INDICATORS
+    params = params or {}
+    close = close.astype(float)
+    # Row of each ticker's latest bar; every kernel is read at that row, like iloc[-1] per ticker
+    valid = close.notna().to_numpy()
+    rows = np.where(valid.any(axis=0), len(close) - 1 - np.argmax(valid[::-1], axis=0), 0)
+
+    def _last(frame: pd.DataFrame) -> np.ndarray:
+        if not len(frame):
+            return np.full(frame.shape[1], np.nan)
+        return frame.to_numpy(dtype=float)[rows, np.arange(frame.shape[1])]
+
+    out: Dict[str, np.ndarray] = {}
+    for name in indicators:
+        p = params.get(name) or {}
+        if name == "RSI":
+            rsi = _last(rsi_matrix(close, int(p.get("period", 14))))
+            out[name] = np.select(
+                [rsi < float(p.get("oversold", 30)), rsi > float(p.get("overbought", 70))],
+                ["Oversold", "Overbought"], "Neutral",
+            )
+        elif name == "MACD":
+            line, sig = macd_matrix(close, int(p.get("fast", 12)), int(p.get("slow", 26)), int(p.get("signal", 9)))
+            line, sig = _last(line), _last(sig)
+            out[name] = np.select([line > sig, line < sig], ["Bullish Crossover", "Bearish Crossover"], "Neutral")
+        elif name == "Bollinger Bands":
+            upper, lower = bollinger_matrix(close, int(p.get("window", 20)), float(p.get("stddev", 2)))
+            price, upper, lower = _last(close), _last(upper), _last(lower)
+            out[name] = np.select(
+                [price > upper, price < lower],
+                ["Price above upper band", "Price below lower band"], "Trading within bands",
+            )
+        elif name == "Moving Average":
+            short, long_ = moving_average_matrix(close, int(p.get("short_window", 50)), int(p.get("long_window", 200)))
+            short, long_ = _last(short), _last(long_)
+            out[name] = np.select([short > long_, short < long_], ["Golden Cross", "Death Cross"], "Neutral")
+        elif name == "EMA":
+            ema12, ema26 = _last(close.ewm(span=12, adjust=False).mean()), _last(close.ewm(span=26, adjust=False).mean())
+            out[name] = np.select(
+                [ema12 > ema26, ema12 < ema26], ["EMA12 above EMA26", "EMA12 below EMA26"], "EMA12 equals EMA26"
+            )
+        else:
+            raise KeyError(f"No matrix implementation for indicator {name}")
+    return pd.DataFrame(out, index=close.columns)
@@ -2,20 +2,36 @@ from .base_indicator import BaseIndicator
 import pandas as pd
 
 
+def moving_averages(close: pd.Series, short_window: int = 50, long_window: int = 200) -> tuple[pd.Series, pd.Series]:
+    """Short and long simple moving averages."""
+    return close.rolling(short_window).mean(), close.rolling(long_window).mean()
+
+
 class MovingAverageIndicator(BaseIndicator):
     """Calculates Moving Averages and crossovers, honoring params."""
 
+    has_stored_values = True
+
+    @classmethod
+    def lookback(cls, params: dict | None = None) -> int:
+        p = params or {}
+        return max(int(p.get("short_window", 50)), int(p.get("long_window", 200)))
+
     def calculate(self, stock_data: pd.DataFrame, params: dict | None = None) -> dict:
         p = params or {}
         short_window = int(p.get("short_window", 50))
         long_window = int(p.get("long_window", 200))
 
-        close = stock_data["Close"].astype(float)
-        short_ma = close.rolling(short_window).mean()
-        long_ma = close.rolling(long_window).mean()
+        short_ma, long_ma = moving_averages(stock_data["Close"].astype(float), short_window, long_window)
+        return self.from_values({"short_ma": float(short_ma.iloc[-1]), "long_ma": float(long_ma.iloc[-1])}, params)
 
-        s_val = float(short_ma.iloc[-1])
-        l_val = float(long_ma.iloc[-1])
+    @classmethod
+    def from_values(cls, values: dict, params: dict | None = None) -> dict:
+        p = params or {}
+        short_window = int(p.get("short_window", 50))
+        long_window = int(p.get("long_window", 200))
+        s_val = float(values["short_ma"])
+        l_val = float(values["long_ma"])
 
         if s_val > l_val:
             signal = "Golden Cross"
@@ -28,4 +44,5 @@ class MovingAverageIndicator(BaseIndicator):
             "indicator": "Moving Average",
             "signal": signal,
             "details": f"MA(short={short_window})={s_val:.2f} vs MA(long={long_window})={l_val:.2f}",
+            "meta": {"short_ma": s_val, "long_ma": l_val},
         }
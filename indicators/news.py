@@ -2,20 +2,25 @@
 
 from .base_indicator import BaseIndicator
 import pandas as pd
-import yfinance as yf
 import re
 from typing import List
 import config
-
-try:
-    from openai import OpenAI
-except Exception:  # pragma: no cover
-    OpenAI = None  # type: ignore
+from .sentiment_scorer import get_sentiment_scorer
+from core.llm import PRIORITY_BACKGROUND, get_llm_dispatcher
+from core.tasks import check_cancelled, remaining_time
+from data.news_store import get_news_store
 
 
 class NewsIndicator(BaseIndicator):
     """Fetch and summarize recent news for a ticker, infer likely impact."""
 
+    io_bound = True
+
+    @classmethod
+    def lookback(cls, params: dict | None = None) -> int:
+        # Works from the ticker param, not from price rows
+        return 1
+
     def calculate(self, stock_data: pd.DataFrame, params: dict | None = None) -> dict:
         p = params or {}
         ticker = p.get("ticker")
@@ -24,14 +29,18 @@ class NewsIndicator(BaseIndicator):
         headlines: List[str] = []
         try:
             if ticker:
-                t = yf.Ticker(ticker)
-                items = (t.news or [])[:n]
+                # Shares the incremental store with NewsOrchestrator (no second feed fetch)
+                store = get_news_store()
+                store.poll(ticker)
+                items = store.recent(ticker, limit=n)
                 for it in items:
                     title = (it or {}).get("title")
                     if title:
                         headlines.append(str(title))
         except Exception:
             pass
+        # Stop here if the feed fetch used up this task's deadline
+        check_cancelled()
 
         if not headlines:
             # No network/news available
@@ -41,24 +50,24 @@ class NewsIndicator(BaseIndicator):
                 "details": "No recent news available or network restricted.",
             }
 
-        # Prefer LLM-based impact summary if available
-        if getattr(config, "OPENAI_API_KEY", None) and OpenAI is not None:
+        # Optional LLM-based impact summary (one network round trip per ticker)
+        if p.get("use_llm") and getattr(config, "OPENAI_API_KEY", None):
             try:
-                client = OpenAI(api_key=config.OPENAI_API_KEY)
                 prompt = (
                     "You are a financial news analyst. Given these recent headlines for the stock, "
                     "summarize the key themes in 3-5 bullet points, then assess the likely near-term impact on the stock as Positive, Negative, or Neutral and explain why.\n\n"
                     + "\n".join(f"- {h}" for h in headlines)
                 )
-                resp = client.chat.completions.create(
+                text = get_llm_dispatcher().complete(
                     model="gpt-4-turbo",
                     messages=[
                         {"role": "system", "content": "You write concise, investor-friendly analyses."},
                         {"role": "user", "content": prompt},
                     ],
                     temperature=0.2,
-                )
-                text = resp.choices[0].message.content or ""
+                    priority=PRIORITY_BACKGROUND,
+                    timeout=remaining_time(),
+                ) or ""
                 # Simple extraction of signal keyword
                 m = re.search(r"\b(Positive|Negative|Neutral)\b", text, flags=re.IGNORECASE)
                 signal = m.group(1).capitalize() if m else "Neutral"
@@ -69,24 +78,20 @@ class NewsIndicator(BaseIndicator):
                 }
             except Exception:
                 pass
+            check_cancelled()
 
-        # Heuristic fallback sentiment from keywords
-        text = " ".join(headlines).lower()
-        pos_kw = ["beats", "upgrade", "record", "surge", "growth", "strong", "outperform"]
-        neg_kw = ["miss", "downgrade", "probe", "lawsuit", "recall", "fall", "weak", "cut"]
-        pos = sum(k in text for k in pos_kw)
-        neg = sum(k in text for k in neg_kw)
-        if pos > neg:
-            signal = "Positive"
-        elif neg > pos:
-            signal = "Negative"
-        else:
-            signal = "Neutral"
-
-        details = "Headlines:\n" + "\n".join(f"- {h}" for h in headlines)
+        # Local lexicon-based sentiment (batched scorer with a shared headline cache)
+        sentiment = get_sentiment_scorer().score_tickers({ticker: headlines})[ticker]
+        details = f"Headline sentiment {sentiment.score:+.2f} ({sentiment.positive} positive, {sentiment.negative} negative):\n" + "\n".join(
+            f"- ({s:+.2f}) {h}" for s, h in zip(sentiment.headline_scores, headlines)
+        )
         return {
             "indicator": "News",
-            "signal": signal,
+            "signal": sentiment.signal,
             "details": details,
+            "meta": {
+                "sentiment_score": sentiment.score,
+                "positive": sentiment.positive,
+                "negative": sentiment.negative,
+            },
         }
-
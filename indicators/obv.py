@@ -0,0 +1,56 @@
+"""On-Balance Volume indicator."""
+
+from .base_indicator import BaseIndicator
+import numpy as np
+import pandas as pd
+
+
+def obv(close: pd.Series, volume: pd.Series) -> pd.Series:
+    """Cumulative volume signed by the close-to-close direction (starts at 0)."""
+    direction = np.sign(close.diff().fillna(0.0))
+    return (direction * volume).cumsum()
+
+
+class OBVIndicator(BaseIndicator):
+    """Checks whether volume flow confirms the price trend over a window.
+
+    Only window-relative quantities are reported (OBV's change and its gap to
+    its moving average); they do not depend on where the cumulative sum
+    started, so a ``window + 1``-row tail gives the same answer as the full
+    history.
+    """
+
+    @classmethod
+    def lookback(cls, params: dict | None = None) -> int:
+        return int((params or {}).get("window", 20)) + 1
+
+    def calculate(self, stock_data: pd.DataFrame, params: dict | None = None) -> dict:
+        p = params or {}
+        window = int(p.get("window", 20))
+
+        close = stock_data["Close"].astype(float)
+        volume = stock_data["Volume"].astype(float)
+        obv_line = obv(close, volume)
+        obv_change = float(obv_line.iloc[-1] - obv_line.iloc[-window - 1])
+        obv_gap = float(obv_line.iloc[-1] - obv_line.iloc[-window:].mean())
+        price_change = float(close.iloc[-1] - close.iloc[-window - 1])
+        avg_volume = float(volume.iloc[-window:].mean())
+
+        if obv_change > 0 and price_change > 0:
+            signal = "Accumulation confirms uptrend"
+        elif obv_change < 0 and price_change < 0:
+            signal = "Distribution confirms downtrend"
+        elif obv_change > 0:
+            signal = "Bullish divergence"
+        elif obv_change < 0:
+            signal = "Bearish divergence"
+        else:
+            signal = "Neutral"
+
+        flow = obv_change / avg_volume if avg_volume else 0.0
+        return {
+            "indicator": "OBV",
+            "signal": signal,
+            "details": f"OBV(window={window}) changed {flow:+.2f} average-volume units while price moved {price_change:+.2f}",
+            "meta": {"obv_change": obv_change, "obv_gap": obv_gap, "price_change": price_change},
+        }
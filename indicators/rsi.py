@@ -4,24 +4,41 @@ from .base_indicator import BaseIndicator
 import pandas as pd
 
 
+def rsi(close: pd.Series, period: int = 14) -> pd.Series:
+    """RSI from simple rolling means of gains and losses (not Wilder smoothing)."""
+    delta = close.diff()
+    roll_up = delta.clip(lower=0).rolling(period).mean()
+    roll_down = (-delta.clip(upper=0)).rolling(period).mean()
+    return 100 - (100 / (1 + roll_up / roll_down))
+
+
 class RSIIndicator(BaseIndicator):
     """Compute RSI and produce a signal, honoring params like period/thresholds."""
 
+    has_stored_values = True
+
+    @classmethod
+    def lookback(cls, params: dict | None = None) -> int:
+        # One extra row for the first price difference
+        return int((params or {}).get("period", 14)) + 1
+
+    @classmethod
+    def levels(cls, params: dict | None = None) -> dict:
+        p = params or {}
+        return {"rsi": (float(p.get("oversold", 30)), 50.0, float(p.get("overbought", 70)))}
+
     def calculate(self, stock_data: pd.DataFrame, params: dict | None = None) -> dict:
+        period = int((params or {}).get("period", 14))
+        rsi_value = float(rsi(stock_data["Close"].astype(float), period).iloc[-1])
+        return self.from_values({"rsi": rsi_value}, params)
+
+    @classmethod
+    def from_values(cls, values: dict, params: dict | None = None) -> dict:
         p = params or {}
         period = int(p.get("period", 14))
         oversold = float(p.get("oversold", 30))
         overbought = float(p.get("overbought", 70))
-
-        close = stock_data["Close"].astype(float)
-        delta = close.diff()
-        up = delta.clip(lower=0)
-        down = -delta.clip(upper=0)
-        roll_up = up.rolling(period).mean()
-        roll_down = down.rolling(period).mean()
-        rs = roll_up / roll_down
-        rsi = 100 - (100 / (1 + rs))
-        rsi_value = float(rsi.iloc[-1])
+        rsi_value = float(values["rsi"])
 
         if rsi_value < oversold:
             signal = "Oversold"
@@ -34,4 +51,5 @@ class RSIIndicator(BaseIndicator):
             "indicator": "RSI",
             "signal": signal,
             "details": f"RSI(period={period}) is {rsi_value:.2f}; thresholds {oversold}/{overbought}",
+            "meta": {"rsi": rsi_value},
         }
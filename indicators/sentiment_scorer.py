@@ -0,0 +1,156 @@
+"""Local, batched headline sentiment scoring over a weighted finance lexicon.
+
+All lexicon phrases are compiled into a single case-insensitive alternation
+(longest phrase first, word-bounded), so one regex scan over a batch of
+headlines finds every term match in C. Headlines of a whole batch are joined
+into one buffer, scanned once, and match weights are summed back per headline
+with ``np.bincount``. Per-headline scores are memoized by normalized text, so
+re-polled headlines cost a dict lookup.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Sequence
+import re
+import threading
+
+import numpy as np
+
+# Weighted finance lexicon; multi-word phrases win over their single-word parts
+FINANCE_LEXICON: Dict[str, float] = {
+    # positive
+    "beats": 1.0, "beat": 1.0, "tops estimates": 1.2, "upgrade": 1.0, "upgrades": 1.0, "upgraded": 1.0,
+    "record": 0.6, "surge": 0.8, "surges": 0.8, "soars": 1.0, "jumps": 0.7, "rallies": 0.7,
+    "growth": 0.4, "accelerates": 0.5, "strong": 0.5, "outperform": 0.8, "raises guidance": 1.5,
+    "raises outlook": 1.3, "buyback": 0.6, "dividend increase": 0.8, "approval": 0.6, "wins": 0.5,
+    "partnership": 0.3, "profit": 0.3, "bullish": 0.8, "expands": 0.3,
+    # negative
+    "miss": -1.0, "misses": -1.0, "downgrade": -1.0, "downgrades": -1.0, "downgraded": -1.0,
+    "probe": -1.0, "investigation": -0.9, "lawsuit": -1.0, "sued": -0.9, "recall": -1.0,
+    "fall": -0.6, "falls": -0.6, "plunges": -1.2, "slumps": -0.9, "tumbles": -0.9, "weak": -0.6,
+    "cut": -0.6, "cuts": -0.6, "cuts guidance": -1.5, "lowers guidance": -1.4, "layoffs": -0.7,
+    "bankruptcy": -2.0, "fraud": -1.8, "loss": -0.5, "underperform": -0.8, "bearish": -0.8,
+    "delay": -0.4, "warning": -0.7, "halted": -0.8,
+}
+
+# Mean headline score above/below which a ticker's news is Positive/Negative
+SIGNAL_THRESHOLD = 0.15
+
+
+@dataclass
+class TickerSentiment:
+    ticker: str
+    score: float
+    signal: str
+    positive: int
+    negative: int
+    headline_scores: List[float] = field(default_factory=list)
+
+
+class HeadlineSentimentScorer:
+    """Scores headlines with a compiled multi-phrase matcher and an LRU score cache."""
+
+    def __init__(self, lexicon: Mapping[str, float] | None = None, cache_size: int = 100_000):
+        self.lexicon = {k.lower(): float(v) for k, v in (lexicon or FINANCE_LEXICON).items()}
+        terms = sorted(self.lexicon, key=len, reverse=True)
+        self._pattern = re.compile(
+            r"\b(?:" + "|".join(re.escape(t).replace(r"\ ", " ") for t in terms) + r")\b",
+            re.IGNORECASE,
+        )
+        self._cache: OrderedDict[str, float] = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+    def score_headlines(self, headlines: Sequence[str]) -> np.ndarray:
+        """Returns a score in [-1, 1] per headline (batched; cached by text)."""
+        keys = [_normalize(h) for h in headlines]
+        scores = np.zeros(len(keys), dtype=float)
+        missing: Dict[str, List[int]] = {}
+        with self._lock:
+            for i, k in enumerate(keys):
+                hit = self._cache.get(k)
+                if hit is None:
+                    missing.setdefault(k, []).append(i)
+                else:
+                    self._cache.move_to_end(k)
+                    scores[i] = hit
+        if missing:
+            texts = list(missing)
+            fresh = self._score_batch(texts)
+            with self._lock:
+                for text, value in zip(texts, fresh):
+                    self._cache[text] = float(value)
+                    for i in missing[text]:
+                        scores[i] = value
+                while len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        return scores
+
+    def score_tickers(self, headlines_by_ticker: Mapping[str, Iterable[str]]) -> Dict[str, TickerSentiment]:
+        """Scores many tickers' headlines in one batched pass."""
+        tickers: List[str] = []
+        lists: List[List[str]] = []
+        for t, hs in headlines_by_ticker.items():
+            tickers.append(t)
+            lists.append([str(h) for h in hs if h])
+        flat = [h for hs in lists for h in hs]
+        owner = np.repeat(np.arange(len(tickers)), [len(hs) for hs in lists]).astype(np.int64)
+        scores = self.score_headlines(flat)
+
+        n = len(tickers)
+        counts = np.bincount(owner, minlength=n)
+        sums = np.bincount(owner, weights=scores, minlength=n)
+        pos = np.bincount(owner, weights=(scores > 0).astype(float), minlength=n)
+        neg = np.bincount(owner, weights=(scores < 0).astype(float), minlength=n)
+        means = np.divide(sums, counts, out=np.zeros(n), where=counts > 0)
+        signals = np.select([means > SIGNAL_THRESHOLD, means < -SIGNAL_THRESHOLD], ["Positive", "Negative"], "Neutral")
+
+        bounds = np.concatenate(([0], np.cumsum(counts)))
+        return {
+            t: TickerSentiment(
+                ticker=t,
+                score=float(means[i]),
+                signal=str(signals[i]),
+                positive=int(pos[i]),
+                negative=int(neg[i]),
+                headline_scores=scores[bounds[i]:bounds[i + 1]].tolist(),
+            )
+            for i, t in enumerate(tickers)
+        }
+
+    def _score_batch(self, texts: List[str]) -> np.ndarray:
+        # One scan over all texts joined by newlines; map match offsets back to texts
+        buffer = "\n".join(texts)
+        starts = np.cumsum([0] + [len(t) + 1 for t in texts[:-1]])
+        positions: List[int] = []
+        weights: List[float] = []
+        lexicon = self.lexicon
+        for m in self._pattern.finditer(buffer):
+            positions.append(m.start())
+            weights.append(lexicon.get(" ".join(m.group(0).lower().split()), 0.0))
+        if not positions:
+            return np.zeros(len(texts))
+        owner = np.searchsorted(starts, np.asarray(positions), side="right") - 1
+        totals = np.bincount(owner, weights=np.asarray(weights), minlength=len(texts))
+        # Squash raw lexicon sums into [-1, 1]
+        return np.tanh(totals / 2.0)
+
+
+_scorer: HeadlineSentimentScorer | None = None
+_scorer_lock = threading.Lock()
+
+
+def get_sentiment_scorer() -> HeadlineSentimentScorer:
+    """Returns the process-wide scorer (shares its headline cache across callers)."""
+    global _scorer
+    if _scorer is None:
+        with _scorer_lock:
+            if _scorer is None:
+                _scorer = HeadlineSentimentScorer()
+    return _scorer
+
+
+def _normalize(text: str) -> str:
+    return " ".join(str(text).split())
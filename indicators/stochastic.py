@@ -0,0 +1,61 @@
+"""Stochastic oscillator indicator."""
+
+from .base_indicator import BaseIndicator
+import pandas as pd
+
+
+def stochastic(
+    high: pd.Series, low: pd.Series, close: pd.Series, k_period: int = 14, d_period: int = 3, smooth: int = 1
+) -> tuple[pd.Series, pd.Series]:
+    """%K (optionally smoothed; smooth=3 gives the slow stochastic) and its %D average."""
+    lowest = low.rolling(k_period).min()
+    highest = high.rolling(k_period).max()
+    k = 100.0 * (close - lowest) / (highest - lowest)
+    if smooth > 1:
+        k = k.rolling(smooth).mean()
+    return k, k.rolling(d_period).mean()
+
+
+class StochasticIndicator(BaseIndicator):
+    """Flags overbought/oversold closes relative to the recent high-low range."""
+
+    @classmethod
+    def lookback(cls, params: dict | None = None) -> int:
+        p = params or {}
+        return int(p.get("k_period", 14)) + int(p.get("smooth", 1)) + int(p.get("d_period", 3)) - 2
+
+    @classmethod
+    def levels(cls, params: dict | None = None) -> dict:
+        p = params or {}
+        return {"k": (float(p.get("oversold", 20)), float(p.get("overbought", 80)))}
+
+    def calculate(self, stock_data: pd.DataFrame, params: dict | None = None) -> dict:
+        p = params or {}
+        k_period = int(p.get("k_period", 14))
+        d_period = int(p.get("d_period", 3))
+        smooth = int(p.get("smooth", 1))
+        oversold = float(p.get("oversold", 20))
+        overbought = float(p.get("overbought", 80))
+
+        k, d = stochastic(
+            stock_data["High"].astype(float),
+            stock_data["Low"].astype(float),
+            stock_data["Close"].astype(float),
+            k_period, d_period, smooth,
+        )
+        k_value = float(k.iloc[-1])
+        d_value = float(d.iloc[-1])
+
+        if k_value < oversold and d_value < oversold:
+            signal = "Oversold"
+        elif k_value > overbought and d_value > overbought:
+            signal = "Overbought"
+        else:
+            signal = "Neutral"
+
+        return {
+            "indicator": "Stochastic",
+            "signal": signal,
+            "details": f"Stochastic(k={k_period}, d={d_period}, smooth={smooth}): %K {k_value:.2f}, %D {d_value:.2f}; thresholds {oversold}/{overbought}",
+            "meta": {"k": k_value, "d": d_value},
+        }
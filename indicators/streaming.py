@@ -0,0 +1,251 @@
+"""Incremental (bar-by-bar) versions of the core technical indicators.
+
+Each state is seeded once from a close-price history and then advanced with
+``update(close)`` in O(1) per bar, producing the same values and signal
+labels as the batch indicator with the same params (RSI, MACD, Bollinger
+Bands, Moving Average, EMA). ``signal`` is ``None`` until the state has seen
+enough bars to be defined.
+
+Used by the live watchlist monitor, which only advances tickers that
+received new bars.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, Optional, Type
+import copy
+import math
+
+import numpy as np
+
+
+class StreamingIndicator(ABC):
+    """Abstract base class: seed from history, then ``update`` one close at a time."""
+
+    name: str = ""
+
+    def __init__(self, params: dict | None = None):
+        self.params = params or {}
+        self.signal: Optional[str] = None
+        self.values: Dict[str, float] = {}
+
+    def seed(self, closes: np.ndarray) -> Optional[str]:
+        """Feeds a history of closes (oldest first); returns the current signal."""
+        for c in np.asarray(closes, dtype=float):
+            self.update(float(c))
+        return self.signal
+
+    @abstractmethod
+    def update(self, close: float) -> Optional[str]:
+        """Advances the state by one close; returns the current signal (None until defined)."""
+
+    def copy(self) -> "StreamingIndicator":
+        """An independent copy of the state (e.g. to rewind a bar that was still forming)."""
+        clone = copy.copy(self)
+        clone.values = dict(self.values)
+        for key, value in vars(self).items():
+            if isinstance(value, (_RollingMean, _EMA)):
+                setattr(clone, key, value.copy())
+        return clone
+
+
+class _RollingMean:
+    """Fixed-window running mean (and sample std) over the last ``window`` values."""
+
+    def __init__(self, window: int, with_std: bool = False):
+        self.window = window
+        self.with_std = with_std
+        self._buf: deque = deque()
+        self._sum = 0.0
+        self._sumsq = 0.0
+
+    def push(self, x: float) -> None:
+        self._buf.append(x)
+        self._sum += x
+        if self.with_std:
+            self._sumsq += x * x
+        if len(self._buf) > self.window:
+            old = self._buf.popleft()
+            self._sum -= old
+            if self.with_std:
+                self._sumsq -= old * old
+
+    def copy(self) -> "_RollingMean":
+        clone = copy.copy(self)
+        clone._buf = self._buf.copy()
+        return clone
+
+    @property
+    def ready(self) -> bool:
+        return len(self._buf) >= self.window
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self.window if self.ready else math.nan
+
+    @property
+    def std(self) -> float:
+        if not self.ready or self.window < 2:
+            return math.nan
+        var = (self._sumsq - self._sum * self._sum / self.window) / (self.window - 1)
+        return math.sqrt(max(var, 0.0))
+
+
+class _EMA:
+    """Recursive EMA matching ``Series.ewm(span=..., adjust=False).mean()``."""
+
+    def __init__(self, span: int):
+        self.alpha = 2.0 / (span + 1.0)
+        self.value: float = math.nan
+
+    def copy(self) -> "_EMA":
+        return copy.copy(self)
+
+    def push(self, x: float) -> float:
+        self.value = x if math.isnan(self.value) else self.value + self.alpha * (x - self.value)
+        return self.value
+
+
+class StreamingRSI(StreamingIndicator):
+    name = "RSI"
+
+    def __init__(self, params: dict | None = None):
+        super().__init__(params)
+        self.period = int(self.params.get("period", 14))
+        self.oversold = float(self.params.get("oversold", 30))
+        self.overbought = float(self.params.get("overbought", 70))
+        self._up = _RollingMean(self.period)
+        self._down = _RollingMean(self.period)
+        self._prev: float = math.nan
+
+    def update(self, close: float) -> Optional[str]:
+        if not math.isnan(self._prev):
+            delta = close - self._prev
+            self._up.push(max(delta, 0.0))
+            self._down.push(max(-delta, 0.0))
+        self._prev = close
+        if not self._up.ready:
+            return self.signal
+        up, down = self._up.mean, self._down.mean
+        if down > 0:
+            rsi = 100 - 100 / (1 + up / down)
+        else:
+            rsi = 100.0 if up > 0 else math.nan
+        self.values = {"rsi": rsi}
+        if rsi < self.oversold:
+            self.signal = "Oversold"
+        elif rsi > self.overbought:
+            self.signal = "Overbought"
+        else:
+            self.signal = "Neutral"
+        return self.signal
+
+
+class StreamingMACD(StreamingIndicator):
+    name = "MACD"
+
+    def __init__(self, params: dict | None = None):
+        super().__init__(params)
+        self._fast = _EMA(int(self.params.get("fast", 12)))
+        self._slow = _EMA(int(self.params.get("slow", 26)))
+        self._signal = _EMA(int(self.params.get("signal", 9)))
+
+    def update(self, close: float) -> Optional[str]:
+        macd = self._fast.push(close) - self._slow.push(close)
+        signal_value = self._signal.push(macd)
+        self.values = {"macd": macd, "signal_line": signal_value, "histogram": macd - signal_value}
+        if macd > signal_value:
+            self.signal = "Bullish Crossover"
+        elif macd < signal_value:
+            self.signal = "Bearish Crossover"
+        else:
+            self.signal = "Neutral"
+        return self.signal
+
+
+class StreamingBollingerBands(StreamingIndicator):
+    name = "Bollinger Bands"
+
+    def __init__(self, params: dict | None = None):
+        super().__init__(params)
+        self.stddev = float(self.params.get("stddev", 2))
+        self._window = _RollingMean(int(self.params.get("window", 20)), with_std=True)
+
+    def update(self, close: float) -> Optional[str]:
+        self._window.push(close)
+        if not self._window.ready:
+            return self.signal
+        middle, sd = self._window.mean, self._window.std
+        upper, lower = middle + self.stddev * sd, middle - self.stddev * sd
+        self.values = {"price": close, "middle": middle, "upper": upper, "lower": lower}
+        if close > upper:
+            self.signal = "Price above upper band"
+        elif close < lower:
+            self.signal = "Price below lower band"
+        else:
+            self.signal = "Trading within bands"
+        return self.signal
+
+
+class StreamingMovingAverage(StreamingIndicator):
+    name = "Moving Average"
+
+    def __init__(self, params: dict | None = None):
+        super().__init__(params)
+        self._short = _RollingMean(int(self.params.get("short_window", 50)))
+        self._long = _RollingMean(int(self.params.get("long_window", 200)))
+
+    def update(self, close: float) -> Optional[str]:
+        self._short.push(close)
+        self._long.push(close)
+        if not self._long.ready:
+            return self.signal
+        s_val, l_val = self._short.mean, self._long.mean
+        self.values = {"short_ma": s_val, "long_ma": l_val}
+        if s_val > l_val:
+            self.signal = "Golden Cross"
+        elif s_val < l_val:
+            self.signal = "Death Cross"
+        else:
+            self.signal = "Neutral"
+        return self.signal
+
+
+class StreamingEMA(StreamingIndicator):
+    name = "EMA"
+
+    def __init__(self, params: dict | None = None):
+        super().__init__(params)
+        self._ema12 = _EMA(12)
+        self._ema26 = _EMA(26)
+
+    def update(self, close: float) -> Optional[str]:
+        ema12, ema26 = self._ema12.push(close), self._ema26.push(close)
+        self.values = {"ema12": ema12, "ema26": ema26}
+        if ema12 > ema26:
+            self.signal = "EMA12 above EMA26"
+        elif ema12 < ema26:
+            self.signal = "EMA12 below EMA26"
+        else:
+            self.signal = "EMA12 equals EMA26"
+        return self.signal
+
+
+STREAMING_INDICATORS: Dict[str, Type[StreamingIndicator]] = {
+    cls.name.lower(): cls
+    for cls in (StreamingRSI, StreamingMACD, StreamingBollingerBands, StreamingMovingAverage, StreamingEMA)
+}
+
+
+def make_streaming(name: str, params: dict | None = None) -> StreamingIndicator:
+    """Builds the incremental state for indicator ``name`` (e.g. "RSI", "Bollinger Bands").
+
+    Raises:
+        KeyError: If the indicator has no incremental implementation.
+    """
+    key = name.lower().replace("_", " ").replace("-", " ")
+    if key not in STREAMING_INDICATORS:
+        raise KeyError(f"No streaming implementation for indicator {name}")
+    return STREAMING_INDICATORS[key](params)
@@ -2,12 +2,20 @@
 
 from .base_indicator import BaseIndicator
 import pandas as pd
-import yfinance as yf
+from core.tasks import check_cancelled
+from data.sources import get_data_source
 
 
 class ValueAnalysisIndicator(BaseIndicator):
     """Fetch basic valuation data and provide a quick assessment."""
 
+    io_bound = True
+
+    @classmethod
+    def lookback(cls, params: dict | None = None) -> int:
+        # Works from the ticker param, not from price rows
+        return 1
+
     def calculate(self, stock_data: pd.DataFrame, params: dict | None = None) -> dict:
         p = params or {}
         ticker = p.get("ticker")
@@ -18,14 +26,15 @@ class ValueAnalysisIndicator(BaseIndicator):
         mc = None
         try:
             if ticker:
-                t = yf.Ticker(ticker)
-                info = getattr(t, "info", {}) or {}
+                info = get_data_source().info(ticker) or {}
                 pe = info.get("trailingPE") or info.get("forwardPE")
                 pb = info.get("priceToBook")
                 peg = info.get("pegRatio")
                 mc = info.get("marketCap")
         except Exception:
             pass
+        # A fundamentals fetch that outlived the task's deadline is not reported
+        check_cancelled()
 
         details_parts = []
         if pe is not None:
@@ -55,5 +64,6 @@ class ValueAnalysisIndicator(BaseIndicator):
             "indicator": "Value Analysis",
             "signal": signal,
             "details": details,
+            "meta": {"pe": pe, "pb": pb, "peg": peg, "market_cap": mc},
         }
 
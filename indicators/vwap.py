@@ -0,0 +1,83 @@
+"""Volume-Weighted Average Price indicator."""
+
+from .base_indicator import BaseIndicator
+import numpy as np
+import pandas as pd
+
+# Bars in a regular session at the finest interval (1m, 09:30-16:00); a tail this
+# long always contains the whole latest session for session-anchored VWAP
+_SESSION_BARS = 390
+
+
+def session_keys(index: pd.Index) -> np.ndarray:
+    """Session date of each bar (wall-clock date; string indexes use their date prefix)."""
+    if isinstance(index, pd.DatetimeIndex):
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        return index.normalize().to_numpy()
+    return index.astype(str).str[:10].to_numpy()
+
+
+def vwap(
+    high: pd.Series, low: pd.Series, close: pd.Series, volume: pd.Series,
+    window: int = 20, anchor: str = "auto",
+) -> pd.Series:
+    """VWAP of the typical price.
+
+    ``anchor="session"`` resets at each session (intraday bars); ``"rolling"``
+    uses a trailing ``window``; ``"auto"`` anchors by session when several bars
+    share a session date and rolls otherwise (daily bars).
+    """
+    typical = (high + low + close) / 3.0
+    pv = typical * volume
+    if anchor == "auto":
+        keys = session_keys(close.index)
+        anchor = "session" if len(pd.unique(keys)) < len(keys) else "rolling"
+    if anchor == "session":
+        keys = session_keys(close.index)
+        return pv.groupby(keys).cumsum() / volume.groupby(keys).cumsum()
+    return pv.rolling(window).sum() / volume.rolling(window).sum()
+
+
+class VWAPIndicator(BaseIndicator):
+    """Compares the last close with VWAP (session-anchored intraday, rolling on daily bars)."""
+
+    @classmethod
+    def lookback(cls, params: dict | None = None) -> int:
+        p = params or {}
+        window = int(p.get("window", 20))
+        if p.get("anchor", "auto") == "rolling":
+            return window
+        return max(window, _SESSION_BARS)
+
+    def calculate(self, stock_data: pd.DataFrame, params: dict | None = None) -> dict:
+        p = params or {}
+        window = int(p.get("window", 20))
+        anchor = str(p.get("anchor", "auto"))
+        band = float(p.get("band_pct", 0.5))
+
+        close = stock_data["Close"].astype(float)
+        vwap_line = vwap(
+            stock_data["High"].astype(float),
+            stock_data["Low"].astype(float),
+            close,
+            stock_data["Volume"].astype(float),
+            window, anchor,
+        )
+        price = float(close.iloc[-1])
+        vwap_value = float(vwap_line.iloc[-1])
+        gap_pct = 100.0 * (price - vwap_value) / vwap_value
+
+        if gap_pct > band:
+            signal = "Price above VWAP"
+        elif gap_pct < -band:
+            signal = "Price below VWAP"
+        else:
+            signal = "Price near VWAP"
+
+        return {
+            "indicator": "VWAP",
+            "signal": signal,
+            "details": f"VWAP(window={window}, anchor={anchor}) is {vwap_value:.2f}; price {price:.2f} ({gap_pct:+.2f}%)",
+            "meta": {"vwap": vwap_value, "price": price, "gap_pct": gap_pct},
+        }
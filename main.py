@@ -1,79 +1,205 @@
+from agents.batch_runner import BatchRunner
+from agents.signal_table import cached_tickers, materialize_signals
 from agents.technical_analysis_orchestrator import TechnicalAnalysisOrchestrator
 from agents.value_analysis_orchestrator import ValueAnalysisOrchestrator
 from agents.news_orchestrator import NewsOrchestrator
+from agents.portfolio_orchestrator import PortfolioOrchestrator
+from agents.work_queue import Shard, WorkQueue, default_worker_id, run_worker
+from data.bars import INTERVALS
+from data.sources import set_data_source
+from reporting.export import EXPORT_FORMATS, ReportExporter
+from reporting.render import RENDER_FORMATS, BatchRenderer
+from core.execution import pool_stats
+from core.journal import RunJournal
+from core.tasks import task_stats
+from reporting.report_writer import ReportWriter
+from datetime import datetime
 import argparse
+import config
+import hashlib
+import json
 import os
-from datetime import datetime
+import subprocess
+import sys
+
+# Options that only shape a local batch (not stored with a queued batch for its workers)
+QUEUE_ONLY = ('tickers', 'queue', 'shard_size', 'local_workers', 'work', 'worker_id', 'batch', 'journal', 'task_stats')
 
 
 def main():
     parser = argparse.ArgumentParser(description='Run a stock analysis (technical, value, news, or any combination).')
-    parser.add_argument('ticker', type=str, help='The stock ticker to analyze.')
+    parser.add_argument('tickers', type=str, nargs='*', metavar='ticker', help='One or more stock tickers to analyze.')
     parser.add_argument('--indicators', nargs='+', default=["RSI", "MACD", "Bollinger Bands", "Moving Average"], help='A list of technical indicators to calculate.')
+    parser.add_argument('--interval', choices=list(INTERVALS), default='1d', help='Bar interval for technical indicators; intraday intervals are resampled from the BASE_INTERVAL series.')
     parser.add_argument('--analysis', choices=['technical', 'value', 'both'], default='both', help='Type of analysis to run.')
+    parser.add_argument('--value-mode', choices=['absolute', 'peer'], default='absolute', help='Value scoring: absolute thresholds or sector-relative percentiles from the daily snapshot.')
     parser.add_argument('--news', action='store_true', help='Fetch and store recent news headlines to a report file.')
+    parser.add_argument('--portfolio', action='store_true', help='Also analyze the tickers together as one portfolio (correlation, volatility, beta, drawdowns, aggregated signals).')
+    parser.add_argument('--weights', type=float, nargs='+', default=None, help='Portfolio weights in ticker order (default: equal weight).')
+    parser.add_argument('--source', choices=['yfinance', 'replay', 'record', 'synthetic'], default=None, help='Market-data backend (defaults to DATA_SOURCE env or yfinance).')
+    parser.add_argument('--flush-every', type=int, default=50, help='Number of report files buffered before a bulk write.')
+    parser.add_argument('--archive', action='store_true', help='Also write every report of this batch into one reports/batch_<timestamp>.tar.gz.')
+    parser.add_argument('--journal', default=None, help='Checkpoint journal path; rerunning with the same journal resumes the batch (default: derived from the arguments and date under JOURNAL_DIR).')
+    parser.add_argument('--no-journal', action='store_true', help='Run without checkpointing.')
+    parser.add_argument('--retries', type=int, default=config.BATCH_RETRIES, help='Extra rounds for tickers whose stages raised.')
+    parser.add_argument('--retry-backoff', type=float, default=config.BATCH_RETRY_BACKOFF, help='Seconds before the first retry round (doubles each round).')
+    parser.add_argument('--materialize-signals', action='store_true', help='After the batch, rebuild the daily signal table (latest default-indicator values) for every cached ticker and this batch.')
+    parser.add_argument('--deltas', action='store_true', help='Compare each ticker with its previous run; unchanged tickers get a compact "no change" report without an LLM summary.')
+    parser.add_argument('--site', choices=RENDER_FORMATS, default=None, help='Also render the batch as one index page plus a page per ticker under reports/site/<date>/.')
+    parser.add_argument('--task-stats', default=None, metavar='PATH', help='Write per-indicator outcome counts (ok/failed/timeout/skipped) and latency percentiles, plus pool stats, to this JSON file for tuning *_TASK_TIMEOUT.')
+    parser.add_argument('--export', choices=EXPORT_FORMATS, default=None, help='Also stream structured AnalysisReport records to reports/export/<date>/ (parquet needs pyarrow).')
+    parser.add_argument('--queue', nargs='?', const=config.WORK_QUEUE_PATH, default=None, metavar='PATH', help='Sharded mode: queue the tickers as shards on this shared work queue (default WORK_QUEUE_PATH) for worker processes instead of running them here.')
+    parser.add_argument('--shard-size', type=int, default=config.WORK_SHARD_SIZE, help='Tickers per shard with --queue.')
+    parser.add_argument('--local-workers', type=int, default=0, help='With --queue: start this many worker processes here and wait for the batch.')
+    parser.add_argument('--work', action='store_true', help='Worker mode: lease and run shards from --queue until none are left.')
+    parser.add_argument('--worker-id', default=None, help='Worker id recorded on leases (default host:pid).')
+    parser.add_argument('--batch', default=None, help='Worker mode: only work on this queued batch.')
 
     args = parser.parse_args()
+    if args.work:
+        _work(args)
+        return
+    if not args.tickers:
+        parser.error('at least one ticker is required (or --work)')
+    if args.weights and len(args.weights) != len(args.tickers):
+        parser.error('--weights needs one weight per ticker')
+    if args.queue:
+        unsupported = [f'--{k.replace("_", "-")}' for k in ('portfolio', 'archive', 'site', 'export', 'materialize_signals') if getattr(args, k)]
+        if unsupported:
+            parser.error(f'{", ".join(unsupported)} cannot be combined with --queue (each worker writes only its own shards)')
+        _submit(args)
+        return
+
+    if args.source:
+        set_data_source(args.source)
+
+    # One writer for the batch: reports are buffered, written atomically, and
+    # the final combined report is assembled from the in-memory sections
+    exporter = ReportExporter(args.export) if args.export else None
+    site = BatchRenderer(args.site) if args.site else None
+    writer = ReportWriter(flush_every=args.flush_every, keep_sections=True, archive=args.archive, exporter=exporter, site=site)
+    stages = _stages(args, writer)
+
+    # Finished (ticker, stage) units are journaled, so an interrupted batch rerun
+    # with the same arguments on the same day picks up where it stopped; the
+    # journal of a batch that finished is retired, so the next run starts fresh
+    journal = None if args.no_journal else RunJournal(args.journal or _journal_path(args))
+    runner = BatchRunner(stages, writer, journal=journal, retries=args.retries, backoff=args.retry_backoff)
 
     outputs = []
-    if args.analysis in ('technical', 'both'):
-        orchestrator = TechnicalAnalysisOrchestrator()
-        outputs.append(orchestrator.run(args.ticker, args.indicators))
-
-    if args.analysis in ('value', 'both'):
-        v_orchestrator = ValueAnalysisOrchestrator()
-        outputs.append(v_orchestrator.run(args.ticker))
-
-    if args.news:
-        n_orchestrator = NewsOrchestrator()
-        outputs.append(n_orchestrator.run(args.ticker))
-
-    final_path = _combine_reports_for_today(args.ticker)
-    if final_path:
-        outputs.append(final_path)
+    with writer:
+        outputs.extend(runner.run(args.tickers))
+        finished = not runner.failed
+
+        if args.portfolio:
+            holdings = dict(zip(args.tickers, args.weights)) if args.weights else args.tickers
+            portfolio_path = runner.run_once('portfolio', lambda: PortfolioOrchestrator(writer=writer).run(holdings))
+            if portfolio_path:
+                outputs.append(portfolio_path)
+            finished = finished and bool(portfolio_path)
+    if journal:
+        if finished:
+            journal.retire()
+        else:
+            journal.close()
+            print(f"Batch incomplete; rerun with the same arguments to resume from {journal.path}")
+
+    if args.materialize_signals:
+        # Prices of this batch are now fresh; later default-param requests are served from the table
+        table = materialize_signals(list(dict.fromkeys(cached_tickers() + args.tickers)))
+        print(f"Materialized signals for {len(table)} tickers")
+
+    if writer.archive_path:
+        outputs.append(writer.archive_path)
+    if exporter:
+        outputs.extend(exporter.paths)
+    if site and len(site):
+        outputs.append(site.index_path)
+    if args.task_stats:
+        with open(args.task_stats, 'w', encoding='utf-8') as f:
+            json.dump({'tasks': task_stats(), 'pools': pool_stats()}, f, indent=2)
+        outputs.append(args.task_stats)
 
     for path in outputs:
         print(path)
 
 
-def _combine_reports_for_today(ticker: str) -> str | None:
-    reports_dir = 'reports'
-    if not os.path.exists(reports_dir):
-        return None
+def _stages(args, writer: ReportWriter) -> dict:
+    """The batch's per-ticker stages, in run order."""
+    orchestrator = TechnicalAnalysisOrchestrator(writer=writer, deltas=args.deltas)
+    v_orchestrator = ValueAnalysisOrchestrator(writer=writer, deltas=args.deltas)
+    n_orchestrator = NewsOrchestrator(writer=writer)
 
-    today_compact = datetime.now().strftime('%Y%m%d')
-
-    parts = []
-    tech_path = os.path.join(reports_dir, f"{ticker}_{today_compact}_technical.md")
-    if os.path.exists(tech_path):
-        parts.append(("Technical Analysis", tech_path))
-    val_path = os.path.join(reports_dir, f"{ticker}_{today_compact}_value.md")
-    if os.path.exists(val_path):
-        parts.append(("Value Analysis", val_path))
-    news_path = os.path.join(reports_dir, f"{ticker}_news_{today_compact}.md")
-    if os.path.exists(news_path):
-        parts.append(("News", news_path))
+    stages = {}
+    if args.analysis in ('technical', 'both'):
+        stages['technical'] = lambda t: orchestrator.run(t, args.indicators, interval=args.interval)
+    if args.analysis in ('value', 'both'):
+        stages['value'] = lambda t: v_orchestrator.run(t, mode=args.value_mode)
+    if args.news:
+        stages['news'] = n_orchestrator.run
+    return stages
+
+
+def _submit(args) -> None:
+    """Coordinator: queues the tickers as shards; optionally runs local workers until the batch is done."""
+    queue = WorkQueue(args.queue)
+    batch_id = queue.submit(args.tickers, {k: v for k, v in vars(args).items() if k not in QUEUE_ONLY}, args.shard_size)
+    shards = queue.status(batch_id)[batch_id]['pending']
+    print(f"Queued batch {batch_id}: {len(args.tickers)} tickers in {shards} shard(s) on {queue.path}")
+    if args.local_workers <= 0:
+        print(f"Start workers with: python main.py --work --queue {queue.path} --batch {batch_id}")
+        return
+
+    command = [sys.executable, os.path.abspath(__file__), '--work', '--queue', queue.path, '--batch', batch_id]
+    workers = [subprocess.Popen(command) for _ in range(args.local_workers)]
+    for worker in workers:
+        worker.wait()
+    status = queue.status(batch_id)[batch_id]
+    if status['failed']:
+        print(f"{status['failed']} shard(s) failed: run 'python -m agents.work_queue --batch {batch_id}' for details")
+    for path in queue.outputs(batch_id):
+        print(path)
 
-    if not parts:
-        return None
 
-    final_path = os.path.join(reports_dir, f"{ticker}_{today_compact}_final.md")
-    lines = [f"### Final Combined Report: {ticker}", ""]
-    for title, p in parts:
+def _work(args) -> None:
+    """Worker: leases shards from the queue and runs them like a local batch, until none are left."""
+    queue = WorkQueue(args.queue)
+    worker = args.worker_id or default_worker_id()
+
+    def run_shard(shard: Shard) -> list:
+        shard_args = argparse.Namespace(**shard.args)
+        if shard_args.source:
+            set_data_source(shard_args.source)
+        writer = ReportWriter(flush_every=shard_args.flush_every, keep_sections=True)
+        # A per-shard journal lets a worker that reclaims the shard skip units already written
+        journal = None if shard_args.no_journal else RunJournal(os.path.join(config.JOURNAL_DIR, f"shard_{shard.key}.jsonl"))
+        runner = BatchRunner(_stages(shard_args, writer), writer, journal=journal,
+                             retries=shard_args.retries, backoff=shard_args.retry_backoff)
         try:
-            with open(p, 'r') as f:
-                content = f.read().strip()
-        except Exception:
-            content = f"(Could not read {p})"
-        lines.append(f"## {title}")
-        lines.append("")
-        lines.append(content)
-        lines.append("")
-
-    with open(final_path, 'w') as f:
-        f.write("\n".join(lines).strip() + "\n")
-
-    return final_path
+            with writer:
+                outputs = runner.run(shard.tickers)
+        finally:
+            if journal:
+                journal.close()
+        if journal and not runner.failed:
+            journal.retire()
+        if runner.failed:
+            # Re-queue the shard; its journal lets the retry skip the tickers that succeeded
+            raise RuntimeError(f"{len(runner.failed)} ticker(s) failed: {', '.join(runner.failed)}")
+        return outputs
+
+    done = run_worker(queue, run_shard, worker=worker, batch_id=args.batch)
+    print(f"Worker {worker} finished {done} shard(s)")
+    if args.task_stats:
+        with open(args.task_stats, 'w', encoding='utf-8') as f:
+            json.dump({'tasks': task_stats(), 'pools': pool_stats()}, f, indent=2)
+
+
+def _journal_path(args) -> str:
+    """Default journal for this batch: one per argument set and day."""
+    key = {k: v for k, v in sorted(vars(args).items()) if k not in ('journal', 'no_journal', 'retries', 'retry_backoff', 'flush_every', 'task_stats', 'queue', 'shard_size', 'local_workers', 'work', 'worker_id', 'batch')}
+    digest = hashlib.sha1(json.dumps(key, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(config.JOURNAL_DIR, f"batch_{datetime.now().strftime('%Y%m%d')}_{digest}.jsonl")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,248 @@
+"""Machine-readable export of ``AnalysisReport`` records (JSON Lines or Parquet).
+
+Each run writes its own part file under ``reports/export/<YYYYMMDD>/``, so
+concurrent runs never contend for a file, and ``load_export(date)`` reads a
+whole day's universe back as one DataFrame with one row per (ticker, report
+kind, indicator).
+
+- ``jsonl``: one JSON object per report (nested indicators), appended as
+  records stream in.
+- ``parquet``: flat per-indicator rows written as row groups of
+  ``batch_size``; requires the optional ``pyarrow`` package.
+
+Every indicator carries ``values``: the numeric entries of its ``meta``
+flattened to dotted keys (e.g. ``metrics.trailingPE``), excluding ``params``.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import glob
+import json
+import math
+import os
+import threading
+
+import pandas as pd
+
+from core.models import AnalysisReport
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except Exception:  # pragma: no cover
+    pa = None  # type: ignore
+    pq = None  # type: ignore
+
+EXPORT_FORMATS = ("jsonl", "parquet")
+
+
+def indicator_values(meta: Optional[Dict[str, Any]], prefix: str = "") -> Dict[str, float]:
+    """Flattens the numeric entries of an indicator's meta (params excluded)."""
+    out: Dict[str, float] = {}
+    for key, value in (meta or {}).items():
+        if not prefix and key == "params":
+            continue
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            out.update(indicator_values(value, prefix=f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            if not (isinstance(value, float) and math.isnan(value)):
+                out[name] = float(value)
+    return out
+
+
+def report_record(analysis: AnalysisReport, kind: str) -> Dict[str, Any]:
+    """One nested JSON-ready record per report (JSON Lines format)."""
+    data = analysis.model_dump(mode="json")
+    for item, result in zip(data["indicators"], analysis.indicators):
+        item["params"] = (result.meta or {}).get("params", {})
+        item["values"] = indicator_values(result.meta)
+    return {"date": analysis.generated_at.strftime("%Y%m%d"), "kind": kind, **data}
+
+
+def indicator_rows(analysis: AnalysisReport, kind: str) -> List[Dict[str, Any]]:
+    """Flat rows, one per indicator, sharing the report's columns (Parquet format)."""
+    base = {
+        "date": analysis.generated_at.strftime("%Y%m%d"),
+        "ticker": analysis.ticker,
+        "kind": kind,
+        "period": analysis.period,
+        "interval": analysis.interval,
+        "generated_at": analysis.generated_at,
+        "summary_method": analysis.summary.method,
+        "summary_model": analysis.summary.model,
+        "summary_text": analysis.summary.summary_text,
+    }
+    rows = []
+    for result in analysis.indicators:
+        meta = result.meta or {}
+        rows.append({
+            **base,
+            "indicator": result.indicator,
+            "signal": result.signal,
+            "details": result.details,
+            "params": json.dumps(meta.get("params", {}), default=str, sort_keys=True),
+            "values": indicator_values(meta),
+            "meta": json.dumps(meta, default=str),
+        })
+    return rows
+
+
+class ReportExporter:
+    """Streams AnalysisReport records to one part file per run."""
+
+    def __init__(self, fmt: str = "jsonl", export_dir: str = os.path.join("reports", "export"), batch_size: int = 500):
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {fmt} (expected one of {EXPORT_FORMATS})")
+        if fmt == "parquet" and pa is None:
+            raise RuntimeError("Parquet export requires the optional 'pyarrow' package")
+        self.fmt = fmt
+        self.export_dir = export_dir
+        self.batch_size = max(1, int(batch_size))
+        self.paths: List[str] = []
+
+        self._lock = threading.Lock()
+        self._buffer: List[Any] = []
+        self._files: Dict[str, Any] = {}  # date -> open file / ParquetWriter
+        self._stamp = f"{datetime.now().strftime('%H%M%S')}-{os.getpid()}-{id(self):x}"
+
+    def add(self, analysis: AnalysisReport, kind: str) -> None:
+        """Queues one report; writes a batch once ``batch_size`` records are buffered."""
+        if self.fmt == "jsonl":
+            records = [report_record(analysis, kind)]
+        else:
+            records = indicator_rows(analysis, kind)
+        with self._lock:
+            self._buffer.extend(records)
+            if len(self._buffer) >= self.batch_size:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> List[str]:
+        """Flushes and closes all part files; returns their paths."""
+        with self._lock:
+            self._flush_locked()
+            for handle in self._files.values():
+                handle.close()
+            self._files.clear()
+        return self.paths
+
+    def __enter__(self) -> "ReportExporter":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+    def _flush_locked(self) -> None:
+        if not self._buffer:
+            return
+        records, self._buffer = self._buffer, []
+        by_date: Dict[str, List[Dict[str, Any]]] = {}
+        for r in records:
+            by_date.setdefault(r["date"], []).append(r)
+        for date, rows in by_date.items():
+            handle = self._handle(date)
+            if self.fmt == "jsonl":
+                handle.write("".join(json.dumps(r, default=str) + "\n" for r in rows))
+                handle.flush()
+            else:
+                handle.write_table(pa.Table.from_pylist(rows, schema=_PARQUET_SCHEMA))
+
+    def _handle(self, date: str):
+        handle = self._files.get(date)
+        if handle is None:
+            day_dir = os.path.join(self.export_dir, date)
+            os.makedirs(day_dir, exist_ok=True)
+            path = os.path.join(day_dir, f"part-{self._stamp}.{self.fmt}")
+            if self.fmt == "jsonl":
+                handle = open(path, "a")
+            else:
+                handle = pq.ParquetWriter(path, _PARQUET_SCHEMA, compression="zstd")
+            self._files[date] = handle
+            self.paths.append(path)
+        return handle
+
+
+def load_export(date: str | None = None, export_dir: str = os.path.join("reports", "export")) -> pd.DataFrame:
+    """Loads every part file of ``date`` (default today) as per-indicator rows.
+
+    Parquet parts are read as one dataset; JSON Lines reports are exploded to
+    the same row layout.
+    """
+    date = date or datetime.now().strftime("%Y%m%d")
+    day_dir = os.path.join(export_dir, date)
+    frames = []
+
+    parquet_parts = sorted(glob.glob(os.path.join(day_dir, "*.parquet")))
+    if parquet_parts:
+        if pq is None:
+            raise RuntimeError("Reading Parquet exports requires the optional 'pyarrow' package")
+        df = pq.read_table(parquet_parts).to_pandas()
+        df["values"] = df["values"].map(lambda v: dict(v) if v is not None else {})
+        frames.append(df)
+
+    rows = []
+    for part in sorted(glob.glob(os.path.join(day_dir, "*.jsonl"))):
+        with open(part, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                rec = json.loads(line)
+                summary = rec.get("summary") or {}
+                for ind in rec.get("indicators") or []:
+                    rows.append({
+                        "date": rec.get("date"),
+                        "ticker": rec.get("ticker"),
+                        "kind": rec.get("kind"),
+                        "period": rec.get("period"),
+                        "interval": rec.get("interval", "1d"),
+                        "generated_at": pd.Timestamp(rec.get("generated_at")),
+                        "summary_method": summary.get("method"),
+                        "summary_model": summary.get("model"),
+                        "summary_text": summary.get("summary_text"),
+                        "indicator": ind.get("indicator"),
+                        "signal": ind.get("signal"),
+                        "details": ind.get("details"),
+                        "params": json.dumps(ind.get("params") or {}, sort_keys=True),
+                        "values": ind.get("values") or {},
+                        "meta": json.dumps(ind.get("meta"), default=str),
+                    })
+    if rows:
+        frames.append(pd.DataFrame(rows))
+
+    if not frames:
+        return pd.DataFrame(columns=_COLUMNS)
+    return pd.concat(frames, ignore_index=True)[_COLUMNS]
+
+
+_COLUMNS = [
+    "date", "ticker", "kind", "period", "interval", "generated_at", "indicator", "signal", "details",
+    "params", "values", "meta", "summary_method", "summary_model", "summary_text",
+]
+
+_PARQUET_SCHEMA = (
+    pa.schema([
+        ("date", pa.string()),
+        ("ticker", pa.string()),
+        ("kind", pa.string()),
+        ("period", pa.string()),
+        ("interval", pa.string()),
+        ("generated_at", pa.timestamp("us")),
+        ("indicator", pa.string()),
+        ("signal", pa.string()),
+        ("details", pa.string()),
+        ("params", pa.string()),
+        ("values", pa.map_(pa.string(), pa.float64())),
+        ("meta", pa.string()),
+        ("summary_method", pa.string()),
+        ("summary_model", pa.string()),
+        ("summary_text", pa.string()),
+    ])
+    if pa is not None
+    else None
+)
@@ -0,0 +1,365 @@
+"""Template-based rendering of ``AnalysisReport`` objects to Markdown or HTML.
+
+Templates use ``{{ name }}`` placeholders and are compiled once, at import,
+into ``str.format_map`` strings, so rendering a report is a handful of dict
+lookups and C-level joins instead of ad-hoc string building. Each format has
+the same set of named templates (``report``, ``indicator_row``, ``combined``,
+``page``, ``index`` ...); values are escaped for HTML before substitution.
+
+``ReportRenderer`` renders single sections, indicator tables built from each
+result's ``meta`` values and combined reports. ``BatchRenderer`` collects a
+batch's reports (``ReportWriter(site=...)``) and renders one page per ticker
+plus an index page linking them, in a single pass at the end of the batch:
+
+    python main.py AAPL MSFT --site html    # reports/site/<date>/index.html
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+import html
+import os
+import re
+import threading
+import urllib.parse
+
+from core.models import AnalysisReport, IndicatorResult, ReportDelta
+from reporting.export import indicator_values
+
+RENDER_FORMATS = ("md", "html")
+
+# Section kinds in the order they appear in combined reports and pages
+SECTION_TITLES: Dict[str, str] = {
+    "technical": "Technical Analysis",
+    "value": "Value Analysis",
+    "news": "News",
+}
+
+REPORT_HEADINGS: Dict[str, str] = {
+    "technical": "Technical Analysis Report",
+    "value": "Value Analysis Report",
+}
+
+
+class Template:
+    """A ``{{ name }}`` template compiled once into a ``str.format_map`` string."""
+
+    _FIELD = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+    def __init__(self, source: str):
+        self.source = source
+        self.fields: Tuple[str, ...] = tuple(dict.fromkeys(self._FIELD.findall(source)))
+        parts = []
+        last = 0
+        for match in self._FIELD.finditer(source):
+            parts.append(source[last:match.start()].replace("{", "{{").replace("}", "}}"))
+            parts.append("{" + match.group(1) + "}")
+            last = match.end()
+        parts.append(source[last:].replace("{", "{{").replace("}", "}}"))
+        self._compiled = "".join(parts)
+
+    def render(self, context: Dict[str, str]) -> str:
+        """Substitutes ``context`` (missing fields raise KeyError)."""
+        return self._compiled.format_map(context)
+
+
+MARKDOWN_TEMPLATES: Dict[str, str] = {
+    "report": "### {{ heading }}: {{ name }}\n\n{{ bars }}{{ summary }}{{ changes }}{{ table }}",
+    "no_change": "### {{ heading }}: {{ name }}\n\n{{ bars }}_No change since {{ since }}: {{ signals }}_\n",
+    "changes": "\n\n#### Changes since {{ since }}\n\n{{ rows }}",
+    "change_row": "- {{ change }}\n",
+    "bars": "_Bars: {{ interval }} over {{ period }}_\n\n",
+    "indicator_table": "\n\n#### Indicators\n\n| Indicator | Signal | Values |\n|---|---|---|\n{{ rows }}",
+    "indicator_row": "| {{ indicator }} | {{ signal }} | {{ values }} |\n",
+    "combined": "### Final Combined Report: {{ ticker }}\n\n{{ sections }}",
+    "combined_section": "## {{ title }}\n\n{{ body }}\n\n",
+    "page": "# {{ ticker }}\n\n_Generated {{ generated_at }}_\n\n{{ sections }}[Back to index]({{ index }})\n",
+    "page_section": "## {{ title }}\n\n{{ body }}\n\n",
+    "index": "# Batch Report Index\n\n_Generated {{ generated_at }} - {{ count }} tickers_\n\n"
+             "| Ticker | Reports | Signals |\n|---|---|---|\n{{ rows }}",
+    "index_row": "| [{{ ticker }}]({{ href }}) | {{ kinds }} | {{ signals }} |\n",
+}
+
+HTML_TEMPLATES: Dict[str, str] = {
+    "report": "<section class=\"report\">\n<h3>{{ heading }}: {{ name }}</h3>\n{{ bars }}{{ summary }}{{ changes }}{{ table }}</section>\n",
+    "no_change": "<section class=\"report\">\n<h3>{{ heading }}: {{ name }}</h3>\n{{ bars }}<p><em>No change since {{ since }}: {{ signals }}</em></p>\n</section>\n",
+    "changes": "<h4>Changes since {{ since }}</h4>\n<ul>\n{{ rows }}\n</ul>\n",
+    "change_row": "<li>{{ change }}</li>\n",
+    "bars": "<p><em>Bars: {{ interval }} over {{ period }}</em></p>\n",
+    "indicator_table": "<h4>Indicators</h4>\n<table>\n<thead><tr><th>Indicator</th><th>Signal</th><th>Values</th></tr></thead>\n"
+                       "<tbody>\n{{ rows }}</tbody>\n</table>\n",
+    "indicator_row": "<tr><td>{{ indicator }}</td><td>{{ signal }}</td><td>{{ values }}</td></tr>\n",
+    "combined": "<h3>Final Combined Report: {{ ticker }}</h3>\n{{ sections }}",
+    "combined_section": "<h2>{{ title }}</h2>\n{{ body }}\n",
+    "page": "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n<title>{{ ticker }}</title>\n{{ style }}</head>\n"
+            "<body>\n<h1>{{ ticker }}</h1>\n<p><em>Generated {{ generated_at }}</em></p>\n{{ sections }}"
+            "<p><a href=\"{{ index }}\">Back to index</a></p>\n</body>\n</html>\n",
+    "page_section": "<h2>{{ title }}</h2>\n{{ body }}\n",
+    "index": "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n<title>Batch Report Index</title>\n{{ style }}</head>\n"
+             "<body>\n<h1>Batch Report Index</h1>\n<p><em>Generated {{ generated_at }} - {{ count }} tickers</em></p>\n"
+             "<table>\n<thead><tr><th>Ticker</th><th>Reports</th><th>Signals</th></tr></thead>\n<tbody>\n{{ rows }}"
+             "</tbody>\n</table>\n</body>\n</html>\n",
+    "index_row": "<tr><td><a href=\"{{ href }}\">{{ ticker }}</a></td><td>{{ kinds }}</td><td>{{ signals }}</td></tr>\n",
+    "style": "<style>body{font-family:sans-serif;max-width:60em;margin:auto}"
+             "table{border-collapse:collapse}td,th{border:1px solid #ccc;padding:2px 6px;text-align:left}</style>\n",
+}
+
+_COMPILED: Dict[str, Dict[str, Template]] = {
+    "md": {name: Template(src) for name, src in MARKDOWN_TEMPLATES.items()},
+    "html": {name: Template(src) for name, src in HTML_TEMPLATES.items()},
+}
+
+
+class ReportRenderer:
+    """Renders reports through the compiled templates of one format."""
+
+    def __init__(self, fmt: str = "md", templates: Dict[str, str] | None = None):
+        """
+        Args:
+            fmt: "md" or "html".
+            templates: Optional overrides by template name (compiled once, here).
+        """
+        if fmt not in RENDER_FORMATS:
+            raise ValueError(f"Unknown render format: {fmt} (choose from {', '.join(RENDER_FORMATS)})")
+        self.fmt = fmt
+        self.ext = "md" if fmt == "md" else "html"
+        self._t = dict(_COMPILED[fmt])
+        for name, source in (templates or {}).items():
+            self._t[name] = Template(source)
+        self._esc = html.escape if fmt == "html" else _md_cell
+
+    def report(self, analysis: AnalysisReport, kind: str = "technical", name: str | None = None) -> str:
+        """One report section: heading, bar interval (intraday only), summary, changes and indicator table.
+
+        A report whose ``delta`` is unchanged renders as a one-line "no change" record.
+        """
+        t = self._t
+        esc = self._esc
+        bars = ""
+        if analysis.interval != "1d":
+            bars = t["bars"].render({"interval": esc(analysis.interval), "period": esc(analysis.period)})
+        heading = esc(REPORT_HEADINGS.get(kind, SECTION_TITLES.get(kind, kind.title())))
+        delta = analysis.delta
+        if delta is not None and delta.status == "unchanged":
+            return t["no_change"].render({
+                "heading": heading,
+                "name": esc(name or analysis.ticker),
+                "bars": bars,
+                "since": esc(delta.since or ""),
+                "signals": esc(", ".join(f"{r.indicator} {r.signal}" for r in analysis.indicators)),
+            })
+        summary = analysis.summary.summary_text
+        if self.fmt == "html":
+            summary = markdown_to_html(summary)
+        changes = ""
+        if delta is not None and delta.status == "changed":
+            row = t["change_row"].render
+            changes = t["changes"].render({
+                "since": esc(delta.since or ""),
+                "rows": "".join(row({"change": esc(line)}) for line in delta_lines(delta)).rstrip("\n"),
+            })
+        return t["report"].render({
+            "heading": heading,
+            "name": esc(name or analysis.ticker),
+            "bars": bars,
+            "summary": summary,
+            "changes": changes,
+            "table": self.indicator_table(analysis.indicators),
+        })
+
+    def indicator_table(self, indicators: Iterable[IndicatorResult]) -> str:
+        """Indicator/signal/values table; values are the numeric entries of each ``meta``."""
+        row = self._t["indicator_row"].render
+        esc = self._esc
+        rows = "".join(
+            row({
+                "indicator": esc(r.indicator),
+                "signal": esc(r.signal),
+                "values": esc(", ".join(f"{k}={_fmt(v)}" for k, v in indicator_values(r.meta).items())),
+            })
+            for r in indicators
+        )
+        return self._t["indicator_table"].render({"rows": rows}) if rows else ""
+
+    def combined(self, ticker: str, sections: Iterable[Tuple[str, str]]) -> str:
+        """Final combined report from ``(kind, rendered body)`` pairs."""
+        section = self._t["combined_section"].render
+        body = "".join(section({"title": self._esc(SECTION_TITLES.get(kind, kind)), "body": text.strip()})
+                       for kind, text in sections)
+        return self._t["combined"].render({"ticker": self._esc(ticker), "sections": body}).strip() + "\n"
+
+    def page(self, ticker: str, analyses: Iterable[Tuple[str, AnalysisReport]], index: str, generated_at: str) -> str:
+        """A standalone per-ticker page with every report kind of the batch."""
+        section = self._t["page_section"].render
+        body = "".join(section({"title": self._esc(SECTION_TITLES.get(kind, kind)), "body": self.report(a, kind).strip()})
+                       for kind, a in analyses)
+        return self._t["page"].render({
+            "ticker": self._esc(ticker),
+            "generated_at": generated_at,
+            "sections": body,
+            "index": index,
+            "style": self._t["style"].source if "style" in self._t else "",
+        })
+
+    def index(self, entries: List[Tuple[str, str, List[Tuple[str, AnalysisReport]]]], generated_at: str) -> str:
+        """Index page from ``(ticker, href, [(kind, analysis)])`` entries."""
+        row = self._t["index_row"].render
+        esc = self._esc
+        rows = "".join(
+            row({
+                "ticker": esc(ticker),
+                "href": href,
+                "kinds": esc(", ".join(kind for kind, _ in analyses)),
+                "signals": esc("; ".join(f"{r.indicator}: {r.signal}" for _, a in analyses for r in a.indicators)),
+            })
+            for ticker, href, analyses in entries
+        )
+        return self._t["index"].render({
+            "generated_at": generated_at,
+            "count": str(len(entries)),
+            "rows": rows,
+            "style": self._t["style"].source if "style" in self._t else "",
+        })
+
+
+class BatchRenderer:
+    """Collects a batch's reports and renders per-ticker pages plus an index in one pass."""
+
+    def __init__(self, fmt: str = "html", out_dir: str | None = None, reports_dir: str = "reports"):
+        """
+        Args:
+            fmt: "md" or "html".
+            out_dir: Output directory (default: ``<reports_dir>/site/<YYYYMMDD>``).
+            reports_dir: Base reports directory for the default ``out_dir``.
+        """
+        self.renderer = ReportRenderer(fmt)
+        self.out_dir = out_dir or os.path.join(reports_dir, "site", datetime.now().strftime("%Y%m%d"))
+        self.index_path = os.path.join(self.out_dir, f"index.{self.renderer.ext}")
+        self._lock = threading.Lock()
+        self._reports: Dict[str, Dict[str, AnalysisReport]] = {}
+
+    def add(self, analysis: AnalysisReport, kind: str) -> None:
+        with self._lock:
+            self._reports.setdefault(analysis.ticker, {})[kind] = analysis
+
+    def __len__(self) -> int:
+        return len(self._reports)
+
+    def render(self) -> List[Tuple[str, str]]:
+        """``(path, content)`` for every ticker page and the index (last), in ticker order."""
+        with self._lock:
+            reports = {t: dict(kinds) for t, kinds in self._reports.items()}
+        if not reports:
+            return []
+        generated_at = datetime.now().strftime("%Y-%m-%d %H:%M")
+        index_name = os.path.basename(self.index_path)
+        files: List[Tuple[str, str]] = []
+        entries = []
+        for ticker in sorted(reports):
+            analyses = [(k, reports[ticker][k]) for k in SECTION_TITLES if k in reports[ticker]]
+            analyses += [(k, a) for k, a in reports[ticker].items() if k not in SECTION_TITLES]
+            name = f"{_safe_name(ticker)}.{self.renderer.ext}"
+            files.append((os.path.join(self.out_dir, name), self.renderer.page(ticker, analyses, index_name, generated_at)))
+            entries.append((ticker, name, analyses))
+        files.append((self.index_path, self.renderer.index(entries, generated_at)))
+        return files
+
+
+_renderers: Dict[str, ReportRenderer] = {}
+
+
+def get_renderer(fmt: str = "md") -> ReportRenderer:
+    """Shared renderer with the default templates for ``fmt``."""
+    renderer = _renderers.get(fmt)
+    if renderer is None:
+        renderer = _renderers.setdefault(fmt, ReportRenderer(fmt))
+    return renderer
+
+
+def delta_lines(delta: ReportDelta) -> List[str]:
+    """One human-readable line per change (empty for new or unchanged reports)."""
+    lines = []
+    for d in delta.indicators:
+        if d.previous_signal is None:
+            lines.append(f"{d.indicator}: added ({d.signal})")
+        elif d.signal is None:
+            lines.append(f"{d.indicator}: removed (was {d.previous_signal})")
+        else:
+            flip = f"{d.previous_signal} → {d.signal}" if d.previous_signal != d.signal else f"still {d.signal}"
+            lines.append(f"{d.indicator}: {flip}" + (f"; {'; '.join(d.crossings)}" if d.crossings else ""))
+    if delta.score_change is not None:
+        lines.append(f"Value score {delta.score_change:+g}")
+    return lines
+
+
+_MD_HEADING = re.compile(r"^(#{1,6})\s+(.*)$")
+_MD_BOLD = re.compile(r"\*\*(.+?)\*\*")
+_MD_ITALIC = re.compile(r"(?<![\w*])[*_](?!\s)(.+?)(?<!\s)[*_](?![\w*])")
+_MD_LINK = re.compile(r"\[([^\]]+)\]\(([^)\s]+)\)")
+_SAFE_SCHEMES = ("", "http", "https")
+
+
+def _link(match: re.Match) -> str:
+    """An ``<a>`` for http(s) and relative URLs; any other scheme (``javascript:``) stays text."""
+    label, href = match.group(1), match.group(2)  # already HTML-escaped by _inline
+    if urllib.parse.urlsplit(html.unescape(href)).scheme.lower() not in _SAFE_SCHEMES:
+        return match.group(0)
+    return f'<a href="{href.replace(chr(34), "&quot;")}">{label}</a>'
+
+
+def markdown_to_html(text: str) -> str:
+    """Minimal Markdown to HTML for summaries: headings, bullet lists, paragraphs, bold/italic, links."""
+    out: List[str] = []
+    paragraph: List[str] = []
+    in_list = False
+
+    def _inline(s: str) -> str:
+        s = html.escape(s, quote=False)
+        s = _MD_LINK.sub(_link, s)
+        s = _MD_BOLD.sub(r"<strong>\1</strong>", s)
+        return _MD_ITALIC.sub(r"<em>\1</em>", s)
+
+    def _close_paragraph() -> None:
+        if paragraph:
+            out.append(f"<p>{' '.join(paragraph)}</p>")
+            paragraph.clear()
+
+    for raw in text.splitlines():
+        line = raw.strip()
+        heading = _MD_HEADING.match(line)
+        bullet = line[:2] in ("- ", "* ")
+        if in_list and not bullet:
+            out.append("</ul>")
+            in_list = False
+        if not line:
+            _close_paragraph()
+        elif heading:
+            _close_paragraph()
+            level = len(heading.group(1))
+            out.append(f"<h{level}>{_inline(heading.group(2))}</h{level}>")
+        elif bullet:
+            _close_paragraph()
+            if not in_list:
+                out.append("<ul>")
+                in_list = True
+            out.append(f"<li>{_inline(line[2:])}</li>")
+        else:
+            paragraph.append(_inline(line))
+    _close_paragraph()
+    if in_list:
+        out.append("</ul>")
+    return "\n".join(out) + "\n"
+
+
+def _md_cell(value: str) -> str:
+    # Pipes and newlines would break a Markdown table row
+    return value.replace("|", "\\|").replace("\n", " ")
+
+
+def _fmt(value: float) -> str:
+    return f"{value:.4g}" if abs(value) < 1e6 else f"{value:,.0f}"
+
+
+def _safe_name(ticker: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]", "_", ticker)
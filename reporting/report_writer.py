@@ -0,0 +1,225 @@
+"""Buffered, atomic report writing and in-memory combined reports.
+
+Orchestrators hand their rendered Markdown to a ``ReportWriter`` as
+``ReportSection`` objects instead of writing files directly. The writer keeps
+the sections in memory so the final combined report is assembled without
+re-reading ``reports/``; files are written via temp-file + ``os.replace`` (so
+concurrent runs never observe a torn file) and flushed in bulk every
+``flush_every`` files. Optionally every file of the batch is also streamed
+into one ``reports/batch_<timestamp>.tar.gz`` archive, and sections carrying
+an ``AnalysisReport`` are streamed to an optional ``ReportExporter`` and
+collected by an optional ``BatchRenderer`` (per-ticker pages plus an index,
+rendered and written when the writer closes).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+import io
+import os
+import tarfile
+import tempfile
+import threading
+import time
+
+from core.models import AnalysisReport
+from reporting.export import ReportExporter
+from reporting.render import SECTION_TITLES, BatchRenderer, get_renderer
+
+
+@dataclass
+class ReportSection:
+    ticker: str
+    kind: str  # "technical", "value" or "news"
+    markdown: str
+    path: str
+    analysis: Optional[AnalysisReport] = None
+
+
+def report_path(ticker: str, kind: str, date_str: str | None = None, reports_dir: str = "reports") -> str:
+    """Returns the conventional path for a ticker's report of ``kind`` (or "final")."""
+    date_str = date_str or datetime.now().strftime("%Y%m%d")
+    if kind == "news":
+        name = f"{ticker}_news_{date_str}.md"
+    else:
+        name = f"{ticker}_{date_str}_{kind}.md"
+    return os.path.join(reports_dir, name)
+
+
+class ReportWriter:
+    """Collects report sections, writes them atomically in batches, combines per ticker."""
+
+    def __init__(
+        self,
+        reports_dir: str = "reports",
+        flush_every: int = 1,
+        keep_sections: bool = False,
+        archive: bool = False,
+        exporter: ReportExporter | None = None,
+        site: BatchRenderer | None = None,
+    ):
+        """
+        Args:
+            reports_dir: Output directory.
+            flush_every: Number of buffered files that triggers a bulk flush (1 = write immediately).
+            keep_sections: Retain sections per ticker so ``combine`` can build the final report.
+            archive: Also stream every written file into one compressed archive per batch.
+            exporter: Optional structured (JSON Lines/Parquet) export of each AnalysisReport.
+            site: Optional batch renderer; its pages and index are written on ``close``.
+        """
+        self.reports_dir = reports_dir
+        self.flush_every = max(1, int(flush_every))
+        self.keep_sections = keep_sections
+        self.archive = archive
+        self.archive_path: str | None = None
+        self.exporter = exporter
+        self.site = site
+
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[str, str]] = []
+        self._sections: Dict[str, Dict[str, ReportSection]] = {}
+        self._tar: tarfile.TarFile | None = None
+        self._tar_tmp: str | None = None
+        self._flush_hooks: List[Callable[[List[str]], None]] = []
+
+    def add_flush_hook(self, hook: Callable[[List[str]], None]) -> None:
+        """Calls ``hook(paths)`` after each bulk flush with the paths now on disk."""
+        self._flush_hooks.append(hook)
+
+    def is_pending(self, path: str) -> bool:
+        """True if ``path`` is buffered and not yet written."""
+        with self._lock:
+            return any(p == path for p, _ in self._pending)
+
+    def add_section(self, section: ReportSection, persist: bool = True) -> str:
+        """Registers a section and queues its file (unless ``persist`` is False)."""
+        with self._lock:
+            if self.keep_sections:
+                self._sections.setdefault(section.ticker, {})[section.kind] = section
+        if self.exporter is not None and section.analysis is not None:
+            self.exporter.add(section.analysis, section.kind)
+        if self.site is not None and section.analysis is not None:
+            self.site.add(section.analysis, section.kind)
+        if persist:
+            self.write(section.path, section.markdown)
+        return section.path
+
+    def write(self, path: str, content: str) -> str:
+        """Queues ``content`` for ``path``; flushes when the buffer is full."""
+        with self._lock:
+            self._pending.append((path, content))
+            full = len(self._pending) >= self.flush_every
+        if full:
+            self.flush()
+        return path
+
+    def sections(self, ticker: str) -> List[ReportSection]:
+        with self._lock:
+            by_kind = dict(self._sections.get(ticker, {}))
+        return [by_kind[k] for k in SECTION_TITLES if k in by_kind]
+
+    def combine(self, ticker: str, date_str: str | None = None) -> str | None:
+        """Builds ``<ticker>_<date>_final.md`` from the in-memory sections and queues it.
+
+        The ticker's sections are released afterwards.
+        """
+        parts = self.sections(ticker)
+        with self._lock:
+            self._sections.pop(ticker, None)
+        if not parts:
+            return None
+
+        final_path = report_path(ticker, "final", date_str, self.reports_dir)
+        markdown = get_renderer("md").combined(ticker, [(s.kind, s.markdown) for s in parts])
+        return self.write(final_path, markdown)
+
+    def flush(self) -> None:
+        """Writes all buffered files (atomic rename each) and appends them to the archive.
+
+        Files that fail to write stay buffered for the next flush; the others are
+        archived and passed to the flush hooks before the first error is raised.
+        """
+        error = None
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if not pending:
+                return
+            written, failed = [], []
+            for path, content in pending:
+                try:
+                    _atomic_write(path, content)
+                except Exception as exc:
+                    error = error or exc
+                    failed.append((path, content))
+                else:
+                    written.append((path, content))
+            self._pending[:0] = failed
+            if self.archive and written:
+                self._append_to_archive(written)
+        if written:
+            for hook in self._flush_hooks:
+                hook([path for path, _ in written])
+        if error is not None:
+            raise error
+
+    def close(self) -> str | None:
+        """Renders the batch pages (if any), flushes remaining files and finalizes the archive.
+
+        Returns the archive path if any.
+        """
+        if self.site is not None:
+            for path, content in self.site.render():
+                self.write(path, content)
+        self.flush()
+        if self.exporter is not None:
+            self.exporter.close()
+        with self._lock:
+            if self._tar is not None:
+                self._tar.close()
+                self._tar = None
+                self.archive_path = os.path.join(
+                    self.reports_dir, f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}.tar.gz"
+                )
+                os.chmod(self._tar_tmp, 0o644)
+                os.replace(self._tar_tmp, self.archive_path)
+            return self.archive_path
+
+    def __enter__(self) -> "ReportWriter":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+    def _append_to_archive(self, files: List[Tuple[str, str]]) -> None:
+        # Called with self._lock held
+        if self._tar is None:
+            os.makedirs(self.reports_dir, exist_ok=True)
+            fd, self._tar_tmp = tempfile.mkstemp(dir=self.reports_dir, suffix=".tar.gz.tmp")
+            os.close(fd)
+            self._tar = tarfile.open(self._tar_tmp, "w:gz")
+        now = time.time()
+        for path, content in files:
+            data = content.encode("utf-8")
+            info = tarfile.TarInfo(name=os.path.relpath(path, self.reports_dir))
+            info.size = len(data)
+            info.mtime = now
+            self._tar.addfile(info, io.BytesIO(data))
+
+
+def _atomic_write(path: str, content: str) -> None:
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        os.chmod(tmp, 0o644)  # mkstemp creates 0600 files
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise